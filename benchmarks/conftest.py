@@ -0,0 +1,101 @@
+"""Fixtures for the pytest-benchmark suite.
+
+Run with:
+
+    pytest benchmarks --benchmark-compare --benchmark-compare-fail=median:50%
+
+Timing baselines live in `benchmarks/baselines` (save a new one with
+`--benchmark-save=<name>`); allocation baselines in `allocations.json` are
+rewritten with `--update-allocations`.
+"""
+
+import asyncio
+import json
+import tracemalloc
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+import pytest
+
+from pursuit_mcp import config
+from pursuit_mcp.fake import FakePursuit, running, synthetic_results
+
+BASELINES = Path(__file__).parent / "baselines"
+ALLOCATIONS = BASELINES / "allocations.json"
+
+# Allowed growth of peak allocations over the stored baseline
+ALLOCATION_TOLERANCE = 1.25
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--update-allocations",
+        action="store_true",
+        help="Rewrite the allocation baselines instead of checking them",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    if config.option.benchmark_storage == "file://./.benchmarks":
+        config.option.benchmark_storage = f"file://{BASELINES}"
+
+
+@pytest.fixture(scope="session")
+def stand_in_url() -> Iterator[str]:
+    """Run the stand-in Pursuit server on a local port for the session."""
+    with running(FakePursuit(records=synthetic_results(110))) as url:
+        yield url
+
+
+@pytest.fixture
+def pursuit(stand_in_url: str, monkeypatch: pytest.MonkeyPatch) -> str:
+    """Point searches at the stand-in server."""
+    monkeypatch.setattr(config, "BASE_URL", stand_in_url)
+    return stand_in_url
+
+
+@pytest.fixture
+def loop() -> Iterator[asyncio.AbstractEventLoop]:
+    """Event loop for running coroutines inside synchronous benchmarks."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.run_until_complete(loop.shutdown_asyncgens())
+    loop.close()
+
+
+@pytest.fixture
+def allocations(request: pytest.FixtureRequest) -> Callable[[Callable], int]:
+    """Check the peak memory allocated by a call against its baseline.
+
+    The returned function runs its argument under `tracemalloc` and fails
+    the test if the peak exceeds the stored baseline for the current test
+    by more than `ALLOCATION_TOLERANCE`, or if there is no baseline for it.
+    """
+    update = request.config.getoption("--update-allocations")
+    name = request.node.name
+
+    def check(fn: Callable) -> int:
+        tracemalloc.start()
+        try:
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        baselines = json.loads(ALLOCATIONS.read_text()) if ALLOCATIONS.exists() else {}
+        if update:
+            baselines[name] = peak
+            ALLOCATIONS.write_text(
+                json.dumps(baselines, indent=2, sort_keys=True) + "\n"
+            )
+        elif name not in baselines:
+            pytest.fail(
+                f"{name}: no allocation baseline; run with --update-allocations"
+            )
+        else:
+            assert peak <= baselines[name] * ALLOCATION_TOLERANCE, (
+                f"{name}: peak allocation {peak} B exceeds baseline {baselines[name]} B"
+            )
+        return peak
+
+    return check
@@ -0,0 +1,92 @@
+"""Benchmark the decode-format-encode pipeline behind search_pursuit.
+
+Usage:
+    python benchmarks/format_pipeline.py [--results 50] [--rounds 2000]
+
+Decodes a synthetic Pursuit response body, formats it and encodes the output,
+reporting the cost per result for the dict pipeline (`json.loads`, `format`,
+`json.dumps`) and for the msgspec pipeline (`msgspec.json.decode`,
+`format_json`). Requires the `fast` extra.
+"""
+
+import argparse
+import json
+import time
+from collections.abc import Callable
+
+import msgspec
+
+from pursuit_mcp.format import format, format_json
+from pursuit_mcp.types import PursuitResult
+
+
+def result(number: int) -> PursuitResult:
+    docs = f"Documentation for value{number}. " * 8
+    return {
+        "package": f"purescript-package{number % 100}",
+        "version": "1.0.0",
+        "markup": f'<div class="decl"><p>{docs}</p></div>',
+        "text": docs,
+        "info": {
+            "type": "declaration",
+            "module": f"Data.Module{number % 50}",
+            "title": f"value{number}",
+            "typeOrValue": "ValueLevel",
+            "typeText": "forall f a b. Functor f => (a -> b) -> f a -> f b",
+        },
+        "url": f"https://pursuit.purescript.org/packages/purescript-package"
+        f"{number % 100}/1.0.0/docs/Data.Module{number % 50}#v:value{number}",
+    }
+
+
+def per_result(run: Callable[[], object], rounds: int, results: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        run()
+    return (time.perf_counter() - start) / rounds / results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--results", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+
+    results = [result(number) for number in range(args.results)]
+    body = json.dumps(results).encode()
+    decoded = json.loads(body)
+    assert json.loads(format_json(decoded)) == format(decoded)
+
+    def dict_pipeline() -> bytes:
+        output = format(json.loads(body))
+        return json.dumps(output, ensure_ascii=False).encode()
+
+    def struct_pipeline() -> bytes:
+        return format_json(msgspec.json.decode(body))
+
+    print(f"{args.results} results, {len(body)} byte response")
+    timings = {}
+    for name, phase in [
+        ("decode", lambda: json.loads(body)),
+        (
+            "format+encode",
+            lambda: json.dumps(format(decoded), ensure_ascii=False).encode(),
+        ),
+        ("end to end", dict_pipeline),
+    ]:
+        timings[name] = per_result(phase, args.rounds, args.results)
+    for name, phase in [
+        ("decode", lambda: msgspec.json.decode(body)),
+        ("format+encode", lambda: format_json(decoded)),
+        ("end to end", struct_pipeline),
+    ]:
+        after = per_result(phase, args.rounds, args.results)
+        before = timings[name]
+        print(
+            f"{name:>14}: {before * 1e6:6.2f} -> {after * 1e6:6.2f} us/result "
+            f"({before / after:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
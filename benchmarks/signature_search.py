@@ -0,0 +1,100 @@
+"""Benchmark signature search over a synthetic set of declarations.
+
+Usage:
+    python benchmarks/signature_search.py [--count 300000] [--queries 1000]
+
+Builds a `SignatureIndex` over `--count` generated declarations and reports
+build time plus per-query latency for indexed lookups, compared with a linear
+scan over the same normalized signatures.
+"""
+
+import argparse
+import random
+import time
+
+from pursuit_mcp.signature import SignatureIndex, normalize
+from pursuit_mcp.types import PursuitResult
+
+TEMPLATES = [
+    "forall a b. ({0} a -> b) -> {1} a -> {1} b",
+    "forall a. {0} a -> {1} a",
+    "forall f a. {0} f => f a -> {1} (f a)",
+    "forall k v. {0} k => k -> {1} k v -> {2} v",
+    "forall a b c. (a -> b -> c) -> {0} a -> {0} b -> {0} c",
+    "forall r. {{ value :: {0}, rest :: {1} | r }} -> {2}",
+    "{0} -> {1} -> {2}",
+    "forall m a. {0} m => m ({1} a) -> m a",
+]
+
+
+def declaration(number: int, type_text: str) -> PursuitResult:
+    return {
+        "package": f"purescript-package{number % 1000}",
+        "version": "1.0.0",
+        "markup": "",
+        "text": "",
+        "info": {
+            "type": "declaration",
+            "module": f"Module{number % 5000}",
+            "title": f"value{number}",
+            "typeOrValue": "ValueLevel",
+            "typeText": type_text,
+        },
+        "url": f"https://pursuit.purescript.org/value{number}",
+    }
+
+
+def generate(count: int, rng: random.Random) -> list[PursuitResult]:
+    constructors = [f"Type{i}" for i in range(2000)]
+    return [
+        declaration(
+            number,
+            rng.choice(TEMPLATES).format(*rng.sample(constructors, 3)),
+        )
+        for number in range(count)
+    ]
+
+
+def signatures(results: list[PursuitResult]) -> list[str]:
+    """Return the type signatures of the declarations among `results`."""
+    texts = []
+    for result in results:
+        info = result["info"]
+        if info["type"] == "declaration" and info["typeText"] is not None:
+            texts.append(info["typeText"])
+    return texts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=300_000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    declarations = generate(args.count, rng)
+
+    start = time.perf_counter()
+    index = SignatureIndex.from_results(declarations)
+    print(f"build: {len(index)} declarations in {time.perf_counter() - start:.2f}s")
+
+    queries = signatures(rng.sample(declarations, args.queries))
+
+    start = time.perf_counter()
+    for query in queries:
+        index.search(query, limit=10)
+    indexed = (time.perf_counter() - start) / len(queries)
+    print(f"indexed search: {indexed * 1e6:.1f} us/query")
+
+    bodies = [normalize(text).body for text in signatures(declarations)]
+    start = time.perf_counter()
+    for query in queries[:20]:
+        wanted = normalize(query).body
+        [i for i, body in enumerate(bodies) if body == wanted]
+    scan = (time.perf_counter() - start) / 20
+    print(f"linear scan:    {scan * 1e6:.1f} us/query ({scan / indexed:.0f}x slower)")
+
+
+if __name__ == "__main__":
+    main()
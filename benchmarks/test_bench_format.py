@@ -0,0 +1,43 @@
+"""Benchmarks for formatting and encoding search results."""
+
+import json
+
+import pytest
+
+from pursuit_mcp.fake import synthetic_results
+from pursuit_mcp.format import format, format_json
+
+SIZES = [10, 100, 1000, 10_000]
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_format(benchmark, size):
+    results = synthetic_results(size)
+    output = benchmark(format, results)
+    assert output["count"] == size
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_format_dumps(benchmark, size):
+    results = synthetic_results(size)
+    encoded = benchmark(lambda: json.dumps(format(results), ensure_ascii=False))
+    assert json.loads(encoded)["count"] == size
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_format_json(benchmark, size):
+    results = synthetic_results(size)
+    encoded = benchmark(format_json, results)
+    assert json.loads(encoded)["count"] == size
+
+
+@pytest.mark.parametrize("size", [100, 10_000])
+def test_format_json_allocations(allocations, size):
+    results = synthetic_results(size)
+    allocations(lambda: format_json(results))
+
+
+@pytest.mark.parametrize("size", [100, 10_000])
+def test_format_allocations(allocations, size):
+    results = synthetic_results(size)
+    allocations(lambda: format(results))
@@ -0,0 +1,75 @@
+"""Benchmarks for searching against the stand-in Pursuit server."""
+
+import functools
+import itertools
+import json
+
+import pytest
+from fastmcp import Client
+
+from pursuit_mcp import search as search_module
+from pursuit_mcp.cache import TTLCache
+from pursuit_mcp.search import create_client, search
+from pursuit_mcp.server import mcp
+
+
+@pytest.fixture
+def client(loop):
+    client = create_client(rate_limit=0)  # Measure search, not the throttle
+    yield client
+    loop.run_until_complete(client.aclose())
+
+
+@pytest.mark.parametrize("limit", [10, 110])
+def test_search(benchmark, pursuit, loop, client, limit):
+    results = benchmark(
+        lambda: loop.run_until_complete(search("map", limit, client=client))
+    )
+    assert len(results) == limit
+
+
+def test_search_cached(benchmark, pursuit, loop, client):
+    cache = TTLCache(ttl=3600, max_entries=16, max_bytes=1 << 24)
+    results = benchmark(
+        lambda: loop.run_until_complete(search("map", 50, client=client, cache=cache))
+    )
+    assert len(results) == 50
+
+
+def test_search_one_off_client(benchmark, pursuit, loop):
+    results = benchmark(lambda: loop.run_until_complete(search("map", 10)))
+    assert len(results) == 10
+
+
+@pytest.fixture
+def mcp_client(pursuit, loop, monkeypatch):
+    monkeypatch.setattr(
+        search_module, "create_client", functools.partial(create_client, rate_limit=0)
+    )
+    client = Client(mcp)
+    loop.run_until_complete(client.__aenter__())
+    yield client
+    loop.run_until_complete(client.__aexit__(None, None, None))
+
+
+def test_tool_cold(benchmark, loop, mcp_client):
+    """Each call uses a new query, so every call goes upstream."""
+    queries = (f"map{n}" for n in itertools.count())
+
+    def call():
+        return loop.run_until_complete(
+            mcp_client.call_tool("search_pursuit", {"query": next(queries)})
+        )
+
+    result = benchmark(call)
+    assert json.loads(result.content[0].text)["count"] == 10
+
+
+def test_tool_cached(benchmark, loop, mcp_client):
+    def call():
+        return loop.run_until_complete(
+            mcp_client.call_tool("search_pursuit", {"query": "map", "limit": 50})
+        )
+
+    result = benchmark(call)
+    assert json.loads(result.content[0].text)["count"] == 50
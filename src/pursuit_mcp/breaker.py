@@ -0,0 +1,132 @@
+"""Circuit breaker failing Pursuit requests fast during outages."""
+
+import time
+from collections.abc import Callable
+from enum import Enum
+
+import httpx
+
+from .metrics import registry
+from .throttle import BucketLockedError, QueueFullError
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Raised instead of sending a request while the circuit is open."""
+
+
+class State(Enum):
+    """Circuit breaker states."""
+
+    CLOSED = "closed"  # Requests flow normally
+    OPEN = "open"  # Requests fail at once
+    HALF_OPEN = "half_open"  # One probe request decides whether to close
+
+
+class CircuitBreaker:
+    """Circuit breaker opening after consecutive upstream failures.
+
+    After `failure_threshold` failures in a row the circuit opens and every
+    request is rejected at once. Once `reset_timeout` seconds have passed, a
+    single probe request is let through: its success closes the circuit, its
+    failure opens it for another `reset_timeout`.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create a closed circuit.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before a probe
+            clock: Monotonic clock, replaceable in tests
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self.state = State.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    def allow(self) -> bool:
+        """Return whether a request may be sent now.
+
+        A request allowed while half-open is the probe; it must be followed
+        by `success`, `failure` or `cancel`.
+        """
+        if self.state is State.OPEN:
+            if self._clock() - self._opened_at < self.reset_timeout:
+                return False
+            self._transition(State.HALF_OPEN)
+        if self.state is State.HALF_OPEN:
+            if self._probing:
+                return False
+            self._probing = True
+        return True
+
+    def success(self) -> None:
+        """Record a request that reached a healthy upstream."""
+        self._probing = False
+        self.failures = 0
+        if self.state is not State.CLOSED:
+            self._transition(State.CLOSED)
+
+    def failure(self) -> None:
+        """Record a failed request."""
+        self._probing = False
+        self.failures += 1
+        if self.state is State.HALF_OPEN or self.failures >= self.failure_threshold:
+            self._opened_at = self._clock()
+            if self.state is not State.OPEN:
+                self._transition(State.OPEN)
+
+    def cancel(self) -> None:
+        """Forget an allowed request that ended without an outcome."""
+        self._probing = False
+
+    def _transition(self, state: State) -> None:
+        self.state = state
+        registry.increment("circuit", state=state.value)
+
+
+class BreakerTransport(httpx.AsyncBaseTransport):
+    """Transport guarding requests with a `CircuitBreaker`.
+
+    Transport errors and 5xx responses count as failures; any other
+    response counts as a success. `QueueFullError` and `BucketLockedError`
+    reflect local load, not the upstream, and count as neither.
+    """
+
+    def __init__(
+        self, transport: httpx.AsyncBaseTransport, breaker: CircuitBreaker
+    ) -> None:
+        self.transport = transport
+        self.breaker = breaker
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if not self.breaker.allow():
+            registry.increment("circuit", result="rejected")
+            raise CircuitOpenError("Pursuit is unavailable; circuit open")
+        try:
+            response = await self.transport.handle_async_request(request)
+        except (QueueFullError, BucketLockedError):
+            self.breaker.cancel()
+            raise
+        except httpx.TransportError:
+            self.breaker.failure()
+            raise
+        except BaseException:
+            self.breaker.cancel()
+            raise
+        if response.status_code >= 500:
+            self.breaker.failure()
+        else:
+            self.breaker.success()
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
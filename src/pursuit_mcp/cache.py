@@ -0,0 +1,192 @@
+"""In-memory result cache for Pursuit searches."""
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from typing import NamedTuple, TypedDict
+
+from .types import PursuitResult
+
+
+class CacheStats(TypedDict):
+    """Counters describing cache effectiveness."""
+
+    hits: int
+    stale_hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes: int
+
+
+class Validators(NamedTuple):
+    """HTTP validators of a response, for revalidating it once expired."""
+
+    etag: str | None
+    last_modified: str | None
+
+    @classmethod
+    def from_headers(cls, headers: Mapping[str, str]) -> "Validators | None":
+        """Read `ETag` and `Last-Modified`; None if the response has neither."""
+        validators = cls(headers.get("ETag"), headers.get("Last-Modified"))
+        return validators if validators != (None, None) else None
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Build the request headers asking only for a changed response."""
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class Entry(NamedTuple):
+    """A cached result list."""
+
+    results: list[PursuitResult]
+    size: int
+    expires_at: float
+    validators: Validators | None
+
+
+class TTLCache:
+    """A bounded LRU cache whose entries expire after a fixed TTL.
+
+    Entries are evicted least-recently-used first whenever the cache holds
+    more than `max_entries` entries or more than `max_bytes` bytes of
+    response payload. Expired entries are kept for a further `grace`
+    seconds, during which `lookup` still returns them, marked as stale.
+    Empty results expire after `negative_ttl` instead, so a query answered
+    with nothing is not sent again at once, yet soon picks up new packages.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_entries: int,
+        max_bytes: int,
+        grace: float = 0.0,
+        negative_ttl: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create an empty cache.
+
+        Args:
+            ttl: Seconds an entry stays valid after it is stored
+            max_entries: Maximum number of entries kept
+            max_bytes: Maximum total payload size in bytes
+            grace: Seconds an expired entry may still be served as stale
+            negative_ttl: Seconds an empty result list stays valid;
+                `ttl` when omitted
+            clock: Monotonic time source, overridable for tests
+        """
+        self.ttl = ttl
+        self.grace = grace
+        self.negative_ttl = ttl if negative_ttl is None else negative_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._entries: OrderedDict[str, Entry] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> list[PursuitResult] | None:
+        """Return the cached results for `key`, or None on a miss.
+
+        Expired entries are counted as misses, even within the grace period.
+        """
+        entry = self._find(key)
+        if entry is None or entry.expires_at <= self._clock():
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry.results
+
+    def lookup(self, key: str) -> tuple[list[PursuitResult] | None, bool]:
+        """Return the cached results for `key` and whether they are stale.
+
+        Returns:
+            The results, or None on a miss, and True if they have expired
+            but are within the grace period
+        """
+        entry = self._find(key)
+        if entry is None:
+            self.misses += 1
+            return None, False
+        if entry.expires_at <= self._clock():
+            self.stale_hits += 1
+            return entry.results, True
+        self.hits += 1
+        return entry.results, False
+
+    def peek(self, key: str) -> Entry | None:
+        """Return the entry for `key`, fresh or stale, without counting it."""
+        entry = self._entries.get(key)
+        if entry is None or entry.expires_at + self.grace <= self._clock():
+            return None
+        return entry
+
+    def set(
+        self,
+        key: str,
+        results: list[PursuitResult],
+        size: int,
+        validators: Validators | None = None,
+    ) -> None:
+        """Store `results` under `key`.
+
+        Args:
+            key: Normalized query
+            results: Full, unsliced result list
+            size: Size of the raw response payload in bytes
+            validators: Validators of the response, for revalidating the
+                entry once it expires
+        """
+        if key in self._entries:
+            self._remove(key)
+        if size > self.max_bytes:
+            return
+        ttl = self.ttl if results else self.negative_ttl
+        self._entries[key] = Entry(results, size, self._clock() + ttl, validators)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry, keeping the counters."""
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> CacheStats:
+        """Return the current cache counters."""
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
+
+    def _find(self, key: str) -> Entry | None:
+        """Return the entry for `key`, dropping it if past its grace period."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at + self.grace <= self._clock():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
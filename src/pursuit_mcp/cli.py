@@ -0,0 +1,189 @@
+"""Command-line entry point of the MCP server, with startup profiling."""
+
+import argparse
+import json
+import os
+import selectors
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+# Launches the stdio server the way MCP clients do
+SERVER_COMMAND = [sys.executable, "-m", "pursuit_mcp.cli"]
+
+_INITIALIZE = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2025-06-18",
+        "capabilities": {},
+        "clientInfo": {"name": "pursuit-mcp-profile", "version": "0"},
+    },
+}
+
+
+def import_times(module: str = "pursuit_mcp.server") -> dict[str, float]:
+    """Measure the import time of `module` in a fresh interpreter.
+
+    Args:
+        module: Module to import
+
+    Returns:
+        Seconds spent importing each top-level package, excluding the
+        packages it imports
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times: defaultdict[str, float] = defaultdict(float)
+    for line in completed.stderr.splitlines():
+        # "import time: <self us> | <cumulative us> | <indented module>"
+        fields = line.removeprefix("import time:").split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        package = fields[2].strip().partition(".")[0]
+        times[package] += int(fields[0]) / 1e6
+    return dict(times)
+
+
+def time_to_ready(command: list[str] | None = None, timeout: float = 30.0) -> float:
+    """Measure how long a new stdio server takes to answer `initialize`.
+
+    Args:
+        command: Server command line; `SERVER_COMMAND` when omitted
+        timeout: Seconds to wait for the answer
+
+    Returns:
+        Seconds from process start until the answer arrives
+
+    Raises:
+        RuntimeError: If the server exits or times out before answering
+    """
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        command or SERVER_COMMAND,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+    assert process.stdin is not None and process.stdout is not None
+    try:
+        process.stdin.write(json.dumps(_INITIALIZE).encode() + b"\n")
+        process.stdin.flush()
+        answer = b""
+        with selectors.DefaultSelector() as selector:
+            selector.register(process.stdout, selectors.EVENT_READ)
+            while b"\n" not in answer:
+                if not selector.select(start + timeout - time.perf_counter()):
+                    raise RuntimeError(
+                        f"Server did not answer initialize within {timeout:g} s"
+                    )
+                chunk = os.read(process.stdout.fileno(), 65536)
+                if not chunk:
+                    raise RuntimeError("Server exited before answering initialize")
+                answer += chunk
+        return time.perf_counter() - start
+    finally:
+        process.kill()
+        process.wait(timeout)
+
+
+def profile_startup(top: int) -> str:
+    """Report the time to ready and the slowest packages to import."""
+    ready = time_to_ready()
+    times = import_times()
+    slowest = sorted(times.items(), key=lambda item: item[1], reverse=True)[:top]
+    width = max(len(package) for package, _ in slowest)
+    lines = [
+        f"Time to ready: {ready * 1000:.0f} ms",
+        (
+            f"Import of pursuit_mcp.server: {sum(times.values()) * 1000:.0f} ms, "
+            "slowest packages (excluding their imports):"
+        ),
+    ]
+    for package, seconds in slowest:
+        lines.append(f"  {package:<{width}}  {seconds * 1000:7.1f} ms")
+    return "\n".join(lines)
+
+
+def serve_http(host: str, port: int, workers: int) -> None:
+    """Serve the streamable HTTP transport from `workers` processes.
+
+    Several workers share one result cache and one upstream rate limit:
+    unless configured otherwise, the disk cache is enabled and the token
+    bucket is kept in SQLite next to it. The environment is set before
+    uvicorn starts the workers, which read it as their configuration.
+    """
+    import uvicorn
+
+    from .store import default_cache_dir
+
+    os.environ["PURSUIT_MCP_WORKERS"] = str(workers)
+    if workers > 1:
+        os.environ.setdefault("PURSUIT_MCP_DISK_CACHE", "1")
+        os.environ.setdefault(
+            "PURSUIT_MCP_SHARED_RATE_LIMIT",
+            str(default_cache_dir() / "ratelimit.sqlite3"),
+        )
+    uvicorn.run(
+        "pursuit_mcp.server:http_app",
+        factory=True,
+        host=host,
+        port=port,
+        workers=workers,
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the MCP server, or profile its startup."""
+    parser = argparse.ArgumentParser(
+        prog="pursuit-mcp",
+        description="MCP server for searching PureScript documentation on Pursuit.",
+    )
+    parser.add_argument(
+        "--transport",
+        choices=["stdio", "http"],
+        default="stdio",
+        help="Serve over stdio for one client, or streamable HTTP for many",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Server processes for the HTTP transport, sharing one cache "
+        "and rate limit",
+    )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Report time to ready and import time per package, then exit",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=15,
+        help="Packages listed by --profile-startup",
+    )
+    args = parser.parse_args(argv)
+
+    if args.profile_startup:
+        print(profile_startup(args.top))
+        return
+    if args.transport == "http":
+        serve_http(args.host, args.port, args.workers)
+        return
+
+    from .server import mcp
+
+    mcp.run()
+
+
+if __name__ == "__main__":
+    main()
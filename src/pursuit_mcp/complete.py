@@ -0,0 +1,178 @@
+"""Prefix and fuzzy completion of declaration and module names."""
+
+from collections import OrderedDict, deque
+from collections.abc import Iterable
+
+from .types import CompletionResult, PursuitResult
+
+# Trie nodes map characters to child nodes; this key holds the entries
+# whose (lowercased) name ends at the node.
+_END = ""
+
+# An entry is (name, type, module); module is "" for module entries
+Entry = tuple[str, str, str]
+
+
+class CompletionIndex:
+    """In-memory trie of declaration titles and module names.
+
+    Lookups are case-insensitive. `complete` returns names starting with the
+    prefix, shortest first, then names whose beginning is within a bounded
+    edit distance of the prefix.
+
+    Names added with `add` stay for the life of the index. Names seen in
+    search results are capped at `max_seen`, dropping the least recently
+    seen first, so a long-running server does not grow without bound.
+    """
+
+    def __init__(self, max_seen: int | None = None) -> None:
+        """Create an empty index.
+
+        Args:
+            max_seen: Maximum number of names kept from search results;
+                unbounded when omitted
+        """
+        self.max_seen = max_seen
+        self._root: dict = {}
+        self._entries: set[Entry] = set()
+        self._seen: OrderedDict[Entry, None] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, name: str, type: str, module: str = "") -> None:
+        """Add a name to the index.
+
+        Args:
+            name: Declaration title or module name
+            type: "declaration" or "module"
+            module: Defining module, for declarations
+        """
+        entry = (name, type, module)
+        self._seen.pop(entry, None)  # Kept for good from now on
+        self._insert(entry)
+
+    def add_results(self, results: Iterable[PursuitResult]) -> None:
+        """Add the declarations and modules found in Pursuit results."""
+        for result in results:
+            info = result["info"]
+            if info["type"] == "declaration":
+                self._see((info["title"], "declaration", info["module"]))
+            elif info["type"] == "module":
+                self._see((info["module"], "module", ""))
+
+    def _see(self, entry: Entry) -> None:
+        """Add a name seen in search results, evicting the stalest if full."""
+        if entry in self._seen:
+            self._seen.move_to_end(entry)
+            return
+        if entry in self._entries or not self._insert(entry):
+            return
+        self._seen[entry] = None
+        while self.max_seen is not None and len(self._seen) > self.max_seen:
+            stalest, _ = self._seen.popitem(last=False)
+            self._remove(stalest)
+
+    def _insert(self, entry: Entry) -> bool:
+        """Insert an entry into the trie; False if empty or already there."""
+        if not entry[0] or entry in self._entries:
+            return False
+        self._entries.add(entry)
+        node = self._root
+        for char in entry[0].lower():
+            node = node.setdefault(char, {})
+        node.setdefault(_END, []).append(entry)
+        return True
+
+    def _remove(self, entry: Entry) -> None:
+        """Remove an entry from the trie, pruning nodes left empty."""
+        self._entries.discard(entry)
+        path = [(self._root, "")]
+        for char in entry[0].lower():
+            path.append((path[-1][0][char], char))
+        node = path[-1][0]
+        node[_END].remove(entry)
+        if not node[_END]:
+            del node[_END]
+        for (parent, _), (child, char) in zip(path[-2::-1], path[:0:-1]):
+            if child:
+                break
+            del parent[char]
+
+    def complete(
+        self, prefix: str, limit: int = 10, max_distance: int = 1
+    ) -> list[CompletionResult]:
+        """Complete `prefix` to known names.
+
+        Args:
+            prefix: Beginning of a declaration title or module name
+            limit: Maximum number of completions to return
+            max_distance: Maximum edit distance between `prefix` and the
+                beginning of a fuzzy match
+
+        Returns:
+            Completions, exact prefix matches first, then by edit distance
+            and name length
+        """
+        prefix = prefix.lower()
+        completions: list[CompletionResult] = []
+        if limit <= 0:
+            return completions
+        seen: set[Entry] = set()
+        for distance, node in self._matching_nodes(prefix, max_distance):
+            for entry in _entries_below(node):
+                if entry in seen:
+                    continue
+                seen.add(entry)
+                completions.append(_completion(entry, distance))
+                if len(completions) == limit:
+                    return completions
+        return completions
+
+    def _matching_nodes(self, prefix: str, max_distance: int) -> list[tuple[int, dict]]:
+        """Find trie nodes whose path is within `max_distance` of `prefix`.
+
+        Walks the trie carrying one row of the Levenshtein matrix per node
+        and prunes subtrees whose best row entry already exceeds the bound.
+        Nodes are returned closest first, shallower nodes first on ties.
+        """
+        matches: list[tuple[int, int, dict]] = []
+        stack = [(self._root, list(range(len(prefix) + 1)), 0)]
+        while stack:
+            node, row, depth = stack.pop()
+            if row[-1] <= max_distance:
+                matches.append((row[-1], depth, node))
+            for char, child in node.items():
+                if char == _END:
+                    continue
+                next_row = [row[0] + 1]
+                for i, prefix_char in enumerate(prefix, start=1):
+                    next_row.append(
+                        min(
+                            next_row[i - 1] + 1,
+                            row[i] + 1,
+                            row[i - 1] + (prefix_char != char),
+                        )
+                    )
+                if min(next_row) <= max_distance:
+                    stack.append((child, next_row, depth + 1))
+        matches.sort(key=lambda match: (match[0], match[1]))
+        return [(distance, node) for distance, _, node in matches]
+
+
+def _entries_below(node: dict) -> Iterable[Entry]:
+    """Yield the entries in the subtree of `node`, shortest names first."""
+    queue = deque([node])
+    while queue:
+        current = queue.popleft()
+        yield from sorted(current.get(_END, ()))
+        queue.extend(child for char, child in sorted(current.items()) if char != _END)
+
+
+def _completion(entry: Entry, distance: int) -> CompletionResult:
+    name, type, module = entry
+    completion: CompletionResult = {"name": name, "type": type}
+    if module:
+        completion["module"] = module
+    completion["distance"] = distance
+    return completion
@@ -0,0 +1,80 @@
+"""Compression of Pursuit transfers and of cached payloads."""
+
+import zlib
+from importlib.util import find_spec
+
+try:
+    import zstandard
+except ImportError:  # Optional: install the `compress` extra
+    zstandard = None
+
+# Size of zstd dictionaries trained on cached payloads
+DICTIONARY_SIZE = 32 * 1024
+
+
+def accept_encoding() -> str:
+    """Build an `Accept-Encoding` header preferring the best installed decoder.
+
+    httpx decodes zstd with the optional `zstandard` package and brotli with
+    `brotli` or `brotlicffi`; gzip and deflate are always available.
+    """
+    encodings = []
+    if find_spec("zstandard") is not None:
+        encodings.append("zstd")
+    if find_spec("brotli") is not None or find_spec("brotlicffi") is not None:
+        encodings.append("br;q=0.9")
+    return ", ".join(encodings + ["gzip;q=0.8", "deflate;q=0.5"])
+
+
+class Codec:
+    """Compressor of cached payloads: zstd when installed, zlib otherwise.
+
+    Pursuit responses repeat the same keys, URLs and markup, so a zstd
+    dictionary trained on earlier responses compresses small payloads far
+    better than zstd or zlib alone.
+    """
+
+    def __init__(self, dictionary: bytes | None = None) -> None:
+        """Create a codec.
+
+        Args:
+            dictionary: zstd dictionary from `train`; requires zstd
+        """
+        if zstandard is None:
+            if dictionary is not None:
+                raise RuntimeError("zstd dictionaries require the zstandard package")
+            self.encoding = "zlib"
+            return
+        self.encoding = "zstd"
+        dict_data = None
+        if dictionary is not None:
+            dict_data = zstandard.ZstdCompressionDict(dictionary)
+        self._compressor = zstandard.ZstdCompressor(level=3, dict_data=dict_data)
+        self._decompressor = zstandard.ZstdDecompressor(dict_data=dict_data)
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress `data`."""
+        if self.encoding == "zlib":
+            return zlib.compress(data)
+        return self._compressor.compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        """Decompress data produced by `compress`."""
+        if self.encoding == "zlib":
+            return zlib.decompress(data)
+        return self._decompressor.decompress(data)
+
+
+def train(samples: list[bytes]) -> bytes | None:
+    """Train a zstd dictionary on sample payloads.
+
+    Returns:
+        The dictionary, or None without zstd or with too few samples
+    """
+    if zstandard is None:
+        return None
+    try:
+        # A fresh list, as the stubs take the invariant list[ByteString]
+        return zstandard.train_dictionary(DICTIONARY_SIZE, [*samples]).as_bytes()
+    except zstandard.ZstdError:
+        return None
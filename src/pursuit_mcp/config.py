@@ -0,0 +1,112 @@
+"""Runtime configuration read from environment variables."""
+
+import os
+
+
+def env_bool(name: str, default: bool) -> bool:
+    """Read a boolean environment variable.
+
+    Args:
+        name: Environment variable name
+        default: Value used when the variable is unset or empty
+
+    Returns:
+        True for "1", "true", "yes" or "on" (case-insensitive), else False
+    """
+    value = os.environ.get(name, "").strip().lower()
+    if not value:
+        return default
+    return value in ("1", "true", "yes", "on")
+
+
+def env_int(name: str, default: int) -> int:
+    """Read an integer environment variable, falling back to `default`."""
+    value = os.environ.get(name, "").strip()
+    return int(value) if value else default
+
+
+def env_float(name: str, default: float) -> float:
+    """Read a float environment variable, falling back to `default`."""
+    value = os.environ.get(name, "").strip()
+    return float(value) if value else default
+
+
+# Pursuit search endpoint; point it at `pursuit-mcp-fake` for load tests
+BASE_URL = os.environ.get(
+    "PURSUIT_MCP_BASE_URL", "https://pursuit.purescript.org/search"
+)
+
+# Number of results Pursuit returns per page; a shorter page is the last one
+PAGE_SIZE = env_int("PURSUIT_MCP_PAGE_SIZE", 50)
+
+# HTTP connection pool
+HTTP2 = env_bool("PURSUIT_MCP_HTTP2", False)
+MAX_CONNECTIONS = env_int("PURSUIT_MCP_MAX_CONNECTIONS", 20)
+MAX_KEEPALIVE_CONNECTIONS = env_int("PURSUIT_MCP_MAX_KEEPALIVE_CONNECTIONS", 10)
+KEEPALIVE_EXPIRY = env_float("PURSUIT_MCP_KEEPALIVE_EXPIRY", 30.0)
+
+# Client-side throttling of Pursuit requests; RATE_LIMIT=0 disables the
+# token bucket
+RATE_LIMIT = env_float("PURSUIT_MCP_RATE_LIMIT", 10.0)
+RATE_BURST = env_int("PURSUIT_MCP_RATE_BURST", 20)
+MIN_CONCURRENCY = env_int("PURSUIT_MCP_MIN_CONCURRENCY", 1)
+QUEUE_SIZE = env_int("PURSUIT_MCP_QUEUE_SIZE", 100)
+LATENCY_TARGET = env_float("PURSUIT_MCP_LATENCY_TARGET", 2.0)
+# SQLite file holding a token bucket shared by every process using it;
+# unset gives each process its own bucket
+SHARED_RATE_LIMIT_PATH = os.environ.get("PURSUIT_MCP_SHARED_RATE_LIMIT", "")
+
+# Retries of failed Pursuit requests, with jittered exponential backoff
+RETRIES = env_int("PURSUIT_MCP_RETRIES", 2)
+RETRY_BACKOFF = env_float("PURSUIT_MCP_RETRY_BACKOFF", 0.1)
+RETRY_BACKOFF_MAX = env_float("PURSUIT_MCP_RETRY_BACKOFF_MAX", 2.0)
+
+# Hedged requests: a second copy of a request slower than the observed p95
+HEDGE = env_bool("PURSUIT_MCP_HEDGE", False)
+HEDGE_MIN_DELAY = env_float("PURSUIT_MCP_HEDGE_MIN_DELAY", 0.05)
+HEDGE_MAX_RATIO = env_float("PURSUIT_MCP_HEDGE_MAX_RATIO", 0.1)
+
+# Circuit breaker: consecutive failures that stop requests to Pursuit, and
+# seconds before a probe request checks whether it is back; 0 disables it
+BREAKER_THRESHOLD = env_int("PURSUIT_MCP_BREAKER_THRESHOLD", 5)
+BREAKER_RESET = env_float("PURSUIT_MCP_BREAKER_RESET", 30.0)
+
+# In-memory result cache
+CACHE_TTL = env_float("PURSUIT_MCP_CACHE_TTL", 300.0)
+# Seconds a query without results is cached
+NEGATIVE_CACHE_TTL = env_float("PURSUIT_MCP_NEGATIVE_CACHE_TTL", 30.0)
+# Seconds past CACHE_TTL an entry is still served while being refreshed
+CACHE_STALE_TTL = env_float("PURSUIT_MCP_CACHE_STALE_TTL", 3600.0)
+CACHE_MAX_ENTRIES = env_int("PURSUIT_MCP_CACHE_MAX_ENTRIES", 512)
+CACHE_MAX_BYTES = env_int("PURSUIT_MCP_CACHE_MAX_BYTES", 32 * 1024 * 1024)
+
+# Persistent on-disk cache
+DISK_CACHE = env_bool("PURSUIT_MCP_DISK_CACHE", False)
+DISK_CACHE_PATH = os.environ.get("PURSUIT_MCP_DISK_CACHE_PATH", "")
+DISK_CACHE_TTL = env_float("PURSUIT_MCP_DISK_CACHE_TTL", 86400.0)
+DISK_CACHE_MAX_BYTES = env_int("PURSUIT_MCP_DISK_CACHE_MAX_BYTES", 256 * 1024 * 1024)
+
+# Startup cache warming: queries from WARM_QUERIES_PATH (one per line),
+# then the WARM_TOP_N most frequent queries in ACCESS_LOG_PATH
+WARM_QUERIES_PATH = os.environ.get("PURSUIT_MCP_WARM_QUERIES", "")
+ACCESS_LOG_PATH = os.environ.get("PURSUIT_MCP_ACCESS_LOG", "")
+WARM_TOP_N = env_int("PURSUIT_MCP_WARM_TOP_N", 50)
+WARM_CONCURRENCY = env_int("PURSUIT_MCP_WARM_CONCURRENCY", 4)
+WARM_BUDGET = env_float("PURSUIT_MCP_WARM_BUDGET", 30.0)
+
+# Batch search
+BATCH_CONCURRENCY = env_int("PURSUIT_MCP_BATCH_CONCURRENCY", 8)
+
+# Offline index built with `pursuit-mcp-index`
+LOCAL_INDEX_PATH = os.environ.get("PURSUIT_MCP_LOCAL_INDEX", "")
+
+# Identifier completion
+COMPLETION_MAX_DISTANCE = env_int("PURSUIT_MCP_COMPLETION_MAX_DISTANCE", 2)
+# Names from search results kept for completion, least recently seen dropped
+COMPLETION_MAX_SEEN = env_int("PURSUIT_MCP_COMPLETION_MAX_SEEN", 10000)
+
+# Server processes behind the HTTP transport, set by `pursuit-mcp --workers`
+WORKERS = env_int("PURSUIT_MCP_WORKERS", 1)
+
+# Serve Prometheus metrics at /metrics under an HTTP transport
+PROMETHEUS = env_bool("PURSUIT_MCP_PROMETHEUS", False)
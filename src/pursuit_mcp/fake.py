@@ -0,0 +1,298 @@
+"""Stand-in Pursuit server for load tests, benchmarks and fault injection."""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import socket
+import threading
+from collections.abc import AsyncIterator, Callable, Generator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+
+from . import config
+from .types import PursuitResult
+
+# Draws one delay in seconds
+Latency = Callable[[random.Random], float]
+
+
+def parse_latency(spec: str) -> Latency:
+    """Parse a latency distribution such as "uniform:0.01,0.05".
+
+    Supported forms, all in seconds:
+
+    - `fixed:D` always waits D
+    - `uniform:LOW,HIGH` waits between LOW and HIGH
+    - `exponential:MEAN` waits an exponentially distributed time
+    - `lognormal:MEDIAN,SIGMA` has a long tail, like real server latency
+
+    Args:
+        spec: Distribution name and parameters
+
+    Returns:
+        A function drawing one delay from a random generator
+
+    Raises:
+        ValueError: If the distribution or its parameters are invalid
+    """
+    name, _, args = spec.partition(":")
+    params = [float(arg) for arg in args.split(",")] if args else []
+    if name == "fixed" and len(params) == 1:
+        (delay,) = params
+        return lambda rng: delay
+    if name == "uniform" and len(params) == 2:
+        low, high = params
+        return lambda rng: rng.uniform(low, high)
+    if name == "exponential" and len(params) == 1:
+        (mean,) = params
+        return lambda rng: rng.expovariate(1 / mean) if mean > 0 else 0.0
+    if name == "lognormal" and len(params) == 2:
+        median, sigma = params
+        return lambda rng: median * rng.lognormvariate(0, sigma)
+    raise ValueError(f"Invalid latency distribution: {spec!r}")
+
+
+def synthetic_results(count: int) -> list[PursuitResult]:
+    """Generate declaration records in the Pursuit search API schema."""
+    results: list[PursuitResult] = []
+    for number in range(count):
+        package = f"purescript-package{number % 100}"
+        module = f"Data.Module{number % 50}"
+        docs = f"Documentation for value{number}. " * 8
+        results.append(
+            {
+                "package": package,
+                "version": "1.0.0",
+                "markup": f'<div class="decl"><p>{docs}</p></div>',
+                "text": docs,
+                "info": {
+                    "type": "declaration",
+                    "module": module,
+                    "title": f"value{number}",
+                    "typeOrValue": "ValueLevel",
+                    "typeText": "forall f a b. Functor f => (a -> b) -> f a -> f b",
+                },
+                "url": f"https://pursuit.purescript.org/packages/{package}/1.0.0/"
+                f"docs/{module}#v:value{number}",
+            }
+        )
+    return results
+
+
+@dataclass
+class FakePursuit:
+    """Behaviour of the stand-in server.
+
+    Attributes:
+        records: Records served, in order
+        match: Serve only records whose title, module or package contains
+            the query (case-insensitively) instead of all of them
+        page_size: Results per page; later pages are requested with `page=N`
+        latency: Delay before each response is sent
+        faults: Probability of answering with each HTTP status instead
+        retry_after: `Retry-After` seconds sent with 429 responses
+        pad_docs: Characters appended to every `text` and `markup`
+        chunk_size: Bytes per body chunk when streaming slowly
+        chunk_delay: Seconds between body chunks; 0 sends the body at once
+        etag: Send an `ETag` and answer a matching `If-None-Match` with 304
+        seed: Seed for latency and fault draws
+    """
+
+    records: list[PursuitResult] = field(default_factory=lambda: synthetic_results(120))
+    match: bool = False
+    page_size: int = config.PAGE_SIZE
+    latency: Latency = field(default=lambda rng: 0.0)
+    faults: dict[int, float] = field(default_factory=dict)
+    retry_after: float = 1.0
+    pad_docs: int = 0
+    chunk_size: int = 4096
+    chunk_delay: float = 0.0
+    etag: bool = False
+    seed: int | None = None
+
+    def app(self) -> Starlette:
+        """Build the ASGI application serving `/search`."""
+        rng = random.Random(self.seed)
+        padding = "x" * self.pad_docs
+        records = [
+            {
+                **record,
+                "text": record["text"] + padding,
+                "markup": record["markup"] + padding,
+            }
+            for record in self.records
+        ]
+
+        async def search(request: Request) -> Response:
+            if "q" not in request.query_params:
+                return Response("Missing query", status_code=400)
+            delay = self.latency(rng)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            draw = rng.random()
+            for status, probability in self.faults.items():
+                if draw < probability:
+                    headers = {}
+                    if status == 429:
+                        headers["Retry-After"] = f"{self.retry_after:g}"
+                    return Response(f"Injected {status}", status, headers=headers)
+                draw -= probability
+
+            matches = records
+            if self.match:
+                query = request.query_params["q"].lower()
+                matches = [r for r in records if query in _searchable(r)]
+            page = int(request.query_params.get("page", 1))
+            start = (page - 1) * self.page_size
+            body = json.dumps(matches[start : start + self.page_size]).encode()
+            headers = {}
+            if self.etag:
+                headers["ETag"] = f'"{hashlib.sha1(body).hexdigest()}"'
+                if request.headers.get("If-None-Match") == headers["ETag"]:
+                    return Response(status_code=304, headers=headers)
+            if self.chunk_delay <= 0:
+                return Response(body, headers=headers, media_type="application/json")
+            return StreamingResponse(
+                self._chunks(body), headers=headers, media_type="application/json"
+            )
+
+        return Starlette(routes=[Route("/search", search)])
+
+    async def _chunks(self, body: bytes) -> AsyncIterator[bytes]:
+        for start in range(0, len(body), self.chunk_size):
+            if start:
+                await asyncio.sleep(self.chunk_delay)
+            yield body[start : start + self.chunk_size]
+
+
+def _searchable(record: dict) -> str:
+    info = record["info"]
+    names = (info.get("title"), info.get("module"), record["package"])
+    return "\n".join(name for name in names if name).lower()
+
+
+@contextmanager
+def running(
+    fake: FakePursuit, host: str = "127.0.0.1", port: int = 0
+) -> Generator[str]:
+    """Serve `fake` from a background thread.
+
+    Args:
+        fake: Server behaviour
+        host: Interface to listen on
+        port: Port to listen on; 0 picks a free one
+
+    Yields:
+        The search endpoint URL, suitable for `config.BASE_URL`
+    """
+    import uvicorn
+
+    # With proto=0 asyncio would leave Nagle on, delaying reused connections
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP)
+    sock.bind((host, port))
+    server = uvicorn.Server(
+        uvicorn.Config(fake.app(), log_level="warning", lifespan="off")
+    )
+    thread = threading.Thread(target=server.run, kwargs={"sockets": [sock]})
+    thread.start()
+    try:
+        while not server.started:
+            if not thread.is_alive():
+                raise RuntimeError("Stand-in Pursuit server failed to start")
+            threading.Event().wait(0.01)
+        bound_host, bound_port = sock.getsockname()
+        yield f"http://{bound_host}:{bound_port}/search"
+    finally:
+        server.should_exit = True
+        thread.join()
+        sock.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the stand-in Pursuit server."""
+    import uvicorn
+
+    parser = argparse.ArgumentParser(
+        prog="pursuit-mcp-fake",
+        description="Serve Pursuit search results from fixtures, with "
+        "configurable latency and faults.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument(
+        "--fixture",
+        type=Path,
+        help="JSON list of Pursuit search results (default: synthetic records)",
+    )
+    parser.add_argument(
+        "--results",
+        type=int,
+        default=120,
+        help="Number of synthetic records when no fixture is given",
+    )
+    parser.add_argument(
+        "--match",
+        action="store_true",
+        help="Serve only records whose name contains the query",
+    )
+    parser.add_argument("--page-size", type=int, default=config.PAGE_SIZE)
+    parser.add_argument(
+        "--latency",
+        type=parse_latency,
+        default="fixed:0",
+        help="Response delay distribution, e.g. lognormal:0.05,0.5",
+    )
+    parser.add_argument(
+        "--fault",
+        action="append",
+        default=[],
+        metavar="STATUS:PROBABILITY",
+        help="Answer with STATUS at this rate, e.g. 429:0.1 (repeatable)",
+    )
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--pad-docs", type=int, default=0)
+    parser.add_argument("--chunk-size", type=int, default=4096)
+    parser.add_argument("--chunk-delay", type=float, default=0.0)
+    parser.add_argument(
+        "--etag",
+        action="store_true",
+        help="Send ETags and answer conditional requests with 304",
+    )
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    faults = {}
+    for fault in args.fault:
+        status, _, probability = fault.partition(":")
+        faults[int(status)] = float(probability)
+    fake = FakePursuit(
+        records=(
+            json.loads(args.fixture.read_bytes())
+            if args.fixture
+            else synthetic_results(args.results)
+        ),
+        match=args.match,
+        page_size=args.page_size,
+        latency=args.latency,
+        faults=faults,
+        retry_after=args.retry_after,
+        pad_docs=args.pad_docs,
+        chunk_size=args.chunk_size,
+        chunk_delay=args.chunk_delay,
+        etag=args.etag,
+        seed=args.seed,
+    )
+    uvicorn.run(fake.app(), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,12 @@
 """Format Pursuit search results for display."""
 
-from typing import cast
+import json
+from collections.abc import Collection
+from typing import cast, get_args
 
 from .types import (
+    CompactOutput,
+    FormattedField,
     PursuitResult,
     FormatOutput,
     FormattedResult,
@@ -11,12 +15,30 @@ from .types import (
     PackageResult,
 )
 
+try:
+    import msgspec
+except ImportError:  # Optional: install the `fast` extra
+    msgspec = None
 
-def format(results: list[PursuitResult]) -> FormatOutput:
+
+# Marks documentation cut short to fit an output budget
+ELLIPSIS = "…"
+
+# Common prefix of Pursuit documentation URLs
+URL_BASE = "https://pursuit.purescript.org/packages/"
+
+# Stands in for a field a result does not have in compact rows
+_MISSING: list = []
+
+
+def format(
+    results: list[PursuitResult], fields: Collection[FormattedField] | None = None
+) -> FormatOutput:
     """Format Pursuit search results as structured dict.
 
     Args:
         results: List of Pursuit search results
+        fields: Fields to include in each result; all fields when omitted
 
     Returns:
         Formatted results dictionary with results list and count
@@ -24,45 +46,328 @@ def format(results: list[PursuitResult]) -> FormatOutput:
     if not results:
         return {"results": [], "count": 0}
 
+    keep = _ALL_FIELDS if fields is None else frozenset(fields)
     formatted_results: list[FormattedResult] = []
     for result in results:
         formatted_result: FormattedResult = {}
 
         # Package and version information
-        if "package" in result:
+        if "package" in keep and "package" in result:
             formatted_result["package"] = result["package"]
 
-        if "version" in result:
+        if "version" in keep and "version" in result:
             formatted_result["version"] = result["version"]
 
         # Documentation text
-        if "text" in result:
+        if "docs" in keep and "text" in result:
             formatted_result["docs"] = result["text"]
 
         # Result info (package/module/declaration)
         if "info" in result:
             info = result["info"]
             result_type = info["type"]
-            formatted_result["type"] = result_type
+            if "type" in keep:
+                formatted_result["type"] = result_type
 
             # Extract type-specific information
             if result_type == "declaration":
                 decl_info = cast(DeclarationResult, info)
-                formatted_result["module"] = decl_info["module"]
-                formatted_result["title"] = decl_info["title"]
-                if "typeText" in decl_info:
+                if "module" in keep:
+                    formatted_result["module"] = decl_info["module"]
+                if "title" in keep:
+                    formatted_result["title"] = decl_info["title"]
+                if "typeText" in keep and "typeText" in decl_info:
                     formatted_result["typeText"] = decl_info["typeText"]
             elif result_type == "module":
                 mod_info = cast(ModuleResult, info)
-                formatted_result["module"] = mod_info["module"]
+                if "module" in keep:
+                    formatted_result["module"] = mod_info["module"]
             elif result_type == "package":
                 pkg_info = cast(PackageResult, info)
-                formatted_result["deprecated"] = pkg_info["deprecated"]
+                if "deprecated" in keep:
+                    formatted_result["deprecated"] = pkg_info["deprecated"]
 
         # URL to the result
-        if "url" in result:
+        if "url" in keep and "url" in result:
             formatted_result["url"] = result["url"]
 
         formatted_results.append(formatted_result)
 
     return {"results": formatted_results, "count": len(results)}
+
+
+def format_json(
+    results: list[PursuitResult],
+    fields: Collection[FormattedField] | None = None,
+    max_bytes: int | None = None,
+    compact: bool = False,
+) -> bytes:
+    """Format Pursuit search results straight to UTF-8 JSON.
+
+    Equivalent to `json.dumps(format(results, fields))`, but when msgspec is
+    installed and all fields are wanted, each result is copied field by
+    field into a typed struct and encoded in one pass, without building the
+    intermediate dicts. Fields `format` drops, such as `markup`, are never
+    touched.
+
+    Args:
+        results: List of Pursuit search results
+        fields: Fields to include in each result; all fields when omitted
+        max_bytes: Size budget for the encoded output, met by shortening
+            the results as described in `fit`
+        compact: Encode the columnar `CompactOutput` from `compact`
+            instead of `FormatOutput`
+
+    Returns:
+        The formatted results dictionary encoded as JSON
+    """
+    if max_bytes is not None:
+        return fit(format(results, fields), max_bytes, compact)
+    if compact:
+        return _encode(to_compact(format(results, fields)))
+    if msgspec is None or fields is not None:
+        return _encode(format(results, fields))
+    return _encoder.encode(
+        _Output(results=[_formatted(result) for result in results], count=len(results))
+    )
+
+
+def fit(output: FormatOutput, max_bytes: int, compact: bool = False) -> bytes:
+    """Encode formatted results, shortening them to fit `max_bytes`.
+
+    Reductions are applied in a fixed order until the output fits:
+
+    1. Every `docs` longer than a common length is cut to that length and
+       ends with an ellipsis; the longest length that fits is used.
+    2. `docs` is dropped from every result.
+    3. Results are dropped from the end, and `count` is lowered to match.
+
+    Args:
+        output: Formatted results, e.g. from `format`
+        max_bytes: Maximum size of the encoded output
+        compact: Measure and encode the columnar form from `to_compact`
+
+    Returns:
+        The (possibly shortened) results encoded as JSON; an empty result
+        list if even that does not fit
+    """
+
+    def encode(output: FormatOutput) -> bytes:
+        encoded: FormatOutput | CompactOutput = (
+            to_compact(output) if compact else output
+        )
+        return _encode(encoded)
+
+    encoded = encode(output)
+    if len(encoded) <= max_bytes:
+        return encoded
+
+    results = output["results"]
+    longest = max((len(result.get("docs", "")) for result in results), default=0)
+    low, high = 0, longest - 1
+    best = None
+    while low <= high:
+        length = (low + high) // 2
+        candidate = encode(
+            {"results": _truncate_docs(results, length), "count": len(results)}
+        )
+        if len(candidate) <= max_bytes:
+            best, low = candidate, length + 1
+        else:
+            high = length - 1
+    if best is not None:
+        return best
+
+    results = [_without_docs(result) for result in results]
+    while results:
+        encoded = encode({"results": results, "count": len(results)})
+        if len(encoded) <= max_bytes:
+            return encoded
+        results.pop()
+    return encode({"results": [], "count": 0})
+
+
+def to_compact(output: FormatOutput) -> CompactOutput:
+    """Convert formatted results to a columnar form without repeated keys.
+
+    `columns` lists the fields present in any result, in `FormattedResult`
+    order, and each row holds one result's values in that order. A field
+    missing from a result is written as `[]`, which no field value can be.
+
+    `url` is shortened to what cannot be derived from the other columns:
+    the part after `URL_BASE` + package, or after `/{version}/docs/{module}`
+    for modules and declarations, with a trailing declaration title left
+    off (`"#v:"` instead of `"#v:map"`). URLs that do not follow this shape
+    are kept whole, wrapped in a list. `from_compact` reverses the
+    conversion exactly.
+
+    Args:
+        output: Formatted results, e.g. from `format`
+
+    Returns:
+        The same results as a header row plus value rows
+    """
+    results = output["results"]
+    present = set().union(*results)
+    columns = [field for field in _FIELD_ORDER if field in present]
+    rows = []
+    for result in results:
+        row: list = [result.get(column, _MISSING) for column in columns]
+        if "url" in result:
+            row[columns.index("url")] = _url_cell(result)
+        rows.append(row)
+    return {
+        "columns": columns,
+        "rows": rows,
+        "count": output["count"],
+        "urlBase": URL_BASE,
+    }
+
+
+def from_compact(compact: CompactOutput) -> FormatOutput:
+    """Rebuild the `FormatOutput` that `to_compact` was given.
+
+    Args:
+        compact: Columnar results from `to_compact`
+
+    Returns:
+        Formatted results dictionary with results list and count
+    """
+    columns = compact["columns"]
+    results: list[FormattedResult] = []
+    for row in compact["rows"]:
+        result = cast(
+            FormattedResult,
+            {column: value for column, value in zip(columns, row) if value != _MISSING},
+        )
+        if "url" in result:
+            result["url"] = _expand_url(result, result["url"], compact["urlBase"])
+        results.append(result)
+    return {"results": results, "count": compact["count"]}
+
+
+def _url_cell(result: FormattedResult) -> str | list[str]:
+    """Shorten `result["url"]` to the part `_expand_url` cannot derive."""
+    url = result["url"]
+    stem = _url_stem(result, URL_BASE)
+    if stem is not None and url.startswith(stem):
+        cell = url[len(stem) :]
+        title = result.get("title")
+        if title and cell.startswith("#") and cell.endswith(":" + title):
+            cell = cell[: -len(title)]
+        if _expand_url(result, cell, URL_BASE) == url:
+            return cell
+    return [url]
+
+
+def _expand_url(result: FormattedResult, cell: str | list[str], base: str) -> str:
+    if isinstance(cell, list):
+        return cell[0]
+    url = cast(str, _url_stem(result, base)) + cell
+    if cell.startswith("#") and cell.endswith(":"):
+        url += result.get("title", "")
+    return url
+
+
+def _url_stem(result: FormattedResult, base: str) -> str | None:
+    """Return the URL prefix implied by a result's package, version and module."""
+    if "package" not in result:
+        return None
+    if "module" not in result:
+        return base + result["package"]
+    if "version" not in result:
+        return None
+    return f"{base}{result['package']}/{result['version']}/docs/{result['module']}"
+
+
+def _truncate_docs(
+    results: list[FormattedResult], length: int
+) -> list[FormattedResult]:
+    """Cut every `docs` longer than `length` characters, adding an ellipsis."""
+    truncated = []
+    for result in results:
+        docs = result.get("docs")
+        if docs is not None and len(docs) > length:
+            result = cast(
+                FormattedResult,
+                {**result, "docs": docs[:length].rstrip() + ELLIPSIS},
+            )
+        truncated.append(result)
+    return truncated
+
+
+def _without_docs(result: FormattedResult) -> FormattedResult:
+    return cast(
+        FormattedResult, {key: value for key, value in result.items() if key != "docs"}
+    )
+
+
+def _encode(output: FormatOutput | CompactOutput) -> bytes:
+    if msgspec is None:
+        return json.dumps(output, ensure_ascii=False).encode()
+    return _encoder.encode(output)
+
+
+_FIELD_ORDER: tuple[str, ...] = get_args(FormattedField)
+_ALL_FIELDS: frozenset[str] = frozenset(_FIELD_ORDER)
+
+if msgspec is not None:
+    UNSET = msgspec.UNSET
+
+    class _Formatted(msgspec.Struct, omit_defaults=True):
+        """`FormattedResult` as a struct; unset fields are left out."""
+
+        package: str | msgspec.UnsetType = UNSET
+        version: str | msgspec.UnsetType = UNSET
+        docs: str | msgspec.UnsetType = UNSET
+        type: str | msgspec.UnsetType = UNSET
+        module: str | msgspec.UnsetType = UNSET
+        title: str | msgspec.UnsetType = UNSET
+        typeText: str | None | msgspec.UnsetType = UNSET
+        deprecated: bool | msgspec.UnsetType = UNSET
+        url: str | msgspec.UnsetType = UNSET
+
+    class _Output(msgspec.Struct):
+        results: list[_Formatted]
+        count: int
+
+    _encoder = msgspec.json.Encoder()
+
+    def _formatted(result: PursuitResult) -> "_Formatted":
+        get = result.get
+        info = get("info")
+        if info is None:
+            return _Formatted(
+                package=get("package", UNSET),
+                version=get("version", UNSET),
+                docs=get("text", UNSET),
+                url=get("url", UNSET),
+            )
+        result_type = info["type"]
+        if result_type == "declaration":
+            decl_info = cast(DeclarationResult, info)
+            return _Formatted(
+                package=get("package", UNSET),
+                version=get("version", UNSET),
+                docs=get("text", UNSET),
+                type=result_type,
+                module=decl_info["module"],
+                title=decl_info["title"],
+                typeText=decl_info.get("typeText", UNSET),
+                url=get("url", UNSET),
+            )
+        return _Formatted(
+            package=get("package", UNSET),
+            version=get("version", UNSET),
+            docs=get("text", UNSET),
+            type=result_type,
+            module=(
+                cast(ModuleResult, info)["module"] if result_type == "module" else UNSET
+            ),
+            deprecated=(
+                cast(PackageResult, info)["deprecated"]
+                if result_type == "package"
+                else UNSET
+            ),
+            url=get("url", UNSET),
+        )
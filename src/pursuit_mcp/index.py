@@ -0,0 +1,250 @@
+"""Offline index of Pursuit documentation for network-free lookups."""
+
+import argparse
+import json
+import sqlite3
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from .signature import SignatureIndex, is_signature_query
+from .types import (
+    DeclarationResult,
+    ModuleResult,
+    PackageResult,
+    PursuitResult,
+    PursuitResultInfo,
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    package TEXT NOT NULL,
+    version TEXT NOT NULL,
+    module TEXT,
+    title TEXT,
+    type_or_value TEXT,
+    type_text TEXT,
+    deprecated INTEGER,
+    text TEXT NOT NULL,
+    url TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS records_title ON records (title COLLATE NOCASE)
+    WHERE kind = 'declaration';
+CREATE INDEX IF NOT EXISTS records_module ON records (module COLLATE NOCASE)
+    WHERE kind = 'module';
+CREATE INDEX IF NOT EXISTS records_package ON records (package COLLATE NOCASE)
+    WHERE kind = 'package';
+"""
+
+_COLUMNS = (
+    "kind, package, version, module, title, type_or_value, type_text, "
+    "deprecated, text, url"
+)
+
+# Exact-case matches rank before case-insensitive ones; within each group
+# declarations come before modules, then packages, in insertion order
+_LOOKUP = f"""
+SELECT {_COLUMNS}, title = :query AS exact, 0 AS section, id FROM records
+WHERE kind = 'declaration' AND title = :query COLLATE NOCASE
+UNION ALL
+SELECT {_COLUMNS}, module = :query, 1, id FROM records
+WHERE kind = 'module' AND module = :query COLLATE NOCASE
+UNION ALL
+SELECT {_COLUMNS}, package = :query OR package = 'purescript-' || :query, 2, id
+FROM records
+WHERE kind = 'package' AND (package = :query COLLATE NOCASE
+    OR package = 'purescript-' || :query COLLATE NOCASE)
+ORDER BY exact DESC, section, id
+LIMIT :limit
+"""
+
+
+class LocalIndex:
+    """SQLite-backed index of package, module and declaration records.
+
+    Records keep every `PursuitResult` field except the HTML `markup`, and
+    are looked up through indexes on declaration titles, module names and
+    package names, so a query is answered without any network I/O. Type
+    signature queries are answered by a `SignatureIndex` over the
+    declarations once `build_signatures` has run; until then they find
+    nothing.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Open (and create if needed) the index database.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.executescript(_SCHEMA)
+        self.signatures: SignatureIndex | None = None
+        self._closed = False
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+
+    def ingest(self, results: Iterable[PursuitResult]) -> int:
+        """Add Pursuit records (e.g. from a JSON export) to the index.
+
+        Args:
+            results: Records in the Pursuit search API schema
+
+        Returns:
+            Number of records added
+        """
+        self.signatures = None
+        with self._conn:
+            cursor = self._conn.executemany(
+                f"INSERT INTO records ({_COLUMNS}) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (_to_row(result) for result in results),
+            )
+        return cursor.rowcount
+
+    def build_signatures(self) -> SignatureIndex | None:
+        """Build the signature index over every declaration with a `typeText`.
+
+        Building takes seconds for a full Pursuit export, so this reads
+        through a connection of its own and may run in a worker thread. It
+        stops early, returning None, when the index is closed meanwhile.
+        """
+        conn = sqlite3.connect(self.path)
+        try:
+            signatures = SignatureIndex()
+            for result in _declarations(conn):
+                if self._closed:
+                    return None
+                signatures.add(result)
+        finally:
+            conn.close()
+        self.signatures = signatures
+        return signatures
+
+    def search(self, query: str, limit: int = 10) -> list[PursuitResult]:
+        """Look up declarations, modules and packages named `query`.
+
+        Args:
+            query: Declaration title, module name, package name or type
+                signature
+            limit: Maximum number of results to return
+
+        Returns:
+            Matching records in the Pursuit search API schema, exact-case
+            (or exact-signature) matches first
+        """
+        if is_signature_query(query):
+            if self.signatures is None:
+                return []
+            return self.signatures.search(query, limit)
+        rows = self._conn.execute(_LOOKUP, {"query": query, "limit": limit})
+        return [_from_row(row[:10]) for row in rows]
+
+    def declarations(self) -> Iterator[PursuitResult]:
+        """Iterate over every declaration record in the index."""
+        return _declarations(self._conn)
+
+    def names(self) -> Iterator[tuple[str, str, str]]:
+        """Iterate over (name, type, module) for every declaration and module.
+
+        For module records the name is the module name and module is "".
+        """
+        return self._conn.execute(
+            "SELECT title, kind, module FROM records WHERE kind = 'declaration' "
+            "UNION ALL "
+            "SELECT module, kind, '' FROM records WHERE kind = 'module'"
+        )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._closed = True
+        self._conn.close()
+
+
+def _declarations(conn: sqlite3.Connection) -> Iterator[PursuitResult]:
+    rows = conn.execute(
+        f"SELECT {_COLUMNS} FROM records WHERE kind = 'declaration' ORDER BY id"
+    )
+    return (_from_row(row) for row in rows)
+
+
+def _to_row(result: PursuitResult) -> tuple:
+    info = result["info"]
+    return (
+        info["type"],
+        result["package"],
+        result["version"],
+        info.get("module"),
+        info.get("title"),
+        info.get("typeOrValue"),
+        info.get("typeText"),
+        info.get("deprecated"),
+        result["text"],
+        result["url"],
+    )
+
+
+def _from_row(row: tuple) -> PursuitResult:
+    (
+        kind,
+        package,
+        version,
+        module,
+        title,
+        type_or_value,
+        type_text,
+        deprecated,
+        text,
+        url,
+    ) = row
+    info: PursuitResultInfo
+    if kind == "declaration":
+        info = DeclarationResult(
+            type="declaration",
+            module=module,
+            title=title,
+            typeOrValue=type_or_value,
+            typeText=type_text,
+        )
+    elif kind == "module":
+        info = ModuleResult(type="module", module=module)
+    else:
+        info = PackageResult(type="package", deprecated=bool(deprecated))
+    return {
+        "package": package,
+        "version": version,
+        "markup": "",
+        "text": text,
+        "info": info,
+        "url": url,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Build a local index from Pursuit JSON exports."""
+    parser = argparse.ArgumentParser(
+        prog="pursuit-mcp-index",
+        description="Build an offline Pursuit index from JSON exports.",
+    )
+    parser.add_argument("index", type=Path, help="SQLite index file to write")
+    parser.add_argument(
+        "exports",
+        type=Path,
+        nargs="+",
+        help="JSON files containing lists of Pursuit search results",
+    )
+    args = parser.parse_args(argv)
+
+    index = LocalIndex(args.index)
+    try:
+        for export in args.exports:
+            added = index.ingest(json.loads(export.read_bytes()))
+            print(f"{export}: {added} records")
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
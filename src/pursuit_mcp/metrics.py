@@ -0,0 +1,197 @@
+"""Latency histograms and counters for searches and upstream requests."""
+
+import time
+from collections import Counter, deque
+from collections.abc import Generator
+from contextlib import contextmanager
+from typing import Any
+
+from .types import CacheLayerStats, MetricsOutput, PhaseStats
+
+# Upper bounds, in seconds, of the Prometheus histogram buckets
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Recent observations kept per phase for percentile estimates
+WINDOW = 2048
+
+# httpcore trace steps, as "<step>.started" / "<step>.complete", and the
+# phase each one is recorded as
+_TRACED_PHASES = {
+    "connect_tcp": "connect",  # DNS resolution and TCP handshake
+    "start_tls": "tls",
+    "receive_response_headers": "server",  # Request sent until headers arrive
+    "receive_response_body": "download",
+}
+
+
+class Histogram:
+    """Latency distribution of one phase.
+
+    Keeps cumulative bucket counts for Prometheus plus a sliding window of
+    recent observations, from which percentiles are computed.
+    """
+
+    def __init__(self, window: int = WINDOW) -> None:
+        self.count = 0
+        self.sum = 0.0
+        self.buckets = [0] * len(BUCKETS)
+        self._recent: deque[float] = deque(maxlen=window)
+
+    def observe(self, seconds: float) -> None:
+        """Record one duration."""
+        self.count += 1
+        self.sum += seconds
+        self._recent.append(seconds)
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+                break
+
+    def percentile(self, fraction: float) -> float | None:
+        """Return the `fraction` quantile of recent observations, if any."""
+        if not self._recent:
+            return None
+        ordered = sorted(self._recent)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def stats(self) -> PhaseStats:
+        """Summarize the distribution."""
+        return {
+            "count": self.count,
+            "mean": self.sum / self.count if self.count else None,
+            "p50": self.percentile(0.50),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+        }
+
+
+class Metrics:
+    """Registry of phase histograms and labelled counters."""
+
+    def __init__(self) -> None:
+        self.phases: dict[str, Histogram] = {}
+        self.counters: Counter[tuple[str, tuple[tuple[str, str], ...]]] = Counter()
+
+    def observe(self, phase: str, seconds: float) -> None:
+        """Record that `phase` took `seconds`."""
+        histogram = self.phases.get(phase)
+        if histogram is None:
+            histogram = self.phases[phase] = Histogram()
+        histogram.observe(seconds)
+
+    @contextmanager
+    def time(self, phase: str) -> Generator[None]:
+        """Time the body of a `with` block as `phase`.
+
+        Blocks that raise are not recorded.
+        """
+        start = time.perf_counter()
+        yield
+        self.observe(phase, time.perf_counter() - start)
+
+    def increment(self, name: str, **labels: str) -> None:
+        """Add one to the counter `name` with the given labels."""
+        self.counters[name, tuple(sorted(labels.items()))] += 1
+
+    def count(self, name: str, **labels: str) -> int:
+        """Return the value of the counter `name` with the given labels."""
+        return self.counters[name, tuple(sorted(labels.items()))]
+
+    def trace(self, download: bool = True) -> "PhaseTrace":
+        """Create an httpx `trace` extension recording connection phases.
+
+        Args:
+            download: Record the body download; disable for responses whose
+                body may be read partially and is timed by the caller
+        """
+        return PhaseTrace(self, download)
+
+    def reset(self) -> None:
+        """Forget every observation and counter."""
+        self.phases.clear()
+        self.counters.clear()
+
+    def snapshot(self) -> MetricsOutput:
+        """Summarize phases, cache hit ratios and upstream responses."""
+        cache: dict[str, CacheLayerStats] = {}
+        upstream: dict[str, int] = {}
+        for (name, labels), value in sorted(self.counters.items()):
+            label = dict(labels)
+            if name == "cache_requests":
+                layer = cache.setdefault(
+                    label["layer"], {"hits": 0, "misses": 0, "hit_ratio": None}
+                )
+                layer["hits" if label["result"] == "hit" else "misses"] += value
+            elif name == "upstream_responses":
+                upstream[label["status"]] = value
+        for layer in cache.values():
+            total = layer["hits"] + layer["misses"]
+            layer["hit_ratio"] = layer["hits"] / total if total else None
+        return {
+            "phases": {
+                phase: histogram.stats()
+                for phase, histogram in sorted(self.phases.items())
+            },
+            "cache": cache,
+            "upstream": upstream,
+        }
+
+    def prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines = [
+            "# HELP pursuit_mcp_phase_seconds Time spent in each phase of a search",
+            "# TYPE pursuit_mcp_phase_seconds histogram",
+        ]
+        for phase, histogram in sorted(self.phases.items()):
+            cumulative = 0
+            for bound, count in zip(BUCKETS, histogram.buckets):
+                cumulative += count
+                lines.append(
+                    f'pursuit_mcp_phase_seconds_bucket{{phase="{phase}",le="{bound}"}} '
+                    f"{cumulative}"
+                )
+            lines += [
+                (
+                    f'pursuit_mcp_phase_seconds_bucket{{phase="{phase}",le="+Inf"}} '
+                    f"{histogram.count}"
+                ),
+                f'pursuit_mcp_phase_seconds_sum{{phase="{phase}"}} {histogram.sum}',
+                f'pursuit_mcp_phase_seconds_count{{phase="{phase}"}} {histogram.count}',
+            ]
+
+        names = sorted({name for name, _ in self.counters})
+        for name in names:
+            lines.append(f"# TYPE pursuit_mcp_{name}_total counter")
+            for (counter, labels), value in sorted(self.counters.items()):
+                if counter != name:
+                    continue
+                rendered = ",".join(f'{key}="{label}"' for key, label in labels)
+                lines.append(f"pursuit_mcp_{name}_total{{{rendered}}} {value}")
+        return "\n".join(lines) + "\n"
+
+
+class PhaseTrace:
+    """httpx `trace` extension timing connection, server and download phases.
+
+    Pass an instance as `extensions={"trace": ...}` on a request; each
+    completed httpcore step in `_TRACED_PHASES` is recorded in `metrics`.
+    """
+
+    def __init__(self, metrics: Metrics, download: bool = True) -> None:
+        self._metrics = metrics
+        self._download = download
+        self._started: dict[str, float] = {}
+
+    async def __call__(self, event: str, info: dict[str, Any]) -> None:
+        step, _, state = event.partition(".")[2].rpartition(".")
+        phase = _TRACED_PHASES.get(step)
+        if phase is None or (phase == "download" and not self._download):
+            return
+        if state == "started":
+            self._started[step] = time.perf_counter()
+        elif state == "complete" and step in self._started:
+            self._metrics.observe(phase, time.perf_counter() - self._started.pop(step))
+
+
+# Process-wide registry used by `search` and the server
+registry = Metrics()
@@ -0,0 +1,206 @@
+"""Retries with backoff and hedged requests for Pursuit searches."""
+
+import asyncio
+import random
+import time
+from collections.abc import Sequence
+
+import httpx
+
+from .metrics import Histogram, registry
+from .throttle import BucketLockedError, QueueFullError, parse_retry_after
+
+# Methods safe to send more than once
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD"})
+
+# Statuses worth retrying: throttling and transient server errors
+_RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+
+class RetryTransport(httpx.AsyncBaseTransport):
+    """Transport retrying idempotent requests with jittered backoff.
+
+    Transport errors and the statuses in `_RETRY_STATUSES` are retried up
+    to `retries` times. Before attempt `n` (from 0) it sleeps a random time
+    of up to `min(backoff_max, backoff * 2**n)` ("full jitter"), or the
+    server's `Retry-After` when given. A `Retry-After` longer than
+    `backoff_max` is not waited for; that response is returned as is.
+    `QueueFullError` and `BucketLockedError` are never retried, as they
+    signal local overload.
+
+    The request's timeout bounds all attempts together: later attempts
+    only get the time left, and no retry starts once it has run out.
+    Timeouts are not retried, since they have used up that time already.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        retries: int,
+        backoff: float,
+        backoff_max: float,
+        rng: random.Random | None = None,
+    ) -> None:
+        self.transport = transport
+        self.retries = retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self._rng = rng or random.Random()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method not in _IDEMPOTENT_METHODS:
+            return await self.transport.handle_async_request(request)
+
+        timeouts = request.extensions.get("timeout", {})
+        budget = max((t for t in timeouts.values() if t is not None), default=None)
+        deadline = None if budget is None else time.monotonic() + budget
+        attempt = 0
+        while True:
+            try:
+                response = await self.transport.handle_async_request(request)
+            except httpx.TransportError as e:
+                if attempt == self.retries or isinstance(
+                    e, (QueueFullError, BucketLockedError, httpx.TimeoutException)
+                ):
+                    raise
+                delay = self._delay(attempt)
+                if not self._wait_for(request, deadline, delay):
+                    raise
+                registry.increment("retries", reason=type(e).__name__)
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+
+            if response.status_code not in _RETRY_STATUSES or attempt == self.retries:
+                return response
+            retry_after = parse_retry_after(response)
+            if retry_after is not None and retry_after > self.backoff_max:
+                return response
+            delay = retry_after if retry_after is not None else self._delay(attempt)
+            if not self._wait_for(request, deadline, delay):
+                return response
+            await response.aclose()
+            registry.increment("retries", reason=str(response.status_code))
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def _wait_for(request: httpx.Request, deadline: float | None, delay: float) -> bool:
+        """Cap the request's timeouts to the time left after `delay`.
+
+        Returns:
+            False if no time would be left for another attempt
+        """
+        if deadline is None:
+            return True
+        remaining = deadline - time.monotonic() - delay
+        if remaining <= 0:
+            return False
+        timeouts = request.extensions.get("timeout", {})
+        request.extensions = {
+            **request.extensions,
+            "timeout": {
+                name: None if value is None else min(value, remaining)
+                for name, value in timeouts.items()
+            },
+        }
+        return True
+
+    def _delay(self, attempt: int) -> float:
+        return self._rng.uniform(0, min(self.backoff_max, self.backoff * 2**attempt))
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class HedgingTransport(httpx.AsyncBaseTransport):
+    """Transport sending a second copy of slow requests.
+
+    When a request has not been answered after the observed p95 response
+    latency (at least `min_delay`), an identical hedge request is sent and
+    whichever answers first wins; the other is cancelled, or closed if it
+    has already answered. Hedging starts once `min_samples` latencies have
+    been observed, and at most `max_ratio` of requests are hedged, which
+    bounds the extra upstream load.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        min_delay: float,
+        max_ratio: float,
+        min_samples: int = 20,
+    ) -> None:
+        self.transport = transport
+        self.min_delay = min_delay
+        self.max_ratio = max_ratio
+        self.min_samples = min_samples
+        self.latencies = Histogram()
+        self.requests = 0
+        self.hedged = 0
+
+    def hedge_delay(self) -> float | None:
+        """Return how long to wait before hedging, or None not to hedge."""
+        if self.latencies.count < self.min_samples:
+            return None
+        if self.hedged >= self.max_ratio * self.requests:
+            return None
+        return max(self.min_delay, self.latencies.percentile(0.95) or 0.0)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method not in _IDEMPOTENT_METHODS:
+            return await self.transport.handle_async_request(request)
+
+        self.requests += 1
+        delay = self.hedge_delay()
+        start = time.perf_counter()
+        if delay is None:
+            response = await self.transport.handle_async_request(request)
+            self.latencies.observe(time.perf_counter() - start)
+            return response
+
+        tasks = [asyncio.ensure_future(self.transport.handle_async_request(request))]
+        winner = None
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                self.hedged += 1
+                registry.increment("hedges", result="sent")
+                tasks.append(
+                    asyncio.ensure_future(self.transport.handle_async_request(request))
+                )
+            winner = await _first_success(tasks)
+        finally:
+            losers = [task for task in tasks if task is not winner]
+            for task in losers:
+                task.cancel()
+            for outcome in await asyncio.gather(*losers, return_exceptions=True):
+                if isinstance(outcome, httpx.Response):
+                    await outcome.aclose()  # Answered before it could be cancelled
+
+        if winner is not tasks[0]:
+            registry.increment("hedges", result="won")
+        self.latencies.observe(time.perf_counter() - start)
+        return winner.result()
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+async def _first_success(
+    tasks: Sequence[asyncio.Future[httpx.Response]],
+) -> asyncio.Future[httpx.Response]:
+    """Wait for the first task to return a response.
+
+    Raises:
+        Exception: The first task's error, if every task fails
+    """
+    pending = set(tasks)
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in tasks:
+            if task in done and task.exception() is None:
+                return task
+    error = tasks[0].exception()
+    assert error is not None
+    raise error  # The primary request's error
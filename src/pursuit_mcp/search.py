@@ -1,23 +1,194 @@
 """Pursuit API client for searching PureScript documentation."""
 
+import asyncio
+import json
+from collections.abc import AsyncGenerator, Awaitable
+from contextlib import aclosing
+from importlib.util import find_spec
+from pathlib import Path
+
 import httpx
 
+from . import config
+from .breaker import BreakerTransport, CircuitBreaker, CircuitOpenError
+from .cache import Entry, TTLCache, Validators
+from .compress import accept_encoding
+from .index import LocalIndex
+from .metrics import registry
+from .retry import HedgingTransport, RetryTransport
+from .singleflight import SingleFlight
+from .store import DiskCache, StoredResponse
+from .stream import iter_json_array
+from .throttle import (
+    AdaptiveLimiter,
+    SharedTokenBucket,
+    ThrottledTransport,
+    TokenBucket,
+)
 from .types import PursuitResult
 
+try:
+    from msgspec.json import decode as _decode
+except ImportError:  # Optional: install the `fast` extra
+    _decode = json.loads
 
-BASE_URL = "https://pursuit.purescript.org/search"
 DEFAULT_TIMEOUT = 10.0
 
+# Upstream fetches currently in flight, keyed by normalized query and page
+# (and result count when the response is only partially read)
+_inflight: SingleFlight[list[PursuitResult]] = SingleFlight()
+
+# Background refreshes of stale cache entries, keyed by page key
+_refreshes: dict[str, asyncio.Task[None]] = {}
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query for use as a cache key.
+
+    Leading, trailing and repeated whitespace does not change Pursuit's
+    answer, so `"(a -> b)  -> f a"` and `"(a -> b) -> f a"` share a key.
+    """
+    return " ".join(query.split())
+
+
+def create_client(
+    http2: bool = config.HTTP2,
+    max_connections: int = config.MAX_CONNECTIONS,
+    max_keepalive_connections: int = config.MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry: float = config.KEEPALIVE_EXPIRY,
+    rate_limit: float = config.RATE_LIMIT,
+    rate_burst: int = config.RATE_BURST,
+    shared_rate_limit_path: str = config.SHARED_RATE_LIMIT_PATH,
+    min_concurrency: int = config.MIN_CONCURRENCY,
+    queue_size: int = config.QUEUE_SIZE,
+    latency_target: float = config.LATENCY_TARGET,
+    retries: int = config.RETRIES,
+    retry_backoff: float = config.RETRY_BACKOFF,
+    retry_backoff_max: float = config.RETRY_BACKOFF_MAX,
+    hedge: bool = config.HEDGE,
+    hedge_min_delay: float = config.HEDGE_MIN_DELAY,
+    hedge_max_ratio: float = config.HEDGE_MAX_RATIO,
+    breaker_threshold: int = config.BREAKER_THRESHOLD,
+    breaker_reset: float = config.BREAKER_RESET,
+) -> httpx.AsyncClient:
+    """Create a long-lived, connection-pooled client for Pursuit requests.
+
+    The client keeps connections alive between calls so repeated searches
+    skip DNS, TCP and TLS setup. Requests are throttled on the client side:
+    a token bucket caps the request rate, and an adaptive limiter keeps
+    concurrency between `min_concurrency` and `max_connections`, backing
+    off on 429/503 responses or rising latency. Failed requests are retried
+    with jittered exponential backoff and, with `hedge`, requests slower than
+    the observed p95 latency are sent a second time. After repeated failures
+    a circuit breaker rejects requests with `CircuitOpenError` until a probe
+    request succeeds. Responses are requested compressed with the best
+    encoding httpx can decode here. The caller owns the client and must close
+    it with `aclose()`.
+
+    Args:
+        http2: Negotiate HTTP/2 when the optional `h2` package is installed
+        max_connections: Maximum number of concurrent connections
+        max_keepalive_connections: Maximum number of idle connections kept open
+        keepalive_expiry: Seconds an idle connection is kept open
+        rate_limit: Requests per second; 0 disables the token bucket
+        rate_burst: Requests allowed at once before `rate_limit` applies
+        shared_rate_limit_path: SQLite file holding a token bucket shared
+            with other processes, so `rate_limit` caps them together; empty
+            for a bucket of this client's own
+        min_concurrency: Lowest concurrency the adaptive limiter backs off to
+        queue_size: Requests allowed to wait for a slot; more are rejected
+            with `QueueFullError`
+        latency_target: Average latency, in seconds, below which responses
+            never count as overload
+        retries: Retries of a request failing with a transport error other
+            than a timeout, or with a 429/502/503/504 status; all attempts
+            share the request timeout
+        retry_backoff: Upper bound, in seconds, of the first retry's delay;
+            doubled for each later retry
+        retry_backoff_max: Longest delay between retries, in seconds
+        hedge: Send a second copy of requests slower than the p95 latency
+        hedge_min_delay: Shortest wait, in seconds, before hedging
+        hedge_max_ratio: Largest fraction of requests that may be hedged
+        breaker_threshold: Consecutive failed requests, after retries, that
+            open the circuit; 0 disables the circuit breaker
+        breaker_reset: Seconds the circuit stays open before a probe request
+
+    Returns:
+        A configured `httpx.AsyncClient`
+    """
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+        keepalive_expiry=keepalive_expiry,
+    )
+    transport = ThrottledTransport(
+        httpx.AsyncHTTPTransport(
+            http2=http2 and find_spec("h2") is not None, limits=limits
+        ),
+        AdaptiveLimiter(
+            min_limit=min_concurrency,
+            max_limit=max_connections,
+            queue_size=queue_size,
+            latency_target=latency_target,
+        ),
+        _token_bucket(rate_limit, rate_burst, shared_rate_limit_path),
+    )
+    if hedge:
+        transport = HedgingTransport(transport, hedge_min_delay, hedge_max_ratio)
+    if retries > 0:
+        transport = RetryTransport(transport, retries, retry_backoff, retry_backoff_max)
+    if breaker_threshold > 0:
+        transport = BreakerTransport(
+            transport, CircuitBreaker(breaker_threshold, breaker_reset)
+        )
+    return httpx.AsyncClient(
+        transport=transport,
+        headers={"Accept": "application/json", "Accept-Encoding": accept_encoding()},
+        timeout=DEFAULT_TIMEOUT,
+    )
+
+
+def _token_bucket(rate: float, burst: int, shared_path: str) -> TokenBucket | None:
+    if rate <= 0:
+        return None
+    if shared_path:
+        return SharedTokenBucket(Path(shared_path), rate, burst)
+    return TokenBucket(rate, burst)
+
 
 async def search(
-    query: str, limit: int = 10, timeout: float = DEFAULT_TIMEOUT
+    query: str,
+    limit: int = 10,
+    timeout: float = DEFAULT_TIMEOUT,
+    *,
+    client: httpx.AsyncClient | None = None,
+    cache: TTLCache | None = None,
+    store: DiskCache | None = None,
+    index: LocalIndex | None = None,
 ) -> list[PursuitResult]:
     """Search Pursuit for PureScript functions, types, and documentation.
 
+    Further result pages are fetched only while fewer than `limit` results
+    have been collected. Concurrent calls for the same normalized query
+    share one upstream request and one parse per page; cancelling one caller
+    does not affect the others. Without a cache the response is decoded
+    incrementally and reading stops after `limit` results. Expired cache
+    entries within the cache's grace period are returned at once and
+    refreshed in the background. While the client's circuit is open, the
+    last cached copy of a page is returned however old it is.
+
     Args:
         query: Search query (function name, type signature, or keyword)
         limit: Maximum number of results to return (default: 10)
         timeout: Request timeout in seconds
+        client: Shared client from `create_client`; a one-off client is
+            opened and closed for this call when omitted
+        cache: Result cache keyed by the normalized query and page; hits
+            skip the network and JSON parsing entirely
+        store: Persistent cache consulted after `cache` misses, so results
+            survive server restarts
+        index: Offline index answering name, module and package queries
+            locally; Pursuit is only contacted when it has no match
 
     Returns:
         List of search results from Pursuit (limited to `limit` results)
@@ -25,13 +196,357 @@ async def search(
     Raises:
         httpx.HTTPError: If the request fails
     """
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            BASE_URL,
-            params={"q": query},
-            headers={"Accept": "application/json"},
-            timeout=timeout,
+    if client is None:
+        async with httpx.AsyncClient() as one_off_client:
+            return await search(
+                query,
+                limit,
+                timeout,
+                client=one_off_client,
+                cache=cache,
+                store=store,
+                index=index,
+            )
+
+    results: list[PursuitResult] = []
+    if limit <= 0:
+        return results
+    if index is not None:
+        results = index.search(normalize_query(query), limit)
+        registry.increment(
+            "cache_requests", layer="index", result="hit" if results else "miss"
         )
-        response.raise_for_status()
-        results = response.json()
-        return results[:limit]
+        if results:
+            return results
+    pages = _iter_pages(
+        normalize_query(query), limit, timeout, client, cache, store, prefetch=False
+    )
+    async with aclosing(pages):
+        async for page in pages:
+            results.extend(page[: limit - len(results)])
+            if len(results) == limit:
+                break
+    return results
+
+
+async def iter_search(
+    query: str,
+    timeout: float = DEFAULT_TIMEOUT,
+    *,
+    client: httpx.AsyncClient | None = None,
+    cache: TTLCache | None = None,
+    store: DiskCache | None = None,
+    prefetch: bool = False,
+) -> AsyncGenerator[PursuitResult]:
+    """Iterate over every Pursuit result for `query`, page by page.
+
+    Pages are fetched lazily: the next page is requested only once the
+    consumer has worked through the current one, so breaking out of the
+    loop early avoids further requests.
+
+    Args:
+        query: Search query (function name, type signature, or keyword)
+        timeout: Request timeout in seconds
+        client: Shared client from `create_client`; a one-off client is
+            opened for the duration of the iteration when omitted
+        cache: Result cache, consulted per page
+        store: Persistent cache, consulted per page after `cache` misses
+        prefetch: Request the next page while the consumer processes the
+            current one
+
+    Yields:
+        Search results in Pursuit's ranking order
+
+    Raises:
+        httpx.HTTPError: If a request fails
+    """
+    if client is None:
+        async with httpx.AsyncClient() as one_off_client:
+            results = iter_search(
+                query,
+                timeout,
+                client=one_off_client,
+                cache=cache,
+                store=store,
+                prefetch=prefetch,
+            )
+            async with aclosing(results):
+                async for result in results:
+                    yield result
+        return
+
+    pages = _iter_pages(
+        normalize_query(query), None, timeout, client, cache, store, prefetch
+    )
+    async with aclosing(pages):
+        async for page in pages:
+            for result in page:
+                yield result
+
+
+async def _iter_pages(
+    key: str,
+    limit: int | None,
+    timeout: float,
+    client: httpx.AsyncClient,
+    cache: TTLCache | None,
+    store: DiskCache | None,
+    prefetch: bool,
+) -> AsyncGenerator[list[PursuitResult]]:
+    """Yield result pages until a short page, or `limit` results, is reached."""
+    page = 1
+    fetched = 0
+    pending: asyncio.Future[list[PursuitResult]] | None = None
+
+    def get_page(number: int) -> Awaitable[list[PursuitResult]]:
+        remaining = None if limit is None else limit - fetched
+        return _get_page(key, number, remaining, timeout, client, cache, store)
+
+    try:
+        while True:
+            if pending is None:
+                results = await get_page(page)
+            else:
+                results, pending = await pending, None
+            if not results:
+                return
+            fetched += len(results)
+            last = len(results) < config.PAGE_SIZE
+            if prefetch and not last:
+                pending = asyncio.ensure_future(get_page(page + 1))
+            yield results
+            if last or (limit is not None and fetched >= limit):
+                return
+            page += 1
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+
+async def _get_page(
+    key: str,
+    page: int,
+    stop_after: int | None,
+    timeout: float,
+    client: httpx.AsyncClient,
+    cache: TTLCache | None,
+    store: DiskCache | None,
+) -> list[PursuitResult]:
+    """Return one page of results from the caches or from Pursuit."""
+    page_key = key if page == 1 else f"{key}\npage={page}"
+    if cache is not None:
+        cached, stale = cache.lookup(page_key)
+        _count_lookup("memory", cached is not None)
+        if cached is not None:
+            if stale:
+                _revalidate(key, page, page_key, timeout, client, cache, store)
+            return cached
+
+    if store is not None:
+        stored = store.get(page_key)
+        _count_lookup("disk", stored is not None)
+        if stored is not None:
+            with registry.time("parse"):
+                results = _decode(stored.body)
+            if cache is not None:
+                cache.set(page_key, results, len(stored.body), stored.validators)
+            return results
+
+    if cache is None and store is None:
+        return await _inflight.do(
+            (page_key, stop_after),
+            lambda: _fetch_partial(key, page, stop_after, timeout, client),
+        )
+
+    return await _inflight.do(
+        page_key, lambda: _fetch(key, page, page_key, timeout, client, cache, store)
+    )
+
+
+def _revalidate(
+    key: str,
+    page: int,
+    page_key: str,
+    timeout: float,
+    client: httpx.AsyncClient,
+    cache: TTLCache,
+    store: DiskCache | None,
+) -> None:
+    """Refresh a stale cache entry in the background, once per key."""
+    if page_key in _refreshes:
+        return
+
+    def fetch(client: httpx.AsyncClient) -> Awaitable[list[PursuitResult]]:
+        return _inflight.do(
+            page_key,
+            lambda: _fetch(key, page, page_key, timeout, client, cache, store),
+        )
+
+    async def refresh() -> None:
+        try:
+            if client.is_closed:  # One-off client of the call that found it
+                async with httpx.AsyncClient() as one_off_client:
+                    await fetch(one_off_client)
+            else:
+                await fetch(client)
+        except Exception:
+            registry.increment("refreshes", result="failed")
+        else:
+            registry.increment("refreshes", result="ok")
+
+    task = asyncio.ensure_future(refresh())
+    _refreshes[page_key] = task
+    task.add_done_callback(lambda done: _refreshes.pop(page_key, None))
+
+
+def _count_lookup(layer: str, hit: bool) -> None:
+    registry.increment("cache_requests", layer=layer, result="hit" if hit else "miss")
+
+
+def _params(query: str, page: int) -> dict[str, str | int]:
+    """Build the query string for one page of results."""
+    return {"q": query} if page == 1 else {"q": query, "page": page}
+
+
+async def _fetch_partial(
+    query: str,
+    page: int,
+    stop_after: int | None,
+    timeout: float,
+    client: httpx.AsyncClient,
+) -> list[PursuitResult]:
+    """Stream a page and stop reading once `stop_after` results are decoded."""
+    results: list[PursuitResult] = []
+    try:
+        with registry.time("upstream"):
+            async with client.stream(
+                "GET",
+                config.BASE_URL,
+                params=_params(query, page),
+                headers={"Accept": "application/json"},
+                timeout=timeout,
+                extensions={"trace": registry.trace(download=False)},
+            ) as response:
+                _count_response(response)
+                response.raise_for_status()
+                with registry.time("download"):
+                    async for result in iter_json_array(response.aiter_bytes()):
+                        results.append(result)
+                        if len(results) == stop_after:
+                            break
+    except httpx.RequestError as e:
+        registry.increment("upstream_responses", status=type(e).__name__)
+        raise
+    return results
+
+
+async def _fetch(
+    query: str,
+    page: int,
+    page_key: str,
+    timeout: float,
+    client: httpx.AsyncClient,
+    cache: TTLCache | None,
+    store: DiskCache | None,
+) -> list[PursuitResult]:
+    """Fetch and parse a full page, then populate the caches.
+
+    A copy cached with validators, even an expired one, is revalidated
+    with a conditional request; a 304 answer reuses it without downloading
+    the page again. While the circuit is open, any cached copy is returned
+    instead. Empty pages are only kept in memory, for the cache's shorter
+    negative TTL. Disk cache writes are best-effort: a failed one is only
+    counted in metrics.
+    """
+    cached = cache.peek(page_key) if cache is not None else None
+    stored = None
+    if (cached is None or cached.validators is None) and store is not None:
+        stored = store.get(page_key, stale=True)
+    validators = (cached.validators if cached is not None else None) or (
+        stored.validators if stored is not None else None
+    )
+
+    headers = {"Accept": "application/json"}
+    if validators is not None:
+        headers.update(validators.conditional_headers())
+    try:
+        with registry.time("upstream"):
+            response = await client.get(
+                config.BASE_URL,
+                params=_params(query, page),
+                headers=headers,
+                timeout=timeout,
+                extensions={"trace": registry.trace()},
+            )
+    except httpx.RequestError as e:
+        registry.increment("upstream_responses", status=type(e).__name__)
+        if isinstance(e, CircuitOpenError):
+            fallback = _last_copy(page_key, cached, stored, store)
+            if fallback is not None:
+                return fallback
+        raise
+    _count_response(response)
+
+    if validators is not None:
+        modified = response.status_code != httpx.codes.NOT_MODIFIED
+        registry.increment(
+            "revalidations", result="modified" if modified else "not_modified"
+        )
+        if not modified:
+            return await _reuse(page_key, cached, stored, validators, cache, store)
+    response.raise_for_status()
+    with registry.time("parse"):
+        results = _decode(response.content)
+    validators = Validators.from_headers(response.headers)
+    if cache is not None:
+        cache.set(page_key, results, len(response.content), validators)
+    if store is not None and results:
+        await store.aset(page_key, response.content, validators)
+    return results
+
+
+def _last_copy(
+    page_key: str,
+    cached: Entry | None,
+    stored: StoredResponse | None,
+    store: DiskCache | None,
+) -> list[PursuitResult] | None:
+    """Return the last cached copy of a page, however old, if any."""
+    if cached is None and stored is None and store is not None:
+        stored = store.get(page_key, stale=True)
+    if cached is not None:
+        results = cached.results
+    elif stored is not None:
+        with registry.time("parse"):
+            results = _decode(stored.body)
+    else:
+        return None
+    registry.increment("circuit", result="served_stale")
+    return results
+
+
+async def _reuse(
+    page_key: str,
+    cached: Entry | None,
+    stored: StoredResponse | None,
+    validators: Validators,
+    cache: TTLCache | None,
+    store: DiskCache | None,
+) -> list[PursuitResult]:
+    """Renew the cached copy of a page Pursuit reported as not modified."""
+    if cached is not None and cached.validators == validators:
+        results, size = cached.results, cached.size
+    else:
+        assert stored is not None
+        with registry.time("parse"):
+            results = _decode(stored.body)
+        size = len(stored.body)
+    if cache is not None:
+        cache.set(page_key, results, size, validators)
+    if store is not None:
+        await store.atouch(page_key)
+    return results
+
+
+def _count_response(response: httpx.Response) -> None:
+    registry.increment("upstream_responses", status=str(response.status_code))
@@ -1,26 +1,342 @@
-from fastmcp import FastMCP
+from fastmcp import Context, FastMCP
+from fastmcp.dependencies import CurrentContext
+from fastmcp.server.lifespan import lifespan
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, Response
 
-mcp = FastMCP("Pursuit Search")
+from .types import FormattedField
+
+
+@lifespan
+async def http_client_lifespan(server: FastMCP):
+    """Own one pooled HTTP client for the lifetime of the server.
+
+    httpx and the search stack are imported in a worker thread after the
+    server is ready, so the client is yielded as a task for the tools to
+    await; by the first tool call it has usually finished.
+    """
+    import asyncio
+    import importlib
+
+    async def open_client():
+        search = await asyncio.to_thread(
+            importlib.import_module, ".search", __package__
+        )
+        return search.create_client()
+
+    client = asyncio.ensure_future(open_client())
+    try:
+        yield {"client": client}
+    finally:
+        client.cancel()
+        (outcome,) = await asyncio.gather(client, return_exceptions=True)
+        if not isinstance(outcome, BaseException):
+            await outcome.aclose()
+
+
+@lifespan
+async def cache_lifespan(server: FastMCP):
+    """Keep one result cache for the lifetime of the server."""
+    from . import config
+    from .cache import TTLCache
+
+    yield {
+        "cache": TTLCache(
+            ttl=config.CACHE_TTL,
+            max_entries=config.CACHE_MAX_ENTRIES,
+            max_bytes=config.CACHE_MAX_BYTES,
+            grace=config.CACHE_STALE_TTL,
+            negative_ttl=config.NEGATIVE_CACHE_TTL,
+        )
+    }
+
+
+@lifespan
+async def store_lifespan(server: FastMCP):
+    """Open the persistent cache when enabled with PURSUIT_MCP_DISK_CACHE."""
+    from . import config
+
+    if not config.DISK_CACHE:
+        yield {"store": None}
+        return
+
+    from pathlib import Path
+
+    from .store import DiskCache, default_cache_dir
+
+    path = Path(config.DISK_CACHE_PATH or default_cache_dir() / "cache.sqlite3")
+    store = DiskCache(
+        path, ttl=config.DISK_CACHE_TTL, max_bytes=config.DISK_CACHE_MAX_BYTES
+    )
+    try:
+        yield {"store": store}
+    finally:
+        store.close()
+
+
+@lifespan
+async def index_lifespan(server: FastMCP):
+    """Open the offline index when PURSUIT_MCP_LOCAL_INDEX is set.
+
+    Identifier completion is seeded from the index and grows with the
+    search results seen afterwards, up to PURSUIT_MCP_COMPLETION_MAX_SEEN
+    names. The signature index is built in a
+    worker thread; signature queries go to Pursuit until it is ready.
+    """
+    from . import config
+    from .complete import CompletionIndex
+
+    completions = CompletionIndex(max_seen=config.COMPLETION_MAX_SEEN)
+    if not config.LOCAL_INDEX_PATH:
+        yield {"index": None, "completions": completions}
+        return
+
+    import asyncio
+    from pathlib import Path
+
+    from .index import LocalIndex
+
+    index = LocalIndex(Path(config.LOCAL_INDEX_PATH))
+    for name, type, module in index.names():
+        completions.add(name, type, module)
+    build = asyncio.ensure_future(asyncio.to_thread(index.build_signatures))
+    try:
+        yield {"index": index, "completions": completions}
+    finally:
+        index.close()  # Stops a build still running
+        await asyncio.gather(build, return_exceptions=True)
+
+
+@lifespan
+async def warm_lifespan(server: FastMCP):
+    """Open the other resources, then warm the caches in the background.
+
+    Queries come from PURSUIT_MCP_WARM_QUERIES and the most frequent ones in
+    PURSUIT_MCP_ACCESS_LOG, which every search is appended to. The server is
+    ready at once; warming runs alongside requests until it finishes or its
+    time budget runs out. The warming modules are only imported when one
+    of those is set.
+    """
+    import asyncio
+    from pathlib import Path
+
+    from . import config
+
+    resources = http_client_lifespan | cache_lifespan | store_lifespan | index_lifespan
+    async with resources(server) as state:
+        if not (config.WARM_QUERIES_PATH or config.ACCESS_LOG_PATH):
+            yield {**state, "access_log": None}
+            return
+
+        from .warm import AccessLog, read_queries, warm
+
+        queries = []
+        if config.WARM_QUERIES_PATH:
+            queries += read_queries(Path(config.WARM_QUERIES_PATH))
+        access_log = None
+        if config.ACCESS_LOG_PATH:
+            access_log = AccessLog(Path(config.ACCESS_LOG_PATH))
+            queries += access_log.top(config.WARM_TOP_N)
+
+        async def warm_in_background() -> None:
+            await warm(
+                queries,
+                config.WARM_CONCURRENCY,
+                config.WARM_BUDGET,
+                **await _search_resources(state),
+            )
+
+        warming = asyncio.ensure_future(warm_in_background()) if queries else None
+        try:
+            yield {**state, "access_log": access_log}
+        finally:
+            if warming is not None:
+                warming.cancel()
+                await asyncio.gather(warming, return_exceptions=True)
+            if access_log is not None:
+                access_log.close()
+
+
+mcp = FastMCP("Pursuit Search", lifespan=warm_lifespan)
 
 
 @mcp.tool
-async def search_pursuit(query: str, limit: int = 10) -> str:
+async def search_pursuit(
+    query: str,
+    limit: int = 10,
+    fields: list[FormattedField] | None = None,
+    max_bytes: int | None = None,
+    compact: bool = False,
+    ctx: Context = CurrentContext(),
+) -> str:
     """Search Pursuit for PureScript functions, types, and documentation.
 
     Args:
         query: Search query (function name, type signature, or keyword)
         limit: Maximum number of results to return (default: 10)
+        fields: Fields to include in each result (default: all), e.g.
+            ["title", "module", "typeText"]
+        max_bytes: Maximum size of the response; documentation is truncated,
+            then dropped, then trailing results are dropped to fit
+        compact: Return a header row of field names plus one row of values
+            per result, with URLs shortened to what the other fields do not
+            imply (default: false)
 
     Returns:
         Formatted search results from Pursuit as JSON string
     """
+    from .format import format_json
+    from .metrics import registry
+    from .search import search
+
+    with registry.time("tool"):
+        _record(ctx, query)
+        results = await search(
+            query, limit=limit, **await _search_resources(ctx.lifespan_context)
+        )
+        ctx.lifespan_context["completions"].add_results(results)
+        with registry.time("format"):
+            return format_json(results, fields, max_bytes, compact).decode()
+
+
+@mcp.tool
+async def search_pursuit_batch(
+    queries: list[str], limit: int = 10, ctx: Context = CurrentContext()
+) -> str:
+    """Run several Pursuit searches concurrently in one call.
+
+    Args:
+        queries: Search queries (function names, type signatures, or keywords)
+        limit: Maximum number of results to return per query (default: 10)
+
+    Returns:
+        JSON string mapping each query to its formatted results or an error
+    """
+    import asyncio
     import json
 
+    import httpx
+
+    from . import config
     from .format import format
     from .search import search
+    from .types import BatchError, BatchOutput, FormatOutput
+
+    resources = await _search_resources(ctx.lifespan_context)
+    for query in queries:
+        _record(ctx, query)
+    completions = ctx.lifespan_context["completions"]
+    semaphore = asyncio.Semaphore(config.BATCH_CONCURRENCY)
+
+    async def run(query: str) -> FormatOutput | BatchError:
+        async with semaphore:
+            try:
+                results = await search(query, limit=limit, **resources)
+            except (httpx.HTTPError, ValueError) as e:
+                return {"error": f"{type(e).__name__}: {e}"}
+        completions.add_results(results)
+        return format(results)
+
+    unique_queries = list(dict.fromkeys(queries))
+    outputs = await asyncio.gather(*(run(query) for query in unique_queries))
+    batch: BatchOutput = {"results": dict(zip(unique_queries, outputs))}
+    return json.dumps(batch, ensure_ascii=False)
+
+
+@mcp.tool
+async def complete_identifier(
+    prefix: str, limit: int = 10, ctx: Context = CurrentContext()
+) -> str:
+    """Complete a partial PureScript identifier or module name.
+
+    Matches come from the offline index and from earlier search results,
+    without contacting Pursuit. Names starting with the prefix come first,
+    followed by close misspellings.
+
+    Args:
+        prefix: Beginning of a declaration or module name (e.g. "traverse")
+        limit: Maximum number of completions to return (default: 10)
+
+    Returns:
+        Completions as JSON string
+    """
+    import json
+
+    from . import config
+    from .types import CompletionOutput
+
+    max_distance = min(config.COMPLETION_MAX_DISTANCE, len(prefix) // 3)
+    completions = ctx.lifespan_context["completions"].complete(
+        prefix, limit=limit, max_distance=max_distance
+    )
+    output: CompletionOutput = {
+        "completions": completions,
+        "count": len(completions),
+    }
+    return json.dumps(output, ensure_ascii=False)
+
+
+@mcp.resource("pursuit://metrics", mime_type="application/json")
+def search_metrics() -> str:
+    """Search latency percentiles, cache hit ratios and upstream responses.
+
+    Counted since the server started. Phases: connect (DNS and TCP),
+    tls, server (time to response headers), download, upstream (whole
+    request), parse, format and tool (whole search_pursuit call).
+    """
+    import json
+
+    from .metrics import registry
+
+    return json.dumps(registry.snapshot())
+
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def prometheus_metrics(request: Request) -> Response:
+    """Serve metrics in Prometheus format when PURSUIT_MCP_PROMETHEUS is set.
+
+    Only reachable when the server runs with an HTTP transport.
+    """
+    from . import config
+    from .metrics import registry
+
+    if not config.PROMETHEUS:
+        return PlainTextResponse("Not Found", status_code=404)
+    return PlainTextResponse(
+        registry.prometheus(), media_type="text/plain; version=0.0.4"
+    )
+
+
+def http_app():
+    """Build the streamable HTTP application run by each server worker.
+
+    With several workers (`pursuit-mcp --workers`), consecutive requests of
+    one MCP session may reach different processes, so sessions are
+    stateless: every request is served on its own.
+    """
+    from . import config
+
+    return mcp.http_app(stateless_http=config.WORKERS > 1)
+
+
+async def _search_resources(state: dict) -> dict:
+    """Collect the lifespan-owned client, caches and index for `search`."""
+    import asyncio
+
+    return {
+        # Shielded: a cancelled tool call must not cancel opening the client
+        "client": await asyncio.shield(state["client"]),
+        "cache": state["cache"],
+        "store": state["store"],
+        "index": state["index"],
+    }
+
 
-    results = await search(query, limit=limit)
-    return json.dumps(format(results), ensure_ascii=False)
+def _record(ctx: Context, query: str) -> None:
+    """Log `query` for warming the caches of later sessions."""
+    access_log = ctx.lifespan_context["access_log"]
+    if access_log is not None:
+        access_log.record(query)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,326 @@
+"""Type-signature search over declarations with normalized signatures."""
+
+import heapq
+import re
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from .types import PursuitResult
+
+# A parsed type is a nested tuple:
+#   ("var", name)               type variable
+#   ("con", name)               type constructor (module qualifier dropped)
+#   ("app", function, argument) type application
+#   ("fun", argument, result)   function arrow
+#   ("row", brace, ((label, type), ...), tail)  record `{...}` or row `(...)`
+Type = tuple
+
+# Fingerprints shared by more declarations than this carry little signal and
+# are skipped when gathering similarity candidates
+_MAX_POSTINGS = 2000
+
+# Candidates scored per requested result when ranking by similarity
+_SHORTLIST_FACTOR = 10
+
+_TOKEN = re.compile(r"\s*(->|=>|::|[(){}\[\],|.]|[^\s(){}\[\],|.]+)")
+
+
+class SignatureSyntaxError(ValueError):
+    """Raised when a type signature cannot be parsed."""
+
+
+@dataclass(frozen=True)
+class Signature:
+    """A signature normalized for comparison.
+
+    `forall` is stripped, type variables are renamed `t0`, `t1`, ... in order
+    of first appearance in the body, module qualifiers are dropped and
+    constraints are sorted, so alpha-equivalent signatures compare equal.
+    """
+
+    body: str
+    constraints: tuple[str, ...]
+    fingerprints: frozenset[str]
+    arity: int
+
+    def __str__(self) -> str:
+        return " => ".join((*self.constraints, self.body))
+
+
+def is_signature_query(query: str) -> bool:
+    """Return True if `query` looks like a type signature rather than a name."""
+    return "->" in query or "=>" in query or query.startswith("forall ")
+
+
+def normalize(signature: str) -> Signature:
+    """Parse and normalize a PureScript type signature.
+
+    Args:
+        signature: Signature text, e.g. "forall f a b. Functor f => f a -> f b"
+
+    Returns:
+        The normalized signature
+
+    Raises:
+        SignatureSyntaxError: If the signature cannot be parsed
+    """
+    constraints, body = _Parser(signature).parse()
+    names: dict[str, str] = {}
+    fingerprints: set[str] = set()
+    rendered_body = _render(body, names, fingerprints)
+    rendered_constraints = tuple(sorted(_render(c, names) for c in constraints))
+    return Signature(
+        body=rendered_body,
+        constraints=rendered_constraints,
+        fingerprints=frozenset(fingerprints),
+        arity=_arity(body),
+    )
+
+
+class SignatureIndex:
+    """Index of declarations answering signature queries without a scan.
+
+    Exact matches are found by hashing the normalized body. Approximate
+    matches are gathered from an inverted index of structural fingerprints
+    (the normalized text of every constructor and compound subterm) and
+    ranked by their Jaccard similarity to the query, penalized by the
+    difference in the number of function arguments.
+    """
+
+    def __init__(self) -> None:
+        self._results: list[PursuitResult] = []
+        self._signatures: list[Signature] = []
+        self._by_body: dict[str, list[int]] = defaultdict(list)
+        self._by_fingerprint: dict[str, list[int]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    @classmethod
+    def from_results(cls, results: Iterable[PursuitResult]) -> "SignatureIndex":
+        """Build an index from declaration records."""
+        index = cls()
+        for result in results:
+            index.add(result)
+        return index
+
+    def add(self, result: PursuitResult) -> bool:
+        """Index a declaration by its `typeText`.
+
+        Returns:
+            False if the record has no parseable signature and was skipped
+        """
+        info = result["info"]
+        if info["type"] != "declaration":
+            return False
+        type_text = info.get("typeText")
+        if not type_text:
+            return False
+        try:
+            signature = normalize(type_text)
+        except SignatureSyntaxError:
+            return False
+
+        position = len(self._results)
+        self._results.append(result)
+        self._signatures.append(signature)
+        self._by_body[signature.body].append(position)
+        for fingerprint in signature.fingerprints:
+            self._by_fingerprint[fingerprint].append(position)
+        return True
+
+    def search(self, query: str, limit: int = 10) -> list[PursuitResult]:
+        """Find declarations whose signatures match `query`.
+
+        Exact matches (equal normalized bodies) come first, those that also
+        share the query's constraints ahead of the rest. Remaining slots are
+        filled with structurally similar signatures.
+
+        Args:
+            query: Type signature, with or without `forall` and constraints
+            limit: Maximum number of results to return
+
+        Returns:
+            Matching declaration records, best match first
+        """
+        try:
+            wanted = normalize(query)
+        except SignatureSyntaxError:
+            return []
+
+        exact = self._by_body.get(wanted.body, [])
+        ranked = sorted(
+            exact, key=lambda i: self._signatures[i].constraints != wanted.constraints
+        )
+        if len(ranked) < limit:
+            ranked.extend(
+                self._similar(wanted, limit - len(ranked), exclude=set(exact))
+            )
+        return [self._results[i] for i in ranked[:limit]]
+
+    def _similar(self, wanted: Signature, limit: int, exclude: set[int]) -> list[int]:
+        """Rank non-exact candidates sharing fingerprints with `wanted`.
+
+        Only the candidates sharing the most fingerprints are scored in full.
+        """
+        overlap: Counter[int] = Counter()
+        for fingerprint in wanted.fingerprints:
+            postings = self._by_fingerprint.get(fingerprint, ())
+            if len(postings) <= _MAX_POSTINGS:
+                overlap.update(postings)
+
+        def score(position: int) -> tuple[float, int]:
+            candidate = self._signatures[position]
+            shared = overlap[position]
+            union = len(wanted.fingerprints) + len(candidate.fingerprints) - shared
+            similarity = shared / union / (1 + abs(candidate.arity - wanted.arity))
+            return (-similarity, position)
+
+        shortlist = overlap.most_common(limit * _SHORTLIST_FACTOR + len(exclude))
+        candidates = (i for i, _ in shortlist if i not in exclude)
+        return heapq.nsmallest(limit, candidates, key=score)
+
+
+class _Parser:
+    """Recursive-descent parser for the PureScript type syntax Pursuit shows."""
+
+    def __init__(self, text: str) -> None:
+        self.tokens = _TOKEN.findall(text)
+        self.pos = 0
+
+    def parse(self) -> tuple[list[Type], Type]:
+        constraints: list[Type] = []
+        body = self._type(constraints)
+        if self.pos != len(self.tokens):
+            raise SignatureSyntaxError(f"Unexpected {self.tokens[self.pos]!r}")
+        return constraints, body
+
+    def _peek(self) -> str | None:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _take(self, expected: str | None = None) -> str:
+        token = self._peek()
+        if token is None or (expected is not None and token != expected):
+            raise SignatureSyntaxError(f"Expected {expected or 'a type'}")
+        self.pos += 1
+        return token
+
+    def _type(self, constraints: list[Type]) -> Type:
+        if self._peek() == "forall":
+            self._take()
+            while self._peek() not in (".", None):
+                self._take()
+            self._take(".")
+        result = self._function()
+        while self._peek() == "=>":
+            self._take()
+            constraints.append(result)
+            if self._peek() == "forall":
+                return self._type(constraints)
+            result = self._function()
+        return result
+
+    def _function(self) -> Type:
+        argument = self._application()
+        if self._peek() == "->":
+            self._take()
+            return ("fun", argument, self._type([]))
+        return argument
+
+    def _application(self) -> Type:
+        result = self._atom()
+        while self._peek() not in (None, "->", "=>", ")", "}", "]", ",", "|", "::"):
+            result = ("app", result, self._atom())
+        return result
+
+    def _atom(self) -> Type:
+        token = self._take()
+        if token in ("(", "{"):
+            close = ")" if token == "(" else "}"
+            if token == "{" or self._is_row():
+                return self._row(token, close)
+            inner = self._type([])
+            self._take(close)
+            return inner
+        if token == "[":
+            self._take("]")
+            return ("con", "[]")
+        if token in ("->", "=>", "::", ")", "}", "]", ",", "|", "."):
+            raise SignatureSyntaxError(f"Unexpected {token!r}")
+        if token[0].isupper() and self._peek() == ".":
+            # Qualified name such as `Data.Maybe.Maybe`; keep the last part.
+            while self._peek() == ".":
+                self._take()
+                token = self._take()
+        if token[0].islower() or token[0] == "_":
+            return ("var", token)
+        return ("con", token)
+
+    def _is_row(self) -> bool:
+        """Return True if the tokens after `(` form a row like `( a :: Int )`."""
+        following = self.tokens[self.pos : self.pos + 2]
+        return (
+            following[:1] == [")"] or following[1:] == ["::"] or following[:1] == ["|"]
+        )
+
+    def _row(self, brace: str, close: str) -> Type:
+        fields: list[tuple[str, Type]] = []
+        tail: Type | None = None
+        while self._peek() not in (close, "|", None):
+            label = self._take()
+            self._take("::")
+            fields.append((label, self._type([])))
+            if self._peek() == ",":
+                self._take()
+        if self._peek() == "|":
+            self._take()
+            tail = self._type([])
+        self._take(close)
+        return ("row", brace, tuple(sorted(fields)), tail)
+
+
+def _render(
+    node: Type,
+    names: dict[str, str],
+    fingerprints: set[str] | None = None,
+    nested: bool = False,
+) -> str:
+    """Render `node` canonically, renaming variables through `names`.
+
+    When `fingerprints` is given, the text of every constructor and compound
+    subterm rendered along the way is added to it.
+    """
+    kind = node[0]
+    if kind == "var":
+        return names.setdefault(node[1], f"t{len(names)}")
+    if kind == "con":
+        text = node[1]
+    elif kind == "app":
+        function = _render(node[1], names, fingerprints)
+        argument = _render(node[2], names, fingerprints, nested=True)
+        text = f"{function} {argument}"
+    elif kind == "fun":
+        argument = _render(node[1], names, fingerprints, nested=node[1][0] == "fun")
+        text = f"{argument} -> {_render(node[2], names, fingerprints)}"
+    else:
+        _, brace, fields, tail = node
+        close = "}" if brace == "{" else ")"
+        parts = [f"{label} :: {_render(t, names, fingerprints)}" for label, t in fields]
+        text = ", ".join(parts)
+        if tail is not None:
+            text = f"{text} | {_render(tail, names, fingerprints)}".lstrip()
+        text = f"{brace} {text} {close}" if text else f"{brace}{close}"
+        nested = False
+    if fingerprints is not None:
+        fingerprints.add(text)
+    return f"({text})" if nested and kind != "con" else text
+
+
+def _arity(node: Type) -> int:
+    """Count the arguments of a (curried) function type."""
+    count = 0
+    while node[0] == "fun":
+        count += 1
+        node = node[2]
+    return count
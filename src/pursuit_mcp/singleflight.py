@@ -0,0 +1,47 @@
+"""Coalescing of concurrent identical requests."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+
+
+class SingleFlight[T]:
+    """Share one in-flight call among all concurrent callers with the same key.
+
+    The first caller for a key starts the call as a task; callers arriving
+    while it runs await the same task. Every waiter receives the same result
+    or exception. Waiters are shielded from each other: cancelling one
+    waiter does not cancel the shared call for the others.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, asyncio.Task[T]] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run `fn()` unless a call for `key` is already in flight.
+
+        Args:
+            key: Identity of the call; equal keys share one execution
+            fn: Zero-argument coroutine function performing the call
+
+        Returns:
+            The result of the shared call
+
+        Raises:
+            Exception: Whatever the shared call raised
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task[T]) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the exception as retrieved in case every waiter was cancelled.
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,379 @@
+"""Persistent on-disk cache of raw Pursuit responses."""
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections.abc import Callable
+from pathlib import Path
+from typing import NamedTuple
+
+from . import compress
+from .cache import Validators
+from .metrics import registry
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    encoding TEXT NOT NULL DEFAULT 'identity',
+    dictionary INTEGER
+);
+CREATE TABLE IF NOT EXISTS dictionaries (
+    id INTEGER PRIMARY KEY,
+    data BLOB NOT NULL
+);
+"""
+
+# Columns added after the first release, created on older databases
+_ADDED_COLUMNS = {
+    "etag": "TEXT",
+    "last_modified": "TEXT",
+    "encoding": "TEXT NOT NULL DEFAULT 'identity'",
+    "dictionary": "INTEGER",
+}
+
+# Recent responses a zstd dictionary is trained on
+_TRAINING_SAMPLES = 500
+
+
+class StoredResponse(NamedTuple):
+    """A raw Pursuit JSON response and the wall-clock time it was fetched."""
+
+    body: bytes
+    fetched_at: float
+    validators: Validators | None = None
+
+
+def default_cache_dir() -> Path:
+    """Return the XDG cache directory for pursuit-mcp.
+
+    Uses `$XDG_CACHE_HOME/pursuit-mcp`, falling back to `~/.cache/pursuit-mcp`.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "pursuit-mcp"
+
+
+class DiskCache:
+    """SQLite-backed response cache shared by every server process.
+
+    The database runs in WAL mode, so several `pursuit-mcp` processes can
+    read concurrently while one writes. Entries older than `ttl` are ignored
+    and removed on compaction, which also drops the oldest entries until
+    the stored payload fits in `max_bytes`.
+
+    Responses are stored compressed with zstd, or zlib when zstd is not
+    installed. Once `train_after` responses are stored, compaction trains a
+    zstd dictionary on them, which later writes use; entries record the
+    encoding and dictionary they were written with.
+
+    Writes may wait up to five seconds for other processes to release the
+    database, so on an event loop use `aset` and `atouch`, which write from
+    a worker thread and only count failures in metrics. Compaction rewrites
+    the database, so when `set` triggers it on an event loop it also runs in
+    a worker thread.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        ttl: float,
+        max_bytes: int,
+        compact_every: int = 100,
+        compression: bool = True,
+        train_after: int = 100,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Open (and create if needed) the cache database.
+
+        Args:
+            path: SQLite database file
+            ttl: Seconds a stored response stays valid
+            max_bytes: Maximum total size of stored responses in bytes
+            compact_every: Run compaction after this many writes
+            compression: Compress stored responses
+            train_after: Stored responses needed to train a zstd dictionary
+            clock: Wall-clock time source, overridable for tests
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.compact_every = compact_every
+        self.compression = compression
+        self.train_after = train_after
+        self._clock = clock
+        self._writes = 0
+        self._codecs: dict[int | None, compress.Codec] = {}
+        self._compaction: asyncio.Future[None] | None = None
+        # Connection and codecs of writes from worker threads, one at a time
+        self._writer: sqlite3.Connection | None = None
+        self._writer_codecs: dict[int | None, compress.Codec] = {}
+        self._writer_lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5.0, isolation_level=None)
+        self._conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(responses)")}
+        for column, type in _ADDED_COLUMNS.items():
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE responses ADD COLUMN {column} {type}")
+        self._dictionary: int | None = None
+        if compress.zstandard is not None:
+            (self._dictionary,) = self._conn.execute(
+                "SELECT MAX(id) FROM dictionaries"
+            ).fetchone()
+
+    def get(self, key: str, stale: bool = False) -> StoredResponse | None:
+        """Return the stored response for `key` if it has not expired.
+
+        Args:
+            key: Normalized query
+            stale: Also return an expired response not yet compacted away,
+                e.g. to revalidate it
+        """
+        oldest = float("-inf") if stale else self._clock() - self.ttl
+        row = self._conn.execute(
+            "SELECT body, fetched_at, etag, last_modified, encoding, dictionary "
+            "FROM responses WHERE key = ? AND fetched_at > ?",
+            (key, oldest),
+        ).fetchone()
+        if row is None:
+            return None
+        data, fetched_at, etag, last_modified, encoding, dictionary = row
+        body = self._decompress(data, encoding, dictionary)
+        if body is None:
+            return None
+        validators = Validators(etag, last_modified)
+        return StoredResponse(
+            body, fetched_at, validators if validators != (None, None) else None
+        )
+
+    def set(self, key: str, body: bytes, validators: Validators | None = None) -> None:
+        """Store the raw response `body` under `key`, with its validators."""
+        self._set(self._conn, self._codecs, key, body, validators)
+
+    async def aset(
+        self, key: str, body: bytes, validators: Validators | None = None
+    ) -> None:
+        """Like `set`, but from a worker thread; failures are only counted."""
+        await self._write(
+            "set", lambda conn, codecs: self._set(conn, codecs, key, body, validators)
+        )
+
+    def touch(self, key: str) -> None:
+        """Mark the response under `key` as fetched now, e.g. after a 304."""
+        self._touch(self._conn, key)
+
+    async def atouch(self, key: str) -> None:
+        """Like `touch`, but from a worker thread; failures are only counted."""
+        await self._write("touch", lambda conn, codecs: self._touch(conn, key))
+
+    def size(self) -> int:
+        """Return the total size of stored responses in bytes."""
+        return self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+
+    async def _write(
+        self,
+        operation: str,
+        write: Callable[[sqlite3.Connection, dict[int | None, compress.Codec]], None],
+    ) -> None:
+        """Run `write(conn, codecs)` in a worker thread on the writer connection."""
+
+        def run() -> None:
+            with self._writer_lock:
+                if self._writer is None:
+                    self._writer = sqlite3.connect(
+                        self.path,
+                        timeout=5.0,
+                        isolation_level=None,
+                        check_same_thread=False,
+                    )
+                    self._writer.execute("PRAGMA synchronous=NORMAL")
+                write(self._writer, self._writer_codecs)
+
+        try:
+            await asyncio.to_thread(run)
+        except sqlite3.Error:
+            registry.increment("store_writes", operation=operation, result="failed")
+        else:
+            registry.increment("store_writes", operation=operation, result="ok")
+
+    def _set(
+        self,
+        conn: sqlite3.Connection,
+        codecs: dict[int | None, compress.Codec],
+        key: str,
+        body: bytes,
+        validators: Validators | None,
+    ) -> None:
+        data, encoding, dictionary = body, "identity", None
+        if self.compression:
+            codec = self._codec(self._dictionary, codecs, conn)
+            data, encoding = codec.compress(body), codec.encoding
+            if encoding == "zstd":
+                dictionary = self._dictionary
+        if len(data) > self.max_bytes:
+            return
+        etag, last_modified = validators or (None, None)
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (key, body, size, fetched_at, "
+            "etag, last_modified, encoding, dictionary) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                key,
+                data,
+                len(data),
+                self._clock(),
+                etag,
+                last_modified,
+                encoding,
+                dictionary,
+            ),
+        )
+        self._writes += 1
+        if self._writes % self.compact_every == 0:
+            self._schedule_compaction()
+
+    def _touch(self, conn: sqlite3.Connection, key: str) -> None:
+        conn.execute(
+            "UPDATE responses SET fetched_at = ? WHERE key = ?", (self._clock(), key)
+        )
+
+    def compact(self) -> None:
+        """Drop expired entries, then the oldest ones until under `max_bytes`.
+
+        Freed pages are returned to the filesystem and the WAL is truncated.
+        Uses a connection of its own, so it may run in a worker thread.
+        """
+        conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+        try:
+            self._compact(conn)
+        finally:
+            conn.close()
+
+    def _schedule_compaction(self) -> None:
+        """Compact in a worker thread when on an event loop, else at once."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            self.compact()
+            return
+        if self._compaction is None or self._compaction.done():
+            self._compaction = asyncio.ensure_future(asyncio.to_thread(self.compact))
+            self._compaction.add_done_callback(_count_compaction)
+
+    def _compact(self, conn: sqlite3.Connection) -> None:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "DELETE FROM responses WHERE fetched_at <= ?",
+                (self._clock() - self.ttl,),
+            )
+            (size,) = conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            excess = size - self.max_bytes
+            if excess > 0:
+                conn.execute(
+                    """
+                    DELETE FROM responses WHERE key IN (
+                        SELECT key FROM (
+                            SELECT key, size,
+                                SUM(size) OVER (ORDER BY fetched_at, key) AS freed
+                            FROM responses
+                        ) WHERE freed - size < ?
+                    )
+                    """,
+                    (excess,),
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("PRAGMA incremental_vacuum")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        if self.compression and self._dictionary is None:
+            self._train(conn)
+
+    def _train(self, conn: sqlite3.Connection) -> None:
+        """Train a zstd dictionary once enough responses are stored."""
+        if compress.zstandard is None:
+            return
+        rows = conn.execute(
+            "SELECT body, encoding, dictionary FROM responses "
+            "ORDER BY fetched_at DESC LIMIT ?",
+            (_TRAINING_SAMPLES,),
+        ).fetchall()
+        if len(rows) < self.train_after:
+            return
+        codecs: dict[int | None, compress.Codec] = {}  # Not shared across threads
+        samples = [self._decompress(*row, codecs, conn) for row in rows]
+        dictionary = compress.train([sample for sample in samples if sample])
+        if dictionary is not None:
+            self._dictionary = conn.execute(
+                "INSERT INTO dictionaries (data) VALUES (?)", (dictionary,)
+            ).lastrowid
+
+    def _codec(
+        self,
+        dictionary: int | None,
+        codecs: dict[int | None, compress.Codec] | None = None,
+        conn: sqlite3.Connection | None = None,
+    ) -> compress.Codec:
+        """Return the codec using the stored dictionary `dictionary`, if any.
+
+        Codecs are cached in `codecs` and dictionaries read through `conn`,
+        by default the store's own; codecs must not be shared by threads.
+        """
+        codecs = self._codecs if codecs is None else codecs
+        codec = codecs.get(dictionary)
+        if codec is None:
+            data = None
+            if dictionary is not None:
+                conn = conn or self._conn
+                (data,) = conn.execute(
+                    "SELECT data FROM dictionaries WHERE id = ?", (dictionary,)
+                ).fetchone()
+            codec = codecs[dictionary] = compress.Codec(data)
+        return codec
+
+    def _decompress(
+        self,
+        data: bytes,
+        encoding: str,
+        dictionary: int | None,
+        codecs: dict[int | None, compress.Codec] | None = None,
+        conn: sqlite3.Connection | None = None,
+    ) -> bytes | None:
+        """Restore a stored body; None if its encoding is not available here."""
+        if encoding == "identity":
+            return data
+        with registry.time("decompress"):
+            if encoding == "zlib":
+                return zlib.decompress(data)
+            if encoding == "zstd" and compress.zstandard is not None:
+                return self._codec(dictionary, codecs, conn).decompress(data)
+        return None  # Written by a process with zstd installed
+
+    def close(self) -> None:
+        """Close the database connections, after any write in progress."""
+        with self._writer_lock:
+            if self._writer is not None:
+                self._writer.close()
+        self._conn.close()
+
+
+def _count_compaction(compaction: asyncio.Future[None]) -> None:
+    if not compaction.cancelled():
+        failed = compaction.exception() is not None
+        registry.increment("compactions", result="failed" if failed else "ok")
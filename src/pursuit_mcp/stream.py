@@ -0,0 +1,93 @@
+"""Incremental decoding of streamed JSON arrays."""
+
+import codecs
+import json
+from collections.abc import AsyncIterable, AsyncIterator
+from typing import Any
+
+_WHITESPACE = " \t\n\r"
+
+
+async def iter_json_array(chunks: AsyncIterable[bytes]) -> AsyncIterator[Any]:
+    """Decode a UTF-8 JSON array from byte chunks, yielding one item at a time.
+
+    Items are decoded as soon as they are complete, so a consumer that stops
+    iterating early never decodes (or waits for) the rest of the array.
+
+    Args:
+        chunks: Byte chunks of a JSON document whose top level is an array
+
+    Yields:
+        Each decoded array element, in order
+
+    Raises:
+        json.JSONDecodeError: If the document is not a well-formed JSON array
+    """
+    parser = _ArrayParser()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    async for chunk in chunks:
+        for item in parser.feed(utf8.decode(chunk)):
+            yield item
+    for item in parser.feed(utf8.decode(b"", final=True), final=True):
+        yield item
+    if not parser.done:
+        raise json.JSONDecodeError("Unterminated array", parser.buffer, 0)
+
+
+class _ArrayParser:
+    """Push parser splitting a top-level JSON array into its elements."""
+
+    def __init__(self) -> None:
+        self.buffer = ""
+        self.started = False
+        self.done = False
+        self._after_item = False  # Expecting ',' or ']'
+        self._after_comma = False  # Expecting another element
+        self._decoder = json.JSONDecoder()
+
+    def feed(self, text: str, final: bool = False) -> list[Any]:
+        """Append `text` and return every element completed by it."""
+        self.buffer += text
+        buffer = self.buffer
+        items: list[Any] = []
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos == len(buffer):
+                break
+            char = buffer[pos]
+            if self.done:
+                raise json.JSONDecodeError("Extra data", buffer, pos)
+            if not self.started:
+                if char != "[":
+                    raise json.JSONDecodeError("Expected '['", buffer, pos)
+                self.started = True
+                pos += 1
+            elif char == "]":
+                if self._after_comma:
+                    raise json.JSONDecodeError("Expected value", buffer, pos)
+                self.done = True
+                pos += 1
+            elif char == ",":
+                if not self._after_item:
+                    raise json.JSONDecodeError("Expected value", buffer, pos)
+                self._after_item, self._after_comma = False, True
+                pos += 1
+            elif self._after_item:
+                raise json.JSONDecodeError("Expected ',' or ']'", buffer, pos)
+            else:
+                try:
+                    item, end = self._decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if final:
+                        raise
+                    break  # Incomplete element; wait for more text.
+                if end == len(buffer) and not final:
+                    # A number such as `12` may continue in the next chunk.
+                    break
+                items.append(item)
+                self._after_item, self._after_comma = True, False
+                pos = end
+        self.buffer = buffer[pos:]
+        return items
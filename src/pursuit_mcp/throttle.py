@@ -0,0 +1,378 @@
+"""Client-side rate limiting and adaptive concurrency for Pursuit requests."""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Generator
+from contextlib import contextmanager
+from pathlib import Path
+
+import httpx
+
+from .metrics import registry
+
+# Upstream statuses that mean "slow down"
+_OVERLOAD_STATUSES = frozenset({429, 503})
+
+
+class QueueFullError(httpx.TransportError):
+    """Raised when a request would exceed the bounded wait queue."""
+
+
+class BucketLockedError(httpx.TransportError):
+    """Raised when the shared token bucket stays locked by other processes."""
+
+
+class TokenBucket:
+    """Token bucket admitting `rate` requests per second with bursts.
+
+    The bucket starts full with `burst` tokens. `acquire` waits for a token
+    rather than failing, so callers are smoothed out instead of rejected.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create a full bucket.
+
+        Args:
+            rate: Tokens added per second
+            burst: Maximum number of tokens held
+            clock: Monotonic clock, replaceable in tests
+        """
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._paused_until = 0.0
+
+    def delay(self) -> float:
+        """Take a token, returning how long to wait before using it."""
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+        return max(0.0, -self._tokens / self.rate, self._paused_until - now)
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        wait = self.delay()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every token for `seconds`, e.g. after a `Retry-After`."""
+        self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+    async def apause(self, seconds: float) -> None:
+        """Like `pause`, for callers on the event loop."""
+        self.pause(seconds)
+
+    def close(self) -> None:
+        """Release resources held by the bucket."""
+
+
+_BUCKET_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bucket (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    tokens REAL NOT NULL,
+    updated REAL NOT NULL,
+    paused_until REAL NOT NULL
+)
+"""
+
+
+class SharedTokenBucket(TokenBucket):
+    """Token bucket whose state lives in SQLite, shared by several processes.
+
+    Every server worker opening the same `path` draws from one bucket, so
+    `rate` caps the combined request rate of all workers. Each `delay` or
+    `pause` is one short write transaction; timestamps are wall-clock time,
+    which unlike monotonic time is comparable between processes.
+
+    Workers contend for the database lock, so `acquire` and `apause` run
+    their transaction in a worker thread rather than on the event loop.
+    `acquire` raises `BucketLockedError` if the lock is not obtained within
+    `lock_timeout`; a `pause` that cannot be shared is skipped.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        rate: float,
+        burst: int,
+        lock_timeout: float = 5.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Open (and create if needed) the shared bucket.
+
+        Args:
+            path: SQLite database file holding the bucket
+            rate: Tokens added per second
+            burst: Maximum number of tokens held
+            lock_timeout: Seconds to wait for other processes to release
+                the bucket
+            clock: Wall-clock time source, overridable for tests
+        """
+        super().__init__(rate, burst, clock)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()  # One transaction at a time per process
+        self._conn = sqlite3.connect(
+            path, timeout=lock_timeout, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_BUCKET_SCHEMA)
+        self._conn.execute(
+            "INSERT OR IGNORE INTO bucket VALUES (0, ?, ?, 0)", (burst, clock())
+        )
+
+    def delay(self) -> float:
+        with self._transaction():
+            return super().delay()
+
+    async def acquire(self) -> None:
+        try:
+            wait = await asyncio.to_thread(self.delay)
+        except sqlite3.OperationalError as e:
+            registry.increment("throttle", result="bucket_locked")
+            raise BucketLockedError(f"Shared rate limit unavailable: {e}") from e
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        with self._transaction():
+            super().pause(seconds)
+
+    async def apause(self, seconds: float) -> None:
+        try:
+            await asyncio.to_thread(self.pause, seconds)
+        except sqlite3.OperationalError:
+            registry.increment("throttle", result="bucket_locked")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Generator[None]:
+        """Load the shared state, run the body, then store the state."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._tokens, self._updated, self._paused_until = self._conn.execute(
+                    "SELECT tokens, updated, paused_until FROM bucket"
+                ).fetchone()
+                yield
+                self._conn.execute(
+                    "UPDATE bucket SET tokens = ?, updated = ?, paused_until = ?",
+                    (self._tokens, self._updated, self._paused_until),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+
+# Weights of a new latency in the recent and long-term moving averages
+_RECENT_WEIGHT = 0.2
+_BASELINE_WEIGHT = 0.02
+
+# Recent latency above this multiple of the long-term average is overload
+_LATENCY_TOLERANCE = 2.0
+
+
+class AdaptiveLimiter:
+    """Concurrency limit adjusted by additive increase, multiplicative decrease.
+
+    Each response that does not signal overload raises the limit by
+    `1 / limit`, about one slot per round of requests. An overload status
+    (429, 503) or rising latency halves it, at most once per round: signals
+    from requests sent before the last decrease reflect the old limit and
+    are ignored. Latency is rising when its recent moving average exceeds
+    both `latency_target` and twice the long-term average, so upstream
+    queries that are merely slow do not shrink the limit. Requests beyond
+    the limit wait in a FIFO queue of at most `queue_size`; further requests
+    are rejected at once with `QueueFullError`.
+    """
+
+    def __init__(
+        self,
+        min_limit: int,
+        max_limit: int,
+        queue_size: int,
+        latency_target: float,
+        initial_limit: int | None = None,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        """Create a limiter.
+
+        Args:
+            min_limit: Lowest concurrency the limit may shrink to
+            max_limit: Highest concurrency the limit may grow to
+            queue_size: Maximum number of requests waiting for a slot
+            latency_target: Recent average latency, in seconds, below which
+                responses never count as overload
+            initial_limit: Starting limit; `max_limit` when omitted
+            clock: Monotonic time source, overridable for tests
+        """
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.queue_size = queue_size
+        self.latency_target = latency_target
+        self.limit = float(initial_limit if initial_limit is not None else max_limit)
+        self.in_flight = 0
+        self.recent_latency: float | None = None
+        self.baseline_latency: float | None = None
+        self._clock = clock
+        self._decreased_at = float("-inf")
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    async def acquire(self) -> None:
+        """Wait for a free slot.
+
+        Raises:
+            QueueFullError: If `queue_size` requests are already waiting
+        """
+        if not self._waiters and self.in_flight < int(self.limit):
+            self.in_flight += 1
+            return
+        if len(self._waiters) >= self.queue_size:
+            registry.increment("throttle", result="rejected")
+            raise QueueFullError("Too many Pursuit requests waiting")
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()  # Handed a slot just as we were cancelled
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self) -> None:
+        """Free a slot and hand it to the longest-waiting request."""
+        self.in_flight -= 1
+        self._wake()
+
+    def record(self, started: float, latency: float, overloaded: bool) -> None:
+        """Adjust the limit after a response.
+
+        Args:
+            started: When the request was sent, on the limiter's clock
+            latency: Seconds until the response headers arrived
+            overloaded: The upstream signalled overload, e.g. with a 429
+        """
+        if self.recent_latency is None or self.baseline_latency is None:
+            self.recent_latency = self.baseline_latency = latency
+        else:
+            self.recent_latency += _RECENT_WEIGHT * (latency - self.recent_latency)
+            self.baseline_latency += _BASELINE_WEIGHT * (
+                latency - self.baseline_latency
+            )
+        slow = (
+            self.recent_latency > self.latency_target
+            and self.recent_latency > _LATENCY_TOLERANCE * self.baseline_latency
+        )
+        if overloaded or slow:
+            if started >= self._decreased_at:
+                self._decreased_at = self._clock()
+                self.limit = max(self.min_limit, self.limit / 2)
+        else:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._wake()
+
+    def _wake(self) -> None:
+        """Start queued requests while slots are free under the limit."""
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+
+class ThrottledTransport(httpx.AsyncBaseTransport):
+    """Transport passing requests through a limiter and a token bucket.
+
+    Requests wait for an `AdaptiveLimiter` slot, then for a `TokenBucket`
+    token if one is configured, before reaching the wrapped transport. A
+    request holds its slot until its response body is closed; a `Retry-After`
+    on an overload response pauses the bucket.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        limiter: AdaptiveLimiter,
+        bucket: TokenBucket | None = None,
+    ) -> None:
+        self.transport = transport
+        self.limiter = limiter
+        self.bucket = bucket
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        queued = time.perf_counter()
+        await self.limiter.acquire()
+        try:
+            if self.bucket is not None:
+                await self.bucket.acquire()
+            start = time.perf_counter()
+            registry.observe("queue", start - queued)
+            response = await self.transport.handle_async_request(request)
+        except BaseException:
+            self.limiter.release()
+            raise
+
+        latency = time.perf_counter() - start
+        overloaded = response.status_code in _OVERLOAD_STATUSES
+        self.limiter.record(start, latency, overloaded)
+        if overloaded and self.bucket is not None:
+            retry_after = parse_retry_after(response)
+            if retry_after is not None:
+                await self.bucket.apause(retry_after)
+        if response.is_closed:
+            self.limiter.release()  # Body already read, e.g. by a mock transport
+        else:
+            response.stream = _ReleasingStream(response.stream, self.limiter)
+        return response
+
+    async def aclose(self) -> None:
+        if self.bucket is not None:
+            self.bucket.close()
+        await self.transport.aclose()
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response body that frees its limiter slot when closed."""
+
+    def __init__(self, stream, limiter: AdaptiveLimiter) -> None:
+        self._stream = stream
+        self._limiter = limiter
+        self._released = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._released:
+                self._released = True
+                self._limiter.release()
+
+
+def parse_retry_after(response: httpx.Response) -> float | None:
+    """Parse a `Retry-After` header given in seconds."""
+    try:
+        return max(0.0, float(response.headers["Retry-After"]))
+    except (KeyError, ValueError):
+        return None
@@ -66,8 +66,85 @@ class FormattedResult(TypedDict, total=False):
     deprecated: bool  # Deprecation status (for package types)
 
 
+# Names of the fields a FormattedResult may carry, in output order
+FormattedField = Literal[
+    "package",
+    "version",
+    "docs",
+    "type",
+    "module",
+    "title",
+    "typeText",
+    "deprecated",
+    "url",
+]
+
+
 class FormatOutput(TypedDict):
     """Output format for formatted search results."""
 
     results: list[FormattedResult]
     count: int
+
+
+class CompactOutput(TypedDict):
+    """Columnar output format for formatted search results."""
+
+    columns: list[str]  # FormattedResult fields, in row order
+    rows: list[list]  # One row of values per result; [] for a missing field
+    count: int
+    urlBase: str  # Prefix of the shortened URLs in the "url" column
+
+
+class BatchError(TypedDict):
+    """A query in a batch search that failed."""
+
+    error: str  # Exception type and message
+
+
+class BatchOutput(TypedDict):
+    """Output format for batch search results."""
+
+    results: dict[str, FormatOutput | BatchError]  # Keyed by query
+
+
+class CompletionResult(TypedDict, total=False):
+    """A completion of a declaration or module name."""
+
+    name: str  # Declaration title or module name
+    type: str  # Result type (declaration, module)
+    module: str  # Defining module (for declaration types)
+    distance: int  # Edit distance between the prefix and the match
+
+
+class CompletionOutput(TypedDict):
+    """Output format for identifier completions."""
+
+    completions: list[CompletionResult]
+    count: int
+
+
+class PhaseStats(TypedDict):
+    """Latency summary of one phase, in seconds; None before any sample."""
+
+    count: int
+    mean: float | None
+    p50: float | None
+    p95: float | None
+    p99: float | None
+
+
+class CacheLayerStats(TypedDict):
+    """Lookups answered and missed by one cache layer."""
+
+    hits: int
+    misses: int
+    hit_ratio: float | None
+
+
+class MetricsOutput(TypedDict):
+    """Output format for search metrics."""
+
+    phases: dict[str, PhaseStats]  # Keyed by phase, e.g. "server", "format"
+    cache: dict[str, CacheLayerStats]  # Keyed by layer: memory, disk, index
+    upstream: dict[str, int]  # Response counts by HTTP status or error type
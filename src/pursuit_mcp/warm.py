@@ -0,0 +1,112 @@
+"""Startup cache warming from popular queries."""
+
+import asyncio
+from collections import Counter
+from collections.abc import Iterable
+from pathlib import Path
+
+import httpx
+
+from .cache import TTLCache
+from .index import LocalIndex
+from .metrics import registry
+from .search import normalize_query, search
+from .store import DiskCache
+
+
+class AccessLog:
+    """Append-only log of searched queries, one normalized query per line.
+
+    Every server process appends to the same file; single-line appends are
+    atomic, so concurrent writers do not interleave. The log is trimmed to
+    its newest `max_lines` entries whenever `top` reads it.
+    """
+
+    def __init__(self, path: Path, max_lines: int = 10_000) -> None:
+        """Open (and create if needed) the log for appending.
+
+        Args:
+            path: Log file
+            max_lines: Entries kept when the log is trimmed
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.max_lines = max_lines
+        self._file = path.open("a", encoding="utf-8", buffering=1)
+
+    def record(self, query: str) -> None:
+        """Append `query` to the log."""
+        query = normalize_query(query)
+        if query:
+            self._file.write(query + "\n")
+
+    def top(self, n: int) -> list[str]:
+        """Return the `n` most frequently logged queries, most frequent first."""
+        lines = self.path.read_text(encoding="utf-8").splitlines()
+        if len(lines) > self.max_lines:
+            lines = lines[-self.max_lines :]
+            self.path.write_text("".join(line + "\n" for line in lines), "utf-8")
+        return [query for query, _ in Counter(lines).most_common(n)]
+
+    def close(self) -> None:
+        """Close the log file."""
+        self._file.close()
+
+
+def read_queries(path: Path) -> list[str]:
+    """Read one query per line, skipping blank lines and `#` comments."""
+    lines = path.read_text(encoding="utf-8").splitlines()
+    return [line for line in lines if line.strip() and not line.startswith("#")]
+
+
+async def warm(
+    queries: Iterable[str],
+    concurrency: int,
+    budget: float,
+    *,
+    client: httpx.AsyncClient,
+    cache: TTLCache | None = None,
+    store: DiskCache | None = None,
+    index: LocalIndex | None = None,
+) -> int:
+    """Search each query once so its first page lands in the caches.
+
+    Failed searches are skipped. Searches still running when `budget`
+    elapses are cancelled.
+
+    Args:
+        queries: Queries to prefetch; duplicates after normalization are
+            searched once
+        concurrency: Maximum number of searches running at once
+        budget: Seconds allowed for the whole warm-up
+        client: Shared client from `create_client`
+        cache: Result cache to fill
+        store: Persistent cache to fill
+        index: Offline index; queries it answers need no prefetch
+
+    Returns:
+        Number of queries successfully prefetched
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    warmed = 0
+
+    async def run(query: str) -> None:
+        nonlocal warmed
+        async with semaphore:
+            try:
+                await search(
+                    query, client=client, cache=cache, store=store, index=index
+                )
+            except (httpx.HTTPError, ValueError):
+                registry.increment("warmup", result="failed")
+                return
+        warmed += 1
+        registry.increment("warmup", result="ok")
+
+    unique_queries = dict.fromkeys(filter(None, map(normalize_query, queries)))
+    try:
+        async with asyncio.timeout(budget):
+            await asyncio.gather(*(run(query) for query in unique_queries))
+    except TimeoutError:
+        registry.increment("warmup", result="timeout")
+    return warmed
@@ -0,0 +1,19 @@
+"""Shared fixtures for the unit tests."""
+
+import pytest
+
+
+class FakeClock:
+    """Manually advanced time source."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """Return a fake clock starting at 0, advanced by setting `now`."""
+    return FakeClock()
@@ -0,0 +1,93 @@
+"""Tests for breaker module."""
+
+import httpx
+import pytest
+
+from pursuit_mcp.breaker import (
+    BreakerTransport,
+    CircuitBreaker,
+    CircuitOpenError,
+    State,
+)
+
+
+def test_breaker_opens_after_consecutive_failures(clock):
+    """Test the circuit opens only after `failure_threshold` failures in a row."""
+    breaker = CircuitBreaker(3, 30, clock=clock)
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.failure()
+    breaker.success()
+    for _ in range(2):
+        breaker.failure()
+    assert breaker.state is State.CLOSED
+
+    breaker.failure()
+    assert breaker.state is State.OPEN
+    assert not breaker.allow()
+
+
+def test_breaker_half_open_probe(clock):
+    """Test one probe is let through after the reset timeout."""
+    breaker = CircuitBreaker(1, 30, clock=clock)
+    breaker.failure()
+
+    clock.now = 29.9
+    assert not breaker.allow()
+    clock.now = 30.0
+    assert breaker.allow()
+    assert breaker.state is State.HALF_OPEN
+    assert not breaker.allow()  # Only one probe at a time
+
+    breaker.failure()
+    assert breaker.state is State.OPEN
+    clock.now = 59.9
+    assert not breaker.allow()
+    clock.now = 60.0
+    assert breaker.allow()
+    breaker.success()
+    assert breaker.state is State.CLOSED
+    assert breaker.allow()
+
+
+def test_breaker_cancelled_probe_frees_the_slot(clock):
+    """Test a probe ending without an outcome lets the next one through."""
+    breaker = CircuitBreaker(1, 30, clock=clock)
+    breaker.failure()
+    clock.now = 30.0
+
+    assert breaker.allow()
+    breaker.cancel()
+    assert breaker.state is State.HALF_OPEN
+    assert breaker.allow()
+
+
+@pytest.mark.asyncio
+async def test_breaker_transport_fails_fast_while_open(clock):
+    """Test 5xx responses and transport errors open the circuit."""
+    outcomes = [httpx.Response(503), httpx.ConnectError("refused")]
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        outcome = outcomes[len(calls)]
+        calls.append(request)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    transport = BreakerTransport(
+        httpx.MockTransport(handler), CircuitBreaker(2, 30, clock=clock)
+    )
+    async with httpx.AsyncClient(transport=transport) as client:
+        assert (await client.get("http://pursuit/search")).status_code == 503
+        with pytest.raises(httpx.ConnectError):
+            await client.get("http://pursuit/search")
+        with pytest.raises(CircuitOpenError):
+            await client.get("http://pursuit/search")
+
+        outcomes.append(httpx.Response(404))
+        clock.now = 30.0
+        assert (await client.get("http://pursuit/search")).status_code == 404
+
+    assert len(calls) == 3
+    assert transport.breaker.state is State.CLOSED
@@ -0,0 +1,118 @@
+"""Unit tests for cache module."""
+
+from pursuit_mcp.cache import TTLCache
+from pursuit_mcp.types import PursuitResult
+
+result: PursuitResult = {
+    "package": "purescript-prelude",
+    "version": "6.0.2",
+    "markup": "<p>The PureScript Prelude</p>\n",
+    "text": "The PureScript Prelude\n",
+    "info": {"type": "package", "deprecated": False},
+    "url": "https://pursuit.purescript.org/packages/purescript-prelude",
+}
+
+
+def test_cache_hit_and_miss_counters():
+    """Test hits and misses are counted."""
+    cache = TTLCache(ttl=60, max_entries=10, max_bytes=1000)
+
+    assert cache.get("prelude") is None
+    cache.set("prelude", [result], 100)
+    assert cache.get("prelude") == [result]
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["entries"] == 1
+    assert stats["bytes"] == 100
+
+
+def test_cache_entry_expires_after_ttl(clock):
+    """Test entries are dropped once their TTL has elapsed."""
+    cache = TTLCache(ttl=60, max_entries=10, max_bytes=1000, clock=clock)
+    cache.set("prelude", [result], 100)
+
+    clock.now = 59.9
+    assert cache.get("prelude") == [result]
+    clock.now = 60.0
+    assert cache.get("prelude") is None
+    assert len(cache) == 0
+    assert cache.stats()["bytes"] == 0
+
+
+def test_cache_serves_stale_entry_within_grace(clock):
+    """Test expired entries are returned as stale until the grace ends."""
+    cache = TTLCache(ttl=60, max_entries=10, max_bytes=1000, grace=30, clock=clock)
+    cache.set("prelude", [result], 100)
+
+    assert cache.lookup("prelude") == ([result], False)
+    clock.now = 60.0
+    assert cache.lookup("prelude") == ([result], True)
+    assert cache.get("prelude") is None
+    clock.now = 90.0
+    assert cache.lookup("prelude") == (None, False)
+    assert len(cache) == 0
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["stale_hits"], stats["misses"]) == (1, 1, 2)
+
+
+def test_cache_expires_empty_results_after_negative_ttl(clock):
+    """Test empty result lists are kept for the shorter negative TTL."""
+    cache = TTLCache(
+        ttl=60, max_entries=10, max_bytes=1000, negative_ttl=5, clock=clock
+    )
+    cache.set("prelude", [result], 100)
+    cache.set("no such thing", [], 2)
+
+    clock.now = 4.9
+    assert cache.get("no such thing") == []
+    clock.now = 5.0
+    assert cache.get("no such thing") is None
+    assert cache.get("prelude") == [result]
+
+
+def test_cache_evicts_least_recently_used_by_count():
+    """Test the least recently used entry is evicted past max_entries."""
+    cache = TTLCache(ttl=60, max_entries=2, max_bytes=1000)
+    cache.set("a", [result], 10)
+    cache.set("b", [result], 10)
+    cache.get("a")
+    cache.set("c", [result], 10)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == [result]
+    assert cache.get("c") == [result]
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_evicts_by_byte_size():
+    """Test entries are evicted until the payload fits in max_bytes."""
+    cache = TTLCache(ttl=60, max_entries=10, max_bytes=100)
+    cache.set("a", [result], 40)
+    cache.set("b", [result], 40)
+    cache.set("c", [result], 40)
+
+    assert cache.get("a") is None
+    assert cache.stats()["bytes"] == 80
+
+
+def test_cache_skips_entries_larger_than_budget():
+    """Test a single oversized entry is not stored."""
+    cache = TTLCache(ttl=60, max_entries=10, max_bytes=100)
+    cache.set("a", [result], 40)
+    cache.set("huge", [result], 101)
+
+    assert cache.get("huge") is None
+    assert cache.get("a") == [result]
+
+
+def test_cache_set_replaces_existing_entry():
+    """Test storing an existing key replaces it without double counting."""
+    cache = TTLCache(ttl=60, max_entries=10, max_bytes=1000)
+    cache.set("a", [result], 40)
+    cache.set("a", [], 10)
+
+    assert cache.get("a") == []
+    assert cache.stats()["bytes"] == 10
@@ -0,0 +1,129 @@
+"""Unit tests for complete module."""
+
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from pursuit_mcp.complete import CompletionIndex
+from pursuit_mcp.types import PursuitResult
+
+FIXTURE = Path(__file__).parent / "fixtures" / "pursuit_export.json"
+
+
+@pytest.fixture
+def completions() -> CompletionIndex:
+    index = CompletionIndex()
+    index.add_results(json.loads(FIXTURE.read_bytes()))
+    return index
+
+
+def names(completions) -> list[str]:
+    return [c["name"] for c in completions]
+
+
+def test_complete_prefix_shortest_first(completions):
+    """Test prefix matches are returned shortest first."""
+    assert names(completions.complete("traverse")) == [
+        "traverse",
+        "traverse_",
+        "traverseWithIndex",
+    ]
+
+
+def test_complete_is_case_insensitive(completions):
+    """Test prefixes match regardless of case."""
+    assert names(completions.complete("data.arr")) == ["Data.Array", "Data.Array.ST"]
+
+
+def test_complete_includes_declaration_module(completions):
+    """Test declaration completions carry their module and distance."""
+    assert completions.complete("fromMay") == [
+        {
+            "name": "fromMaybe",
+            "type": "declaration",
+            "module": "Data.Maybe",
+            "distance": 0,
+        }
+    ]
+
+
+def test_complete_fuzzy_after_exact(completions):
+    """Test misspelled prefixes match within the edit distance bound."""
+    results = completions.complete("travesre", max_distance=2)
+
+    assert names(results) == ["traverse", "traverse_", "traverseWithIndex"]
+    assert all(c["distance"] == 2 for c in results)
+    assert completions.complete("travesre", max_distance=1) == []
+
+
+def test_complete_exact_prefix_ranks_before_fuzzy():
+    """Test exact prefix matches come before fuzzy ones."""
+    index = CompletionIndex()
+    index.add("map", "declaration", "Data.Functor")
+    index.add("mapWithIndex", "declaration", "Data.FunctorWithIndex")
+
+    results = index.complete("mapW", max_distance=1)
+
+    assert [(c["name"], c["distance"]) for c in results] == [
+        ("mapWithIndex", 0),
+        ("map", 1),
+    ]
+
+
+def test_complete_respects_limit(completions):
+    """Test the number of completions is capped by limit."""
+    assert len(completions.complete("", limit=5)) == 5
+    assert completions.complete("", limit=0) == []
+
+
+def declaration(title: str) -> PursuitResult:
+    return {
+        "package": "purescript-m",
+        "version": "1.0.0",
+        "markup": "",
+        "text": "",
+        "info": {
+            "type": "declaration",
+            "module": "M",
+            "title": title,
+            "typeOrValue": "ValueLevel",
+            "typeText": None,
+        },
+        "url": f"https://pursuit.purescript.org/M#v:{title}",
+    }
+
+
+def test_complete_caps_names_from_results():
+    """Test the least recently seen result names are dropped, added ones kept."""
+    index = CompletionIndex(max_seen=2)
+    index.add("mapMaybe", "declaration", "Data.Array")
+    index.add_results([declaration("map"), declaration("mapFlipped")])
+    index.add_results([declaration("map"), declaration("mapWithIndex")])
+
+    assert len(index) == 3
+    assert names(index.complete("map", max_distance=0)) == [
+        "map",
+        "mapMaybe",
+        "mapWithIndex",
+    ]
+    assert index.complete("mapF", max_distance=0) == []
+
+
+def test_complete_deduplicates_entries():
+    """Test adding the same name twice yields one completion."""
+    index = CompletionIndex()
+    index.add("map", "declaration", "Data.Functor")
+    index.add("map", "declaration", "Data.Functor")
+
+    assert len(index) == 1
+    assert len(index.complete("ma")) == 1
+
+
+def test_complete_is_fast(completions):
+    """Test completion answers in well under a millisecond."""
+    start = time.perf_counter()
+    for _ in range(100):
+        completions.complete("traverse", max_distance=2)
+    assert (time.perf_counter() - start) / 100 < 0.001
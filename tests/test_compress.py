@@ -0,0 +1,58 @@
+"""Tests for compress module."""
+
+import gzip
+import json
+
+import httpx
+import pytest
+
+from pursuit_mcp.compress import Codec, accept_encoding
+from pursuit_mcp.search import create_client, search
+
+
+def test_accept_encoding_prefers_installed_decoders(monkeypatch):
+    """Test zstd and brotli are offered only when they can be decoded."""
+    installed = {"zstandard"}
+    monkeypatch.setattr(
+        "pursuit_mcp.compress.find_spec",
+        lambda name: object() if name in installed else None,
+    )
+    assert accept_encoding() == "zstd, gzip;q=0.8, deflate;q=0.5"
+
+    installed = {"brotli"}
+    assert accept_encoding() == "br;q=0.9, gzip;q=0.8, deflate;q=0.5"
+
+
+@pytest.mark.parametrize("zstd", [True, False])
+def test_codec_round_trip(monkeypatch, zstd):
+    """Test a codec restores what it compressed, falling back to zlib."""
+    if zstd:
+        pytest.importorskip("zstandard")
+    else:
+        monkeypatch.setattr("pursuit_mcp.compress.zstandard", None)
+    codec = Codec()
+    data = b'{"package": "purescript-prelude"}' * 100
+
+    assert codec.encoding == ("zstd" if zstd else "zlib")
+    assert len(codec.compress(data)) < len(data)
+    assert codec.decompress(codec.compress(data)) == data
+
+
+@pytest.mark.asyncio
+async def test_search_decodes_compressed_response():
+    """Test the client asks for compression and search decodes the answer."""
+    results = [{"package": "purescript-prelude", "info": {"type": "package"}}]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200,
+            content=gzip.compress(json.dumps(results).encode()),
+            headers={"Content-Encoding": "gzip"},
+        )
+
+    pooled = create_client()
+    await pooled.aclose()
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        assert await search("prelude", client=client) == results
+
+    assert pooled.headers["Accept-Encoding"] == accept_encoding()
@@ -0,0 +1,117 @@
+"""Tests for the stand-in Pursuit server."""
+
+import random
+import time
+
+import httpx
+import pytest
+
+from pursuit_mcp.fake import FakePursuit, parse_latency, running, synthetic_results
+from pursuit_mcp.search import search
+
+
+def client_for(fake: FakePursuit) -> httpx.AsyncClient:
+    transport = httpx.ASGITransport(app=fake.app())
+    return httpx.AsyncClient(transport=transport, base_url="http://pursuit")
+
+
+@pytest.mark.asyncio
+async def test_fake_paginates_records():
+    """Test records are split into pages of `page_size`."""
+    fake = FakePursuit(records=synthetic_results(5), page_size=2)
+    async with client_for(fake) as client:
+        pages = [
+            (await client.get("/search", params={"q": "x", "page": page})).json()
+            for page in (1, 2, 3, 4)
+        ]
+
+    assert [len(page) for page in pages] == [2, 2, 1, 0]
+    assert pages[1][0]["info"]["title"] == "value2"
+
+
+@pytest.mark.asyncio
+async def test_fake_matches_query():
+    """Test `match` serves only records whose names contain the query."""
+    fake = FakePursuit(records=synthetic_results(30), match=True)
+    async with client_for(fake) as client:
+        response = await client.get("/search", params={"q": "VALUE2"})
+
+    titles = [result["info"]["title"] for result in response.json()]
+    assert titles == ["value2"] + [f"value2{n}" for n in range(10)]
+
+
+@pytest.mark.asyncio
+async def test_fake_injects_faults():
+    """Test faults are answered with their status and Retry-After for 429."""
+    fake = FakePursuit(faults={429: 0.5, 503: 0.5}, retry_after=2, seed=1)
+    async with client_for(fake) as client:
+        responses = [await client.get("/search", params={"q": "x"}) for _ in range(20)]
+
+    statuses = {response.status_code for response in responses}
+    assert statuses == {429, 503}
+    assert all(
+        response.headers["Retry-After"] == "2"
+        for response in responses
+        if response.status_code == 429
+    )
+
+
+@pytest.mark.asyncio
+async def test_fake_streams_slow_body():
+    """Test a chunked body is delayed between chunks and arrives intact."""
+    fake = FakePursuit(
+        records=synthetic_results(3), pad_docs=100, chunk_size=256, chunk_delay=0.01
+    )
+    async with client_for(fake) as client:
+        start = time.monotonic()
+        response = await client.get("/search", params={"q": "x"})
+        elapsed = time.monotonic() - start
+
+    results = response.json()
+    assert results[0]["text"].endswith("x" * 100)
+    assert elapsed >= 0.01 * (len(response.content) // 256)
+
+
+@pytest.mark.asyncio
+async def test_fake_answers_matching_etag_with_304():
+    """Test a request carrying the current ETag gets an empty 304."""
+    fake = FakePursuit(records=synthetic_results(3), etag=True)
+    async with client_for(fake) as client:
+        first = await client.get("/search", params={"q": "x"})
+        second = await client.get(
+            "/search",
+            params={"q": "x"},
+            headers={"If-None-Match": first.headers["ETag"]},
+        )
+
+    assert first.status_code == 200
+    assert second.status_code == 304
+    assert second.content == b""
+
+
+def test_parse_latency():
+    """Test latency specs draw from the named distribution."""
+    rng = random.Random(0)
+    assert parse_latency("fixed:0.25")(rng) == 0.25
+    assert all(0.1 <= parse_latency("uniform:0.1,0.2")(rng) <= 0.2 for _ in range(50))
+    assert parse_latency("exponential:0.05")(rng) >= 0
+    assert parse_latency("lognormal:0.05,0.5")(rng) > 0
+    with pytest.raises(ValueError):
+        parse_latency("uniform:1")
+    with pytest.raises(ValueError):
+        parse_latency("normal:1,2")
+
+
+@pytest.mark.asyncio
+async def test_search_against_running_fake(monkeypatch):
+    """Test search() follows the configured base URL to a running fake."""
+    fake = FakePursuit(records=synthetic_results(7), page_size=3)
+    with running(fake) as url:
+        monkeypatch.setattr("pursuit_mcp.config.BASE_URL", url)
+        monkeypatch.setattr("pursuit_mcp.config.PAGE_SIZE", 3)
+        results = await search("anything", limit=10)
+
+    infos = [result["info"] for result in results]
+    assert [info["title"] for info in infos if info["type"] == "declaration"] == [
+        f"value{n}" for n in range(7)
+    ]
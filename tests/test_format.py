@@ -1,7 +1,21 @@
 """Unit tests for format module."""
 
-from pursuit_mcp.format import format
-from pursuit_mcp.types import PursuitResult, FormatOutput
+import json
+from pathlib import Path
+from typing import cast
+
+import pytest
+
+from pursuit_mcp import format as format_module
+from pursuit_mcp.format import format, format_json, from_compact, to_compact
+from pursuit_mcp.types import (
+    FormattedField,
+    FormatOutput,
+    PursuitResult,
+    PursuitResultInfo,
+)
+
+FIXTURE = Path(__file__).parent / "fixtures" / "pursuit_export.json"
 
 
 def test_format_empty_results():
@@ -193,3 +207,166 @@ def test_format_declaration_with_null_type():
         "count": 1,
     }
     assert format(input_data) == expected
+
+
+def without_type_text(result: PursuitResult) -> PursuitResult:
+    """Return a copy of `result` whose info lacks `typeText`, as Pursuit may send."""
+    info = {key: value for key, value in result["info"].items() if key != "typeText"}
+    return {**result, "info": cast(PursuitResultInfo, info)}
+
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_format_json_matches_format(monkeypatch, fast: bool):
+    """Test the fused encoder produces the same document as format()."""
+    if not fast:
+        monkeypatch.setattr(format_module, "msgspec", None)
+    results: list[PursuitResult] = json.loads(FIXTURE.read_bytes())
+    info = results[0]["info"]
+    assert info["type"] == "declaration"
+    info["typeText"] = None
+    results[1] = without_type_text(results[1])
+    results[2]["text"] = "Ünïcode ∀ docs"
+
+    encoded = format_json(results)
+
+    assert json.loads(encoded) == format(results)
+    assert "Ünïcode ∀ docs".encode() in encoded
+    key_orders = [list(result) for result in json.loads(encoded)["results"]]
+    assert key_orders == [list(result) for result in format(results)["results"]]
+
+
+def test_format_json_empty_results():
+    """Test the fused encoder on an empty result list."""
+    assert json.loads(format_json([])) == {"results": [], "count": 0}
+
+
+def test_format_projects_fields():
+    """Test only the requested fields are included."""
+    results: list[PursuitResult] = json.loads(FIXTURE.read_bytes())
+
+    output = format(results, fields=["title", "module", "typeText"])
+
+    info = results[0]["info"]
+    assert info["type"] == "declaration"
+    assert output["count"] == len(results)
+    assert output["results"][0] == {
+        "module": info["module"],
+        "title": info["title"],
+        "typeText": info["typeText"],
+    }
+    assert all(set(r) <= {"title", "module", "typeText"} for r in output["results"])
+    assert json.loads(format_json(results, fields=["title"])) == format(
+        results, fields=["title"]
+    )
+
+
+def docs_result(number: int, docs: str) -> PursuitResult:
+    return {
+        "package": "purescript-prelude",
+        "version": "6.0.1",
+        "markup": "",
+        "text": docs,
+        "info": {"type": "module", "module": f"Data.Module{number}"},
+        "url": f"https://pursuit.purescript.org/Data.Module{number}",
+    }
+
+
+def test_format_json_within_budget_is_unchanged():
+    """Test output that fits the budget is not shortened."""
+    results = [docs_result(1, "short")]
+    encoded = format_json(results)
+
+    assert format_json(results, max_bytes=len(encoded)) == encoded
+
+
+def test_format_json_truncates_docs_to_fit():
+    """Test long docs are cut to a common length with an ellipsis."""
+    results = [docs_result(1, "a" * 200), docs_result(2, "b" * 150)]
+    full = len(format_json(results))
+
+    encoded = format_json(results, max_bytes=full - 200)
+    output = json.loads(encoded)
+
+    assert len(encoded) <= full - 200
+    first, second = (r["docs"] for r in output["results"])
+    assert first.endswith("…") and second.endswith("…")
+    assert len(first) == len(second)
+    assert output["count"] == 2
+
+    output = json.loads(format_json(results, max_bytes=full - 20))
+    first, second = (r["docs"] for r in output["results"])
+    assert first.endswith("…")
+    assert second == "b" * 150
+
+
+def test_format_json_drops_docs_then_results():
+    """Test docs are dropped before results, and results from the end."""
+    results = [docs_result(n, "docs " * 20) for n in range(3)]
+    fields: list[FormattedField] = ["package", "version", "type", "module", "url"]
+    no_docs = format(results, fields=fields)
+    budget = len(format_json(results, fields=fields))
+
+    output = json.loads(format_json(results, max_bytes=budget))
+    assert output == no_docs
+
+    output = json.loads(format_json(results, max_bytes=budget - 1))
+    assert output == {"results": no_docs["results"][:2], "count": 2}
+
+    assert json.loads(format_json(results, max_bytes=1)) == {
+        "results": [],
+        "count": 0,
+    }
+
+
+def test_compact_round_trips(monkeypatch):
+    """Test the compact form converts back to the same FormatOutput."""
+    results: list[PursuitResult] = json.loads(FIXTURE.read_bytes())
+    results[1] = without_type_text(results[1])
+    results[2]["url"] = "https://example.com/elsewhere"
+    results[3]["url"] = results[3]["url"].replace("#v:", "#t:")
+    results[4]["url"] = results[4]["url"].split("#")[0] + "#v:"
+    output = format(results)
+
+    compact = to_compact(output)
+
+    assert compact["columns"] == [
+        "package",
+        "version",
+        "docs",
+        "type",
+        "module",
+        "title",
+        "typeText",
+        "deprecated",
+        "url",
+    ]
+    assert from_compact(compact) == output
+    assert from_compact(json.loads(json.dumps(compact))) == output
+    projected = format(results, fields=["title", "url"])
+    assert from_compact(to_compact(projected)) == projected
+
+
+def test_compact_shortens_urls():
+    """Test derivable URL parts are left out of compact rows."""
+    results: list[PursuitResult] = json.loads(FIXTURE.read_bytes())
+    compact = to_compact(format(results))
+    url = compact["columns"].index("url")
+
+    cells = {row[url] for row in compact["rows"] if isinstance(row[url], str)}
+
+    assert cells <= {"", "#v:", "#t:"}
+    assert "#v:" in cells
+
+
+def test_compact_is_smaller_for_many_results():
+    """Test compact encoding shrinks a 50+ result response."""
+    results: list[PursuitResult] = json.loads(FIXTURE.read_bytes()) * 2
+
+    regular = format_json(results)
+    compact = format_json(results, compact=True)
+
+    assert len(compact) < 0.8 * len(regular)
+    assert from_compact(json.loads(compact)) == json.loads(regular)
+    budgeted = format_json(results, max_bytes=len(compact) // 2, compact=True)
+    assert len(budgeted) <= len(compact) // 2
+    assert json.loads(budgeted)["columns"][0] == "package"
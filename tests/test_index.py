@@ -0,0 +1,117 @@
+"""Unit tests for index module."""
+
+import json
+import time
+from pathlib import Path
+
+import pytest
+from pytest_httpx import HTTPXMock
+
+from pursuit_mcp.index import LocalIndex, main
+from pursuit_mcp.search import search
+
+FIXTURE = Path(__file__).parent / "fixtures" / "pursuit_export.json"
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = LocalIndex(tmp_path / "index.sqlite3")
+    index.ingest(json.loads(FIXTURE.read_bytes()))
+    yield index
+    index.close()
+
+
+def test_index_ingests_every_record(index):
+    """Test every exported record is stored."""
+    assert len(index) == len(json.loads(FIXTURE.read_bytes()))
+
+
+def test_index_declaration_lookup(index):
+    """Test a name query returns matching declarations as Pursuit records."""
+    results = index.search("map")
+
+    assert [(r["info"]["module"], r["info"]["title"]) for r in results] == [
+        ("Data.Functor", "map"),
+        ("Data.Set", "map"),
+        ("Data.Map.Internal", "Map"),
+    ]
+    assert results[0] == {
+        "package": "purescript-prelude",
+        "version": "6.0.2",
+        "markup": "",
+        "text": "Documentation for `map`.\n",
+        "info": {
+            "type": "declaration",
+            "module": "Data.Functor",
+            "title": "map",
+            "typeOrValue": "ValueLevel",
+            "typeText": "forall f a b. Functor f => (a -> b) -> f a -> f b",
+        },
+        "url": "https://pursuit.purescript.org/packages/purescript-prelude/6.0.2/docs/Data.Functor#v:map",
+    }
+
+
+def test_index_module_lookup(index):
+    """Test a module query returns the module record."""
+    results = index.search("Data.Array")
+
+    assert [r["info"] for r in results] == [{"type": "module", "module": "Data.Array"}]
+
+
+def test_index_package_lookup_without_prefix(index):
+    """Test package queries match with or without the purescript- prefix."""
+    assert index.search("prelude")[0]["package"] == "purescript-prelude"
+    assert index.search("purescript-globals")[0]["info"] == {
+        "type": "package",
+        "deprecated": True,
+    }
+
+
+def test_index_respects_limit(index):
+    """Test the number of results is capped by limit."""
+    assert len(index.search("map", limit=1)) == 1
+
+
+def test_index_lookup_is_sub_millisecond(index):
+    """Test a name lookup is answered well under a millisecond."""
+    index.search("traverse")
+
+    start = time.perf_counter()
+    for _ in range(100):
+        index.search("traverse")
+    assert (time.perf_counter() - start) / 100 < 0.001
+
+
+def test_index_cli_builds_index(tmp_path, capsys):
+    """Test the pursuit-mcp-index command ingests JSON exports."""
+    path = tmp_path / "cli.sqlite3"
+    main([str(path), str(FIXTURE)])
+
+    index = LocalIndex(path)
+    info = index.search("Maybe")[0]["info"]
+    assert info["type"] == "declaration"
+    assert info["title"] == "Maybe"
+    index.close()
+    assert "39 records" in capsys.readouterr().out
+
+
+@pytest.mark.asyncio
+async def test_search_prefers_local_index(index, httpx_mock: HTTPXMock):
+    """Test search answers from the index and falls back to the network."""
+    httpx_mock.add_response(json=[])
+
+    local = await search("Data.Maybe", index=index)
+    remote = await search("unknownIdentifier", index=index)
+
+    assert local[0]["info"] == {"type": "module", "module": "Data.Maybe"}
+    assert remote == []
+    assert len(httpx_mock.get_requests()) == 1
+
+
+def test_index_names_lists_declarations_and_modules(index):
+    """Test names() yields declaration titles and module names."""
+    names = set(index.names())
+
+    assert ("traverse_", "declaration", "Data.Foldable") in names
+    assert ("Data.Array.ST", "module", "") in names
+    assert all(kind != "package" for _, kind, _ in names)
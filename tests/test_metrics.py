@@ -0,0 +1,86 @@
+"""Tests for metrics module."""
+
+import pytest
+
+from pursuit_mcp.fake import FakePursuit, running, synthetic_results
+from pursuit_mcp.metrics import Histogram, Metrics, registry
+from pursuit_mcp.search import search
+
+
+def test_histogram_percentiles_and_buckets():
+    """Test percentiles come from recent samples and buckets are cumulative."""
+    histogram = Histogram()
+    for ms in range(1, 101):
+        histogram.observe(ms / 1000)
+
+    stats = histogram.stats()
+    assert stats["count"] == 100
+    assert stats["p50"] == pytest.approx(0.051)
+    assert stats["p95"] == pytest.approx(0.096)
+    assert stats["p99"] == pytest.approx(0.1)
+    assert stats["mean"] == pytest.approx(0.0505)
+    assert sum(histogram.buckets) == 100
+
+
+def test_histogram_window_bounds_percentiles():
+    """Test old samples leave the percentile window."""
+    histogram = Histogram(window=10)
+    for _ in range(10):
+        histogram.observe(5.0)
+    for _ in range(10):
+        histogram.observe(0.001)
+
+    assert histogram.percentile(0.99) == 0.001
+    assert histogram.count == 20
+    assert Histogram().stats()["p50"] is None
+
+
+def test_snapshot_reports_hit_ratios_and_statuses():
+    """Test counters are summarized by cache layer and upstream status."""
+    metrics = Metrics()
+    metrics.increment("cache_requests", layer="memory", result="hit")
+    metrics.increment("cache_requests", layer="memory", result="hit")
+    metrics.increment("cache_requests", layer="memory", result="miss")
+    metrics.increment("upstream_responses", status="200")
+    metrics.increment("upstream_responses", status="429")
+    with metrics.time("format"):
+        pass
+
+    snapshot = metrics.snapshot()
+
+    assert snapshot["cache"] == {
+        "memory": {"hits": 2, "misses": 1, "hit_ratio": pytest.approx(2 / 3)}
+    }
+    assert snapshot["upstream"] == {"200": 1, "429": 1}
+    assert snapshot["phases"]["format"]["count"] == 1
+
+
+def test_prometheus_exposition():
+    """Test histograms and counters render in the Prometheus text format."""
+    metrics = Metrics()
+    metrics.observe("server", 0.003)
+    metrics.observe("server", 20.0)
+    metrics.increment("upstream_responses", status="503")
+
+    text = metrics.prometheus()
+
+    assert 'pursuit_mcp_phase_seconds_bucket{phase="server",le="0.0025"} 0' in text
+    assert 'pursuit_mcp_phase_seconds_bucket{phase="server",le="0.005"} 1' in text
+    assert 'pursuit_mcp_phase_seconds_bucket{phase="server",le="+Inf"} 2' in text
+    assert 'pursuit_mcp_phase_seconds_count{phase="server"} 2' in text
+    assert "# TYPE pursuit_mcp_upstream_responses_total counter" in text
+    assert 'pursuit_mcp_upstream_responses_total{status="503"} 1' in text
+
+
+@pytest.mark.asyncio
+async def test_search_records_upstream_phases(monkeypatch):
+    """Test a real request records connection, server and download phases."""
+    registry.reset()
+    with running(FakePursuit(records=synthetic_results(3))) as url:
+        monkeypatch.setattr("pursuit_mcp.config.BASE_URL", url)
+        await search("map")
+
+    snapshot = registry.snapshot()
+    for phase in ("connect", "server", "download", "upstream"):
+        assert snapshot["phases"][phase]["count"] == 1
+    assert snapshot["upstream"] == {"200": 1}
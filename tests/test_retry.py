@@ -0,0 +1,183 @@
+"""Tests for retry module."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from pursuit_mcp.retry import HedgingTransport, RetryTransport
+from pursuit_mcp.throttle import QueueFullError
+
+
+def responder(*outcomes):
+    """Mock transport handler answering with each outcome in turn."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        outcome = outcomes[len(calls)]
+        calls.append(request)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    return handler, calls
+
+
+@pytest.mark.asyncio
+async def test_retry_transient_failures():
+    """Test 503s and connection errors are retried until a success."""
+    handler, calls = responder(
+        httpx.Response(503),
+        httpx.ConnectError("refused"),
+        httpx.Response(200, json=[]),
+    )
+    transport = RetryTransport(httpx.MockTransport(handler), 2, 0, 0)
+    async with httpx.AsyncClient(transport=transport) as client:
+        response = await client.get("http://pursuit/search")
+
+    assert response.status_code == 200
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_retry_gives_up():
+    """Test the last failure is returned once retries are exhausted."""
+    handler, calls = responder(*[httpx.Response(502)] * 3)
+    transport = RetryTransport(httpx.MockTransport(handler), 2, 0, 0)
+    async with httpx.AsyncClient(transport=transport) as client:
+        response = await client.get("http://pursuit/search")
+
+    assert response.status_code == 502
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_retry_skips_non_idempotent_and_local_overload():
+    """Test POSTs and `QueueFullError` are never retried."""
+    handler, calls = responder(httpx.Response(503))
+    transport = RetryTransport(httpx.MockTransport(handler), 2, 0, 0)
+    async with httpx.AsyncClient(transport=transport) as client:
+        response = await client.post("http://pursuit/search")
+    assert response.status_code == 503
+    assert len(calls) == 1
+
+    handler, calls = responder(QueueFullError("full"))
+    transport = RetryTransport(httpx.MockTransport(handler), 2, 0, 0)
+    async with httpx.AsyncClient(transport=transport) as client:
+        with pytest.raises(QueueFullError):
+            await client.get("http://pursuit/search")
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_retry_after(monkeypatch):
+    """Test a short Retry-After is waited for and a long one is returned."""
+    sleeps = []
+
+    async def sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+
+    monkeypatch.setattr("pursuit_mcp.retry.asyncio.sleep", sleep)
+    handler, calls = responder(
+        httpx.Response(429, headers={"Retry-After": "1"}),
+        httpx.Response(429, headers={"Retry-After": "60"}),
+    )
+    transport = RetryTransport(httpx.MockTransport(handler), 2, 0.1, 2.0)
+    async with httpx.AsyncClient(transport=transport) as client:
+        response = await client.get("http://pursuit/search")
+
+    assert response.status_code == 429
+    assert sleeps == [1.0]
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_retry_skips_timeouts():
+    """Test a timed-out request is not retried with a fresh timeout."""
+    handler, calls = responder(httpx.ReadTimeout("slow"), httpx.Response(200))
+    transport = RetryTransport(httpx.MockTransport(handler), 2, 0, 0)
+    async with httpx.AsyncClient(transport=transport) as client:
+        with pytest.raises(httpx.ReadTimeout):
+            await client.get("http://pursuit/search")
+    assert len(calls) == 1
+
+
+class SlowUnavailable(httpx.AsyncBaseTransport):
+    """Transport answering 503 after a delay, recording each read timeout."""
+
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+        self.timeouts: list[float] = []
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.timeouts.append(request.extensions["timeout"]["read"])
+        await asyncio.sleep(self.delay)
+        return httpx.Response(503)
+
+
+@pytest.mark.asyncio
+async def test_retry_stays_within_request_timeout():
+    """Test all attempts together are bounded by the request's timeout."""
+    inner = SlowUnavailable(0.2)
+    transport = RetryTransport(inner, 10, 0, 0)
+    async with httpx.AsyncClient(transport=transport, timeout=0.5) as client:
+        response = await client.get("http://pursuit/search")
+
+    assert response.status_code == 503
+    assert len(inner.timeouts) == 3
+    assert inner.timeouts[0] == 0.5
+    assert inner.timeouts[1] <= 0.3
+    assert inner.timeouts[2] <= 0.1
+
+
+class SlowThenFast(httpx.AsyncBaseTransport):
+    """Transport whose first request hangs and later ones answer at once."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.cancelled = False
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        if self.calls == 1:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                self.cancelled = True
+                raise
+        return httpx.Response(200, json=self.calls)
+
+
+@pytest.mark.asyncio
+async def test_hedge_takes_first_response_and_cancels_loser():
+    """Test a slow request is hedged and the losing request is cancelled."""
+    inner = SlowThenFast()
+    transport = HedgingTransport(inner, min_delay=0.01, max_ratio=1, min_samples=1)
+    transport.latencies.observe(0.001)
+    async with httpx.AsyncClient(transport=transport) as client:
+        response = await client.get("http://pursuit/search")
+
+    assert response.json() == 2
+    assert inner.calls == 2
+    assert inner.cancelled
+    assert transport.hedged == 1
+
+
+def test_hedge_delay():
+    """Test hedging waits for enough samples and respects the ratio."""
+    transport = HedgingTransport(
+        httpx.MockTransport(lambda request: httpx.Response(200)),
+        min_delay=0.05,
+        max_ratio=0.5,
+        min_samples=3,
+    )
+    transport.requests = 1
+    for latency in (0.1, 0.2):
+        transport.latencies.observe(latency)
+    assert transport.hedge_delay() is None
+
+    transport.latencies.observe(0.3)
+    assert transport.hedge_delay() == 0.3
+
+    transport.hedged = 1
+    assert transport.hedge_delay() is None
@@ -1,15 +1,27 @@
 """Test suite for Pursuit search functionality with expected data."""
 
+import asyncio
+import json
+import sqlite3
+from typing import cast
+
+import httpx
 import pytest
 from pytest_httpx import HTTPXMock
 
-from pursuit_mcp.search import search
+from pursuit_mcp import search as search_module
+from pursuit_mcp.breaker import CircuitOpenError
+from pursuit_mcp.cache import TTLCache, Validators
+from pursuit_mcp.metrics import registry
+from pursuit_mcp.search import create_client, iter_search, search
+from pursuit_mcp.store import DiskCache
+from pursuit_mcp.types import PursuitResult
 
 # Expected data based on actual Pursuit API responses
 # Declaration type: info has module, title, type, typeOrValue, typeText
 # Module type: info has module, type
 # Package type: info has deprecated, type
-expected_map_search = [
+expected_map_search: list[PursuitResult] = [
     {
         "info": {
             "module": "Data.Functor",
@@ -214,3 +226,329 @@ async def test_search_default_limit(httpx_mock: HTTPXMock):
 
     assert len(results) == 10
     assert results == full_results[:10]
+
+
+@pytest.mark.asyncio
+async def test_search_with_shared_client(httpx_mock: HTTPXMock):
+    """Test searching through a pooled client from create_client."""
+    httpx_mock.add_response(json=expected_map_search, is_reusable=True)
+
+    client = create_client(max_connections=5, max_keepalive_connections=2)
+    try:
+        first = await search("map", limit=3, client=client)
+        second = await search("map", limit=3, client=client)
+    finally:
+        await client.aclose()
+
+    assert first == second == expected_map_search
+    assert client.is_closed
+
+
+@pytest.mark.asyncio
+async def test_search_cache_hit_skips_network(httpx_mock: HTTPXMock):
+    """Test a cached query is served without a second request."""
+    httpx_mock.add_response(json=expected_map_search)
+    cache = TTLCache(ttl=60, max_entries=10, max_bytes=1_000_000)
+
+    first = await search("map", limit=3, cache=cache)
+    second = await search("  map ", limit=2, cache=cache)
+
+    assert first == expected_map_search
+    assert second == expected_map_search[:2]
+    assert len(httpx_mock.get_requests()) == 1
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_search_serves_stale_and_refreshes(clock, httpx_mock: HTTPXMock):
+    """Test a stale entry is returned at once and refreshed in the background."""
+    cache = TTLCache(ttl=60, max_entries=10, max_bytes=1_000_000, grace=60, clock=clock)
+    cache.set("map", expected_map_search[:1], 10)
+    clock.now = 61
+    httpx_mock.add_response(json=expected_map_search)
+
+    async with httpx.AsyncClient() as client:
+        stale = await asyncio.gather(
+            search("map", limit=3, client=client, cache=cache),
+            search("map", limit=3, client=client, cache=cache),
+        )
+        await asyncio.gather(*search_module._refreshes.values())
+
+    assert stale == [expected_map_search[:1]] * 2
+    assert len(httpx_mock.get_requests()) == 1
+    assert cache.get("map") == expected_map_search
+
+
+@pytest.mark.asyncio
+async def test_search_refresh_failure_is_hidden(clock, httpx_mock: HTTPXMock):
+    """Test a failed background refresh keeps serving the stale entry."""
+    cache = TTLCache(ttl=60, max_entries=10, max_bytes=1_000_000, grace=60, clock=clock)
+    cache.set("map", expected_map_search, 10)
+    clock.now = 61
+    httpx_mock.add_response(status_code=500)
+
+    assert await search("map", limit=3, cache=cache) == expected_map_search
+    await asyncio.gather(*search_module._refreshes.values())
+
+    assert len(httpx_mock.get_requests()) == 1
+    assert cache.lookup("map") == (expected_map_search, True)
+
+
+@pytest.mark.asyncio
+async def test_search_revalidates_expired_entry(clock, httpx_mock: HTTPXMock):
+    """Test an expired entry is renewed by a 304 without a new body."""
+    cache = TTLCache(ttl=60, max_entries=10, max_bytes=1_000_000, grace=60, clock=clock)
+    httpx_mock.add_response(json=expected_map_search, headers={"ETag": '"v1"'})
+    httpx_mock.add_response(status_code=304, match_headers={"If-None-Match": '"v1"'})
+
+    await search("map", limit=3, cache=cache)
+    clock.now = 61
+    assert await search("map", limit=3, cache=cache) == expected_map_search
+    await asyncio.gather(*search_module._refreshes.values())
+
+    assert len(httpx_mock.get_requests()) == 2
+    assert cache.lookup("map") == (expected_map_search, False)
+
+
+@pytest.mark.asyncio
+async def test_search_revalidates_expired_disk_entry(
+    clock, httpx_mock: HTTPXMock, tmp_path
+):
+    """Test a 304 renews an expired persisted response for a new process."""
+    store = DiskCache(
+        tmp_path / "cache.sqlite3", ttl=60, max_bytes=1_000_000, clock=clock
+    )
+    store.set(
+        "map",
+        json.dumps(expected_map_search).encode(),
+        Validators(None, "Wed, 21 Oct 2015 07:28:00 GMT"),
+    )
+    clock.now = 61
+    httpx_mock.add_response(
+        status_code=304,
+        match_headers={"If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT"},
+    )
+
+    cache = TTLCache(ttl=60, max_entries=10, max_bytes=1_000_000)
+    results = await search("map", limit=3, cache=cache, store=store)
+
+    assert results == expected_map_search
+    assert cache.get("map") == expected_map_search
+    store.close()
+
+
+@pytest.mark.asyncio
+async def test_search_serves_stale_copy_while_circuit_open(
+    clock, httpx_mock: HTTPXMock, tmp_path
+):
+    """Test an open circuit serves an expired copy, or fails fast without one."""
+    httpx_mock.add_exception(httpx.ConnectError("refused"))
+    store = DiskCache(
+        tmp_path / "cache.sqlite3", ttl=60, max_bytes=1_000_000, clock=clock
+    )
+    store.set("map", json.dumps(expected_map_search).encode())
+    clock.now = 61
+
+    client = create_client(retries=0, breaker_threshold=1, rate_limit=0)
+    with pytest.raises(httpx.ConnectError):
+        await search("map", limit=3, client=client)
+    results = await search("map", limit=3, client=client, store=store)
+    with pytest.raises(CircuitOpenError):
+        await search("lens", limit=3, client=client, store=store)
+    await client.aclose()
+
+    assert results == expected_map_search
+    assert len(httpx_mock.get_requests()) == 1
+    store.close()
+
+
+@pytest.mark.asyncio
+async def test_search_keeps_empty_pages_out_of_disk_cache(
+    httpx_mock: HTTPXMock, tmp_path
+):
+    """Test queries without results are only cached in memory."""
+    httpx_mock.add_response(json=[])
+    store = DiskCache(tmp_path / "cache.sqlite3", ttl=60, max_bytes=1_000_000)
+    cache = TTLCache(ttl=60, max_entries=10, max_bytes=1_000_000, negative_ttl=5)
+
+    assert await search("no such thing", cache=cache, store=store) == []
+    assert cache.get("no such thing") == []
+    assert store.get("no such thing") is None
+    store.close()
+
+
+@pytest.mark.asyncio
+async def test_search_survives_failed_disk_cache_write(
+    httpx_mock: HTTPXMock, tmp_path, monkeypatch
+):
+    """Test a disk cache write failing, e.g. on a lock, does not fail the search."""
+    httpx_mock.add_response(json=expected_map_search)
+    store = DiskCache(tmp_path / "cache.sqlite3", ttl=60, max_bytes=1_000_000)
+    failed = registry.count("store_writes", operation="set", result="failed")
+
+    def locked(*args) -> None:
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(store, "_set", locked)
+
+    assert await search("map", limit=3, store=store) == expected_map_search
+    assert registry.count("store_writes", operation="set", result="failed") == (
+        failed + 1
+    )
+    store.close()
+
+
+@pytest.mark.asyncio
+async def test_search_served_from_disk_after_restart(httpx_mock: HTTPXMock, tmp_path):
+    """Test a fresh process is served from the persistent cache."""
+    httpx_mock.add_response(json=expected_map_search)
+    path = tmp_path / "cache.sqlite3"
+
+    store = DiskCache(path, ttl=60, max_bytes=1_000_000)
+    await search("map", limit=3, store=store)
+    store.close()
+
+    restarted = DiskCache(path, ttl=60, max_bytes=1_000_000)
+    cache = TTLCache(ttl=60, max_entries=10, max_bytes=1_000_000)
+    results = await search("map", limit=3, cache=cache, store=restarted)
+
+    assert results == expected_map_search
+    assert len(httpx_mock.get_requests()) == 1
+    assert cache.get("map") == expected_map_search
+
+
+@pytest.mark.asyncio
+async def test_search_coalesces_concurrent_queries(httpx_mock: HTTPXMock):
+    """Test concurrent identical queries share one upstream request."""
+    httpx_mock.add_response(json=expected_map_search)
+    cache = TTLCache(ttl=60, max_entries=10, max_bytes=1_000_000)
+
+    results = await asyncio.gather(
+        search("map", limit=1, cache=cache),
+        search("map ", limit=2, cache=cache),
+        search(" map", limit=3, cache=cache),
+    )
+
+    assert results == [
+        expected_map_search[:1],
+        expected_map_search[:2],
+        expected_map_search[:3],
+    ]
+    assert len(httpx_mock.get_requests()) == 1
+
+
+@pytest.mark.asyncio
+async def test_search_coalesced_error_reaches_every_caller(httpx_mock: HTTPXMock):
+    """Test an upstream failure is raised to all coalesced callers."""
+    httpx_mock.add_response(status_code=503)
+
+    results = await asyncio.gather(search("map"), search("map"), return_exceptions=True)
+
+    assert all(isinstance(r, httpx.HTTPStatusError) for r in results)
+    assert len(httpx_mock.get_requests()) == 1
+
+
+@pytest.mark.asyncio
+async def test_search_stops_reading_after_limit(httpx_mock: HTTPXMock):
+    """Test the uncached path decodes only the first `limit` results."""
+    body = json.dumps(expected_map_search * 10).encode()
+    chunks = [body[i : i + 256] for i in range(0, len(body), 256)]
+    consumed = 0
+
+    class CountingStream(httpx.AsyncByteStream):
+        async def __aiter__(self):
+            nonlocal consumed
+            for chunk in chunks:
+                consumed += 1
+                yield chunk
+
+    httpx_mock.add_response(stream=CountingStream())
+
+    results = await search("map", limit=2)
+
+    assert results == expected_map_search[:2]
+    assert consumed < len(chunks)
+
+
+def page_of(size: int, start: int = 0) -> list[PursuitResult]:
+    """Build a page of `size` distinct declaration results."""
+    base = expected_map_search[0]
+    return [
+        cast(
+            PursuitResult,
+            {**base, "info": {**base["info"], "title": f"map{start + i}"}},
+        )
+        for i in range(size)
+    ]
+
+
+def title(result: PursuitResult) -> str:
+    """Return the title of a declaration result."""
+    info = result["info"]
+    assert info["type"] == "declaration"
+    return info["title"]
+
+
+@pytest.mark.asyncio
+async def test_search_follows_pages_for_large_limit(httpx_mock: HTTPXMock, monkeypatch):
+    """Test a limit larger than one page is served from several pages."""
+    monkeypatch.setattr("pursuit_mcp.config.PAGE_SIZE", 3)
+    url = "https://pursuit.purescript.org/search"
+    httpx_mock.add_response(url=f"{url}?q=map", json=page_of(3))
+    httpx_mock.add_response(url=f"{url}?q=map&page=2", json=page_of(3, 3))
+
+    results = await search("map", limit=5)
+
+    assert results == page_of(5)
+    assert len(httpx_mock.get_requests()) == 2
+
+
+@pytest.mark.asyncio
+async def test_search_stops_at_short_page(httpx_mock: HTTPXMock, monkeypatch):
+    """Test a page shorter than PAGE_SIZE ends the pagination."""
+    monkeypatch.setattr("pursuit_mcp.config.PAGE_SIZE", 3)
+    url = "https://pursuit.purescript.org/search"
+    httpx_mock.add_response(url=f"{url}?q=map", json=page_of(3))
+    httpx_mock.add_response(url=f"{url}?q=map&page=2", json=page_of(1, 3))
+
+    cache = TTLCache(ttl=60, max_entries=10, max_bytes=1_000_000)
+    results = await search("map", limit=100, cache=cache)
+
+    assert results == page_of(4)
+    assert len(httpx_mock.get_requests()) == 2
+    assert cache.get("map\npage=2") == page_of(1, 3)
+
+
+@pytest.mark.asyncio
+async def test_iter_search_fetches_pages_lazily(httpx_mock: HTTPXMock, monkeypatch):
+    """Test iter_search requests a page only when the consumer reaches it."""
+    monkeypatch.setattr("pursuit_mcp.config.PAGE_SIZE", 2)
+    url = "https://pursuit.purescript.org/search"
+    httpx_mock.add_response(url=f"{url}?q=map", json=page_of(2))
+    httpx_mock.add_response(url=f"{url}?q=map&page=2", json=page_of(2, 2))
+
+    seen = []
+    async for result in iter_search("map"):
+        seen.append(title(result))
+        if len(seen) == 3:
+            break
+
+    assert seen == ["map0", "map1", "map2"]
+    assert len(httpx_mock.get_requests()) == 2
+
+
+@pytest.mark.asyncio
+async def test_iter_search_prefetches_next_page(httpx_mock: HTTPXMock, monkeypatch):
+    """Test prefetch requests the next page before the current one is consumed."""
+    monkeypatch.setattr("pursuit_mcp.config.PAGE_SIZE", 2)
+    url = "https://pursuit.purescript.org/search"
+    httpx_mock.add_response(url=f"{url}?q=map", json=page_of(2))
+    httpx_mock.add_response(url=f"{url}?q=map&page=2", json=[])
+
+    results = iter_search("map", prefetch=True)
+    first = await anext(results)
+    await asyncio.sleep(0.01)
+
+    assert title(first) == "map0"
+    assert len(httpx_mock.get_requests()) == 2
+    assert [title(r) async for r in results] == ["map1"]
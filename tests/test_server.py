@@ -0,0 +1,299 @@
+"""Tests for the MCP server tools."""
+
+import asyncio
+import json
+import threading
+from pathlib import Path
+
+import httpx
+import pytest
+from fastmcp import Client
+from pytest_httpx import HTTPXMock
+
+from pursuit_mcp.index import LocalIndex
+from pursuit_mcp.server import http_app, index_lifespan, mcp
+
+FIXTURE = Path(__file__).parent / "fixtures" / "pursuit_export.json"
+
+api_response = [
+    {
+        "info": {
+            "module": "Data.Functor",
+            "title": "map",
+            "type": "declaration",
+            "typeOrValue": "ValueLevel",
+            "typeText": "forall f a b. Functor f => (a -> b) -> f a -> f b",
+        },
+        "markup": "<p>Map function</p>\n",
+        "package": "purescript-prelude",
+        "text": "Map function\n",
+        "url": "https://pursuit.purescript.org/packages/purescript-prelude/6.0.2/docs/Data.Functor#v:map",
+        "version": "6.0.2",
+    }
+]
+
+
+@pytest.mark.asyncio
+async def test_search_pursuit_tool(httpx_mock: HTTPXMock):
+    """Test the search_pursuit tool returns formatted JSON."""
+    httpx_mock.add_response(json=api_response)
+
+    async with Client(mcp) as client:
+        result = await client.call_tool("search_pursuit", {"query": "map"})
+
+    output = json.loads(result.content[0].text)
+    assert output["count"] == 1
+    assert output["results"][0]["title"] == "map"
+
+
+@pytest.mark.asyncio
+async def test_search_pursuit_fields_and_budget(httpx_mock: HTTPXMock):
+    """Test the search_pursuit tool projects fields and respects a budget."""
+    httpx_mock.add_response(json=api_response)
+
+    async with Client(mcp) as client:
+        projected = await client.call_tool(
+            "search_pursuit", {"query": "map", "fields": ["title", "typeText"]}
+        )
+        budgeted = await client.call_tool(
+            "search_pursuit", {"query": "map", "max_bytes": 200}
+        )
+
+    assert json.loads(projected.content[0].text)["results"] == [
+        {
+            "title": "map",
+            "typeText": "forall f a b. Functor f => (a -> b) -> f a -> f b",
+        }
+    ]
+    assert len(budgeted.content[0].text.encode()) <= 200
+
+
+@pytest.mark.asyncio
+async def test_search_pursuit_compact(httpx_mock: HTTPXMock):
+    """Test the search_pursuit tool returns columnar output on request."""
+    httpx_mock.add_response(json=api_response)
+
+    async with Client(mcp) as client:
+        result = await client.call_tool(
+            "search_pursuit", {"query": "map", "compact": True}
+        )
+
+    output = json.loads(result.content[0].text)
+    assert output["count"] == 1
+    assert output["rows"][0][output["columns"].index("url")] == "#v:"
+
+
+@pytest.mark.asyncio
+async def test_search_pursuit_reuses_client(httpx_mock: HTTPXMock):
+    """Test repeated tool calls share the lifespan-owned client."""
+    httpx_mock.add_response(json=api_response, is_reusable=True)
+
+    async with Client(mcp) as client:
+        await client.call_tool("search_pursuit", {"query": "map"})
+        await client.call_tool("search_pursuit", {"query": "Data.Functor"})
+
+    requests = httpx_mock.get_requests()
+    assert len(requests) == 2
+    assert all(r.headers["Accept"] == "application/json" for r in requests)
+
+
+@pytest.mark.asyncio
+async def test_search_pursuit_caches_results(httpx_mock: HTTPXMock):
+    """Test repeated queries are answered from the lifespan-owned cache."""
+    httpx_mock.add_response(json=api_response)
+
+    async with Client(mcp) as client:
+        first = await client.call_tool("search_pursuit", {"query": "map"})
+        second = await client.call_tool("search_pursuit", {"query": "map"})
+
+    assert first.content[0].text == second.content[0].text
+    assert len(httpx_mock.get_requests()) == 1
+
+
+@pytest.mark.asyncio
+async def test_search_pursuit_batch_keys_results_by_query(httpx_mock: HTTPXMock):
+    """Test the batch tool returns per-query results and errors."""
+    httpx_mock.add_response(
+        url="https://pursuit.purescript.org/search?q=map", json=api_response
+    )
+    httpx_mock.add_response(
+        url="https://pursuit.purescript.org/search?q=Data.Functor", json=[]
+    )
+    httpx_mock.add_response(
+        url="https://pursuit.purescript.org/search?q=broken", status_code=500
+    )
+
+    async with Client(mcp) as client:
+        result = await client.call_tool(
+            "search_pursuit_batch",
+            {"queries": ["map", "Data.Functor", "broken", "map"], "limit": 5},
+        )
+
+    output = json.loads(result.content[0].text)["results"]
+    assert list(output) == ["map", "Data.Functor", "broken"]
+    assert output["map"]["results"][0]["title"] == "map"
+    assert output["Data.Functor"] == {"results": [], "count": 0}
+    assert output["broken"]["error"].startswith("HTTPStatusError")
+    assert len(httpx_mock.get_requests()) == 3
+
+
+@pytest.mark.asyncio
+async def test_search_pursuit_batch_caps_concurrency(
+    httpx_mock: HTTPXMock, monkeypatch
+):
+    """Test no more than BATCH_CONCURRENCY searches run at once."""
+    import asyncio
+
+    monkeypatch.setattr("pursuit_mcp.config.BATCH_CONCURRENCY", 2)
+    in_flight = 0
+    peak = 0
+
+    async def slow_response(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, json=[])
+
+    httpx_mock.add_callback(slow_response, is_reusable=True)
+
+    async with Client(mcp) as client:
+        await client.call_tool(
+            "search_pursuit_batch", {"queries": [f"q{i}" for i in range(6)]}
+        )
+
+    assert peak == 2
+    assert len(httpx_mock.get_requests()) == 6
+
+
+@pytest.mark.asyncio
+async def test_complete_identifier_uses_seen_results(httpx_mock: HTTPXMock):
+    """Test completion is served from earlier results without a request."""
+    httpx_mock.add_response(json=api_response)
+
+    async with Client(mcp) as client:
+        await client.call_tool("search_pursuit", {"query": "map"})
+        result = await client.call_tool("complete_identifier", {"prefix": "ma"})
+
+    output = json.loads(result.content[0].text)
+    assert output == {
+        "completions": [
+            {
+                "name": "map",
+                "type": "declaration",
+                "module": "Data.Functor",
+                "distance": 0,
+            }
+        ],
+        "count": 1,
+    }
+    assert len(httpx_mock.get_requests()) == 1
+
+
+@pytest.mark.asyncio
+async def test_signature_index_builds_in_background(monkeypatch, tmp_path):
+    """Test the server starts before the signature index is built."""
+    index = LocalIndex(tmp_path / "index.sqlite3")
+    index.ingest(json.loads(FIXTURE.read_bytes()))
+    index.close()
+    monkeypatch.setattr("pursuit_mcp.config.LOCAL_INDEX_PATH", str(index.path))
+    release = threading.Event()
+    build_signatures = LocalIndex.build_signatures
+
+    def build_when_released(self: LocalIndex):
+        release.wait(5)
+        return build_signatures(self)
+
+    monkeypatch.setattr(LocalIndex, "build_signatures", build_when_released)
+    query = "forall a. Array a -> Maybe a"
+
+    async with index_lifespan(mcp) as state:
+        index = state["index"]
+        assert index.search(query) == []
+        release.set()
+        for _ in range(500):
+            if index.signatures is not None:
+                break
+            await asyncio.sleep(0.01)
+        assert index.search(query, limit=1)[0]["info"]["title"] == "head"
+
+
+@pytest.mark.asyncio
+async def test_startup_warms_logged_queries(
+    httpx_mock: HTTPXMock, monkeypatch, tmp_path
+):
+    """Test queries logged by one session are prefetched by the next."""
+    httpx_mock.add_response(json=api_response, is_reusable=True)
+    monkeypatch.setattr("pursuit_mcp.config.ACCESS_LOG_PATH", str(tmp_path / "log"))
+
+    async with Client(mcp) as client:
+        await client.call_tool("search_pursuit", {"query": "map"})
+
+    async with Client(mcp) as client:
+        for _ in range(100):
+            if len(httpx_mock.get_requests()) == 2:
+                break
+            await asyncio.sleep(0.01)
+        warmed = len(httpx_mock.get_requests())
+        await client.call_tool("search_pursuit", {"query": "map"})
+
+    assert warmed == 2
+    assert len(httpx_mock.get_requests()) == 2
+
+
+@pytest.mark.asyncio
+async def test_metrics_resource(httpx_mock: HTTPXMock):
+    """Test the metrics resource reports tool phases and cache lookups."""
+    httpx_mock.add_response(json=api_response)
+
+    async with Client(mcp) as client:
+        await client.call_tool("search_pursuit", {"query": "map"})
+        await client.call_tool("search_pursuit", {"query": "map"})
+        contents = await client.read_resource("pursuit://metrics")
+
+    metrics = json.loads(contents[0].text)
+    assert metrics["phases"]["tool"]["count"] >= 2
+    assert metrics["phases"]["format"]["p99"] is not None
+    assert metrics["cache"]["memory"]["hits"] >= 1
+    assert metrics["upstream"]["200"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_prometheus_route(monkeypatch):
+    """Test /metrics serves Prometheus text only when enabled."""
+    transport = httpx.ASGITransport(app=mcp.http_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://mcp") as http:
+        disabled = await http.get("/metrics")
+        monkeypatch.setattr("pursuit_mcp.config.PROMETHEUS", True)
+        enabled = await http.get("/metrics")
+
+    assert disabled.status_code == 404
+    assert enabled.status_code == 200
+    assert "# TYPE pursuit_mcp_phase_seconds histogram" in enabled.text
+
+
+@pytest.mark.asyncio
+async def test_http_app_is_stateless_with_workers(monkeypatch):
+    """Test multi-worker apps serve requests outside of any session."""
+    call = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "tools/call",
+        "params": {"name": "complete_identifier", "arguments": {"prefix": "ma"}},
+    }
+    headers = {"Accept": "application/json, text/event-stream"}
+
+    statuses = []
+    for workers in (1, 2):
+        monkeypatch.setattr("pursuit_mcp.config.WORKERS", workers)
+        app = http_app()
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://mcp"
+            ) as http:
+                response = await http.post("/mcp", json=call, headers=headers)
+        statuses.append(response.status_code)
+
+    assert statuses == [400, 200]
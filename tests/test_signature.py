@@ -0,0 +1,119 @@
+"""Unit tests for signature module."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from pursuit_mcp.index import LocalIndex
+from pursuit_mcp.signature import (
+    SignatureIndex,
+    SignatureSyntaxError,
+    is_signature_query,
+    normalize,
+)
+
+FIXTURE = Path(__file__).parent / "fixtures" / "pursuit_export.json"
+
+
+@pytest.fixture
+def signatures() -> SignatureIndex:
+    return SignatureIndex.from_results(json.loads(FIXTURE.read_bytes()))
+
+
+def titles(results) -> list[str]:
+    return [f"{r['info']['module']}.{r['info']['title']}" for r in results]
+
+
+def test_normalize_alpha_renames_and_strips_forall():
+    """Test alpha-equivalent signatures normalize to the same body."""
+    declared = normalize("forall f a b. Functor f => (a -> b) -> f a -> f b")
+    query = normalize("(x -> y) -> g x -> g y")
+
+    assert declared.body == query.body == "(t0 -> t1) -> t2 t0 -> t2 t1"
+    assert declared.constraints == ("Functor t2",)
+    assert declared.arity == 2
+
+
+def test_normalize_sorts_constraints():
+    """Test constraint order does not affect the normalized signature."""
+    first = normalize(
+        "forall m t. Traversable t => Applicative m => t (m a) -> m (t a)"
+    )
+    second = normalize(
+        "forall m t. Applicative m => Traversable t => t (m a) -> m (t a)"
+    )
+
+    assert first == second
+
+
+def test_normalize_drops_module_qualifiers():
+    """Test qualified constructors match their unqualified form."""
+    assert normalize("Data.Maybe.Maybe a -> a").body == normalize("Maybe b -> b").body
+
+
+def test_normalize_records_and_rows():
+    """Test record fields are ordered and row tails kept."""
+    signature = normalize("forall r. { b :: String, a :: Int | r } -> Int")
+
+    assert signature.body == "{ a :: Int, b :: String | t0 } -> Int"
+
+
+def test_normalize_rejects_malformed_signature():
+    """Test unparseable signatures raise SignatureSyntaxError."""
+    with pytest.raises(SignatureSyntaxError):
+        normalize("(a -> b")
+
+
+def test_is_signature_query():
+    """Test signature queries are told apart from name queries."""
+    assert is_signature_query("(a -> b) -> f a -> f b")
+    assert is_signature_query("forall a. a")
+    assert not is_signature_query("Data.Array")
+
+
+def test_signature_index_exact_match_ranks_first(signatures):
+    """Test exact matches come first, then structurally similar ones."""
+    results = signatures.search("(a -> b) -> f a -> f b", limit=5)
+
+    assert titles(results)[:3] == [
+        "Data.Functor.map",
+        "Control.Applicative.liftA1",
+        "Control.Monad.liftM1",
+    ]
+    assert "Data.Set.map" in titles(results)
+
+
+def test_signature_index_prefers_matching_constraints(signatures):
+    """Test exact matches sharing the query's constraints rank higher."""
+    results = signatures.search("Monad m => (a -> b) -> m a -> m b", limit=3)
+
+    assert titles(results)[0] == "Control.Monad.liftM1"
+
+
+def test_signature_index_similarity_without_exact_match(signatures):
+    """Test near matches are returned when nothing matches exactly."""
+    results = signatures.search("k -> Map k v -> v", limit=2)
+
+    assert titles(results) == [
+        "Data.Map.Internal.lookup",
+        "Data.Map.Internal.insert",
+    ]
+
+
+def test_signature_index_skips_records_without_signatures(signatures):
+    """Test type-level declarations and modules are not indexed."""
+    assert len(signatures) == 26
+
+
+def test_local_index_routes_signature_queries(tmp_path):
+    """Test LocalIndex answers signature queries once its index is built."""
+    index = LocalIndex(tmp_path / "index.sqlite3")
+    index.ingest(json.loads(FIXTURE.read_bytes()))
+    assert index.search("forall a. Array a -> Maybe a", limit=1) == []
+
+    index.build_signatures()
+    results = index.search("forall a. Array a -> Maybe a", limit=1)
+
+    assert titles(results) == ["Data.Array.head"]
+    index.close()
@@ -0,0 +1,84 @@
+"""Unit tests for singleflight module."""
+
+import asyncio
+
+import pytest
+
+from pursuit_mcp.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    """Test concurrent callers with the same key run the call once."""
+    group: SingleFlight[int] = SingleFlight()
+    calls = 0
+    release = asyncio.Event()
+
+    async def fetch() -> int:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return 42
+
+    waiters = [asyncio.create_task(group.do("map", fetch)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*waiters) == [42] * 5
+    assert calls == 1
+    assert len(group) == 0
+
+
+@pytest.mark.asyncio
+async def test_error_propagates_to_every_waiter():
+    """Test every waiter receives the shared call's exception."""
+    group: SingleFlight[int] = SingleFlight()
+    release = asyncio.Event()
+
+    async def fail() -> int:
+        await release.wait()
+        raise ValueError("upstream failed")
+
+    waiters = [asyncio.create_task(group.do("map", fail)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+    assert all(isinstance(r, ValueError) for r in results)
+    assert len(group) == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_others():
+    """Test cancelling one waiter leaves the shared call running."""
+    group: SingleFlight[int] = SingleFlight()
+    release = asyncio.Event()
+
+    async def fetch() -> int:
+        await release.wait()
+        return 7
+
+    first = asyncio.create_task(group.do("map", fetch))
+    second = asyncio.create_task(group.do("map", fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await second == 7
+    assert first.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_different_keys_run_independently():
+    """Test calls with different keys are not coalesced."""
+    group: SingleFlight[str] = SingleFlight()
+
+    async def echo(value: str) -> str:
+        await asyncio.sleep(0)
+        return value
+
+    results = await asyncio.gather(
+        group.do("a", lambda: echo("a")), group.do("b", lambda: echo("b"))
+    )
+    assert results == ["a", "b"]
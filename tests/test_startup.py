@@ -0,0 +1,76 @@
+"""Tests for startup time of the MCP server."""
+
+import subprocess
+import sys
+import time
+from collections import Counter
+
+import pytest
+
+from pursuit_mcp.cli import import_times, main, time_to_ready
+
+# Seconds a new stdio server may take to answer `initialize`; about 2 s on a
+# typical machine, almost all of it importing fastmcp and mcp
+STARTUP_BUDGET = 5.0
+
+
+def test_time_to_ready_within_budget():
+    """Test a new server answers `initialize` within the startup budget."""
+    assert time_to_ready() < STARTUP_BUDGET
+
+
+def test_time_to_ready_times_out():
+    """Test a server that never answers is killed once the timeout passes."""
+    start = time.perf_counter()
+    with pytest.raises(RuntimeError, match="within 0.5 s"):
+        time_to_ready([sys.executable, "-c", "import time; time.sleep(30)"], 0.5)
+    assert time.perf_counter() - start < 5
+
+
+def test_time_to_ready_server_exits():
+    """Test a server exiting without an answer is reported."""
+    with pytest.raises(RuntimeError, match="exited"):
+        time_to_ready([sys.executable, "-c", "pass"])
+
+
+def test_server_import_defers_search_stack():
+    """Test importing the server loads none of the search modules."""
+    loaded = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            (
+                "import sys, pursuit_mcp.server; "
+                "print(*sorted(m for m in sys.modules if m.startswith('pursuit_mcp')))"
+            ),
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split()
+
+    assert loaded == ["pursuit_mcp", "pursuit_mcp.server", "pursuit_mcp.types"]
+
+
+def test_import_times_by_package():
+    """Test import time is broken down by top-level package."""
+    times = import_times("pursuit_mcp.types")
+
+    assert "pursuit_mcp" in times
+    assert all(seconds >= 0 for seconds in times.values())
+
+
+def test_profile_startup_flag(capsys, monkeypatch):
+    """Test --profile-startup reports time to ready and slow packages."""
+    times = Counter({"mcp_types": 0.7, "fastmcp": 0.25, "pursuit_mcp": 0.02})
+    monkeypatch.setattr("pursuit_mcp.cli.time_to_ready", lambda: 2.0)
+    monkeypatch.setattr("pursuit_mcp.cli.import_times", lambda: times)
+
+    main(["--profile-startup", "--top", "2"])
+
+    assert capsys.readouterr().out.splitlines() == [
+        "Time to ready: 2000 ms",
+        "Import of pursuit_mcp.server: 970 ms, slowest packages (excluding their imports):",
+        "  mcp_types    700.0 ms",
+        "  fastmcp      250.0 ms",
+    ]
@@ -0,0 +1,196 @@
+"""Unit tests for store module."""
+
+import json
+import sqlite3
+import time
+
+import pytest
+
+from pursuit_mcp.cache import Validators
+from pursuit_mcp.fake import synthetic_results
+from pursuit_mcp.metrics import registry
+from pursuit_mcp.store import DiskCache, default_cache_dir
+
+
+def test_store_round_trip(clock, tmp_path):
+    """Test a stored body is returned with its fetch time."""
+    store = DiskCache(tmp_path / "cache.sqlite3", ttl=60, max_bytes=1000, clock=clock)
+    store.set("map", b"[]")
+
+    stored = store.get("map")
+    assert stored is not None
+    assert stored.body == b"[]"
+    assert stored.fetched_at == clock.now
+    assert store.get("missing") is None
+
+
+def test_store_ignores_expired_entries(clock, tmp_path):
+    """Test entries older than the TTL are not returned."""
+    store = DiskCache(tmp_path / "cache.sqlite3", ttl=60, max_bytes=1000, clock=clock)
+    store.set("map", b"[]")
+
+    clock.now += 60
+    assert store.get("map") is None
+
+
+def test_store_keeps_validators_for_revalidation(clock, tmp_path):
+    """Test expired entries are returned with their validators on request."""
+    store = DiskCache(tmp_path / "cache.sqlite3", ttl=60, max_bytes=1000, clock=clock)
+    store.set("map", b"[]", Validators('"v1"', None))
+
+    clock.now += 60
+    stale = store.get("map", stale=True)
+    assert stale is not None
+    assert stale.validators == Validators('"v1"', None)
+
+    store.touch("map")
+    assert store.get("map") == stale._replace(fetched_at=clock.now)
+
+
+def test_store_migrates_old_schema(tmp_path):
+    """Test a database from before validators were stored is upgraded."""
+    path = tmp_path / "cache.sqlite3"
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE responses (key TEXT PRIMARY KEY, body BLOB NOT NULL, "
+            "size INTEGER NOT NULL, fetched_at REAL NOT NULL)"
+        )
+        conn.execute(
+            "INSERT INTO responses VALUES ('map', x'5B5D', 2, ?)", (time.time(),)
+        )
+    conn.close()
+
+    store = DiskCache(path, ttl=60, max_bytes=1000)
+    stored = store.get("map")
+    assert stored is not None
+    assert stored.validators is None
+
+
+def test_store_survives_reopen(tmp_path):
+    """Test a second process (connection) sees entries written by the first."""
+    path = tmp_path / "cache.sqlite3"
+    writer = DiskCache(path, ttl=60, max_bytes=1000)
+    reader = DiskCache(path, ttl=60, max_bytes=1000)
+    writer.set("map", b"[1]")
+    writer.close()
+
+    stored = reader.get("map")
+    assert stored is not None
+    assert stored.body == b"[1]"
+
+
+def test_store_compact_evicts_oldest_over_size_cap(clock, tmp_path):
+    """Test compaction drops expired entries, then the oldest until it fits."""
+    store = DiskCache(
+        tmp_path / "cache.sqlite3",
+        ttl=60,
+        max_bytes=25,
+        compact_every=1000,
+        compression=False,
+        clock=clock,
+    )
+    store.set("expired", b"x" * 5)
+    clock.now += 61
+    for key in ("a", "b", "c"):
+        store.set(key, b"x" * 10)
+        clock.now += 1
+
+    store.compact()
+
+    assert store.get("expired") is None
+    assert store.get("a") is None
+    assert store.get("b") is not None
+    assert store.get("c") is not None
+    assert store.size() == 20
+
+
+@pytest.mark.asyncio
+async def test_store_compacts_in_background_on_event_loop(clock, tmp_path):
+    """Test compaction triggered by a write on a loop runs in a worker thread."""
+    store = DiskCache(
+        tmp_path / "cache.sqlite3",
+        ttl=60,
+        max_bytes=1_000_000,
+        compact_every=2,
+        compression=False,
+        clock=clock,
+    )
+    store.set("expired", b"x")
+    clock.now += 61
+    store.set("fresh", b"x")
+
+    assert store._compaction is not None
+    assert store.size() == 2  # Not compacted inline
+    await store._compaction
+    assert store.size() == 1
+    assert store.get("fresh") is not None
+
+
+@pytest.mark.asyncio
+async def test_store_writes_from_worker_thread(clock, tmp_path):
+    """Test aset and atouch write through the worker thread's connection."""
+    store = DiskCache(tmp_path / "cache.sqlite3", ttl=60, max_bytes=1000, clock=clock)
+    await store.aset("map", b"[]", Validators('"v1"', None))
+    clock.now += 30
+    await store.atouch("map")
+
+    stored = store.get("map")
+    assert stored == (b"[]", clock.now, Validators('"v1"', None))
+    store.close()
+
+
+@pytest.mark.parametrize("zstd", [True, False])
+def test_store_compresses_bodies(tmp_path, monkeypatch, zstd):
+    """Test bodies are stored compressed, with zstd when installed."""
+    if zstd:
+        pytest.importorskip("zstandard")
+    else:
+        monkeypatch.setattr("pursuit_mcp.compress.zstandard", None)
+    body = json.dumps(synthetic_results(50)).encode()
+    store = DiskCache(tmp_path / "cache.sqlite3", ttl=60, max_bytes=1_000_000)
+    store.set("map", body)
+
+    stored = store.get("map")
+    assert stored is not None
+    assert stored.body == body
+    assert store.size() < len(body) / 5
+    assert registry.phases["decompress"].count >= 1
+
+
+def test_store_trains_zstd_dictionary(tmp_path):
+    """Test a dictionary is trained after `train_after` writes and used."""
+    pytest.importorskip("zstandard")
+    path = tmp_path / "cache.sqlite3"
+    store = DiskCache(
+        path, ttl=60, max_bytes=10_000_000, compact_every=20, train_after=20
+    )
+    bodies = [json.dumps(synthetic_results(3)[n % 3 :]).encode() for n in range(20)]
+    for number, body in enumerate(bodies):
+        store.set(f"q{number}", body)
+    assert store._dictionary is not None
+
+    store.set("after", bodies[0])
+    reopened = DiskCache(path, ttl=60, max_bytes=10_000_000)
+    expected = {f"q{n}": body for n, body in enumerate(bodies)} | {"after": bodies[0]}
+    for key, body in expected.items():
+        stored = reopened.get(key)
+        assert stored is not None
+        assert stored.body == body
+
+
+def test_store_get_is_sub_millisecond(tmp_path):
+    """Test a warm lookup is served well under a millisecond."""
+    store = DiskCache(tmp_path / "cache.sqlite3", ttl=60, max_bytes=1_000_000)
+    store.set("map", b"[]" * 1000)
+    store.get("map")
+
+    start = time.perf_counter()
+    for _ in range(100):
+        store.get("map")
+    assert (time.perf_counter() - start) / 100 < 0.001
+
+
+def test_default_cache_dir_uses_xdg(monkeypatch, tmp_path):
+    """Test the cache directory honors XDG_CACHE_HOME."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert default_cache_dir() == tmp_path / "pursuit-mcp"
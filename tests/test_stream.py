@@ -0,0 +1,79 @@
+"""Unit tests for stream module."""
+
+import json
+
+import pytest
+
+from pursuit_mcp.stream import iter_json_array
+
+
+async def chunked(data: bytes, size: int):
+    """Yield `data` in chunks of `size` bytes."""
+    for i in range(0, len(data), size):
+        yield data[i : i + size]
+
+
+async def collect(data: bytes, size: int) -> list:
+    return [item async for item in iter_json_array(chunked(data, size))]
+
+
+DOCUMENT = [
+    {"package": "purescript-prelude", "text": "Brackets ] and braces } in text"},
+    {"package": "purescript-arrays", "info": {"module": "Data.Array"}},
+    {"package": "purescript-strings", "text": "Unicode: λ → ∀"},
+    12345,
+    None,
+]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("size", [1, 3, 7, 64, 4096])
+async def test_iter_json_array_matches_json_loads(size: int):
+    """Test decoding yields the same items regardless of chunk boundaries."""
+    data = json.dumps(DOCUMENT, ensure_ascii=False, indent=2).encode()
+    assert await collect(data, size) == DOCUMENT
+
+
+@pytest.mark.asyncio
+async def test_iter_json_array_empty():
+    """Test an empty array yields nothing."""
+    assert await collect(b" [ ] ", 1) == []
+
+
+@pytest.mark.asyncio
+async def test_iter_json_array_stops_early():
+    """Test breaking out of the iteration stops consuming chunks."""
+    data = json.dumps(DOCUMENT).encode()
+    consumed = 0
+
+    async def counting():
+        nonlocal consumed
+        async for chunk in chunked(data, 8):
+            consumed += 1
+            yield chunk
+
+    async for _ in iter_json_array(counting()):
+        break
+
+    assert consumed < len(data) // 8
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "data",
+    [
+        b'{"a": 1}',
+        b'[{"a": 1}',
+        b'[{"a": }]',
+        b"[1 2 ,, 3]",
+        b"[1 2]",
+        b"[,1]",
+        b"[1,]",
+        b"[1] garbage",
+        b"[1] []",
+    ],
+)
+async def test_iter_json_array_rejects_malformed(data: bytes):
+    """Test malformed documents raise JSONDecodeError."""
+    with pytest.raises(json.JSONDecodeError):
+        await collect(data, 2)
@@ -0,0 +1,223 @@
+"""Tests for throttle module."""
+
+import asyncio
+import sqlite3
+
+import httpx
+import pytest
+
+from pursuit_mcp.throttle import (
+    AdaptiveLimiter,
+    BucketLockedError,
+    QueueFullError,
+    SharedTokenBucket,
+    ThrottledTransport,
+    TokenBucket,
+)
+
+
+class Body(httpx.AsyncByteStream):
+    def __init__(self, chunks: list[bytes]) -> None:
+        self.chunks = chunks
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
+def test_token_bucket_allows_burst_then_rate(clock):
+    """Test a full bucket admits `burst` requests, then one per 1/rate."""
+    bucket = TokenBucket(rate=2, burst=3, clock=clock)
+
+    assert [bucket.delay() for _ in range(3)] == [0, 0, 0]
+    assert bucket.delay() == pytest.approx(0.5)
+    assert bucket.delay() == pytest.approx(1.0)
+
+    clock.now = 10
+    assert bucket.delay() == 0
+
+
+def test_token_bucket_pause(clock):
+    """Test a pause delays tokens even when the bucket is full."""
+    bucket = TokenBucket(rate=10, burst=10, clock=clock)
+
+    bucket.pause(3)
+    clock.now = 1
+
+    assert bucket.delay() == pytest.approx(2)
+
+
+def test_shared_token_bucket_spans_instances(clock, tmp_path):
+    """Test buckets opened on one file draw from the same tokens."""
+    path = tmp_path / "ratelimit.sqlite3"
+    first = SharedTokenBucket(path, rate=2, burst=3, clock=clock)
+    second = SharedTokenBucket(path, rate=2, burst=3, clock=clock)
+
+    assert [first.delay(), second.delay(), first.delay()] == [0, 0, 0]
+    assert second.delay() == pytest.approx(0.5)
+
+    clock.now = 10
+    second.pause(3)
+    assert first.delay() == pytest.approx(3)
+    first.close()
+    second.close()
+
+
+@pytest.mark.asyncio
+async def test_shared_token_bucket_waits_off_the_event_loop(tmp_path):
+    """Test a bucket locked by another process neither blocks nor hangs."""
+    path = tmp_path / "ratelimit.sqlite3"
+    bucket = SharedTokenBucket(path, rate=2, burst=3, lock_timeout=0.2)
+    other = sqlite3.connect(path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+    ticks = 0
+
+    async def tick() -> None:
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    ticker = asyncio.create_task(tick())
+    with pytest.raises(BucketLockedError):
+        await bucket.acquire()
+    await bucket.apause(1)  # Skipped rather than failing the response
+    ticker.cancel()
+    other.execute("ROLLBACK")
+    other.close()
+
+    assert ticks > 5
+    await bucket.acquire()
+    bucket.close()
+
+
+def test_limiter_aimd(clock):
+    """Test fast responses grow the limit and overload halves it."""
+    limiter = AdaptiveLimiter(
+        min_limit=1,
+        max_limit=8,
+        queue_size=1,
+        latency_target=1.0,
+        initial_limit=4,
+        clock=clock,
+    )
+
+    for _ in range(4):
+        limiter.record(started=clock(), latency=0.1, overloaded=False)
+    assert 4.9 < limiter.limit < 5
+
+    limiter.record(started=clock(), latency=0.1, overloaded=True)
+    assert 2.4 < limiter.limit < 2.5
+    clock.now = 1
+    limiter.record(started=clock(), latency=0.1, overloaded=True)
+    assert 1.2 < limiter.limit < 1.25
+
+
+def test_limiter_halves_once_per_burst(clock):
+    """Test overload from requests sent before a decrease is not counted again."""
+    limiter = AdaptiveLimiter(
+        min_limit=1, max_limit=20, queue_size=1, latency_target=1.0, clock=clock
+    )
+
+    clock.now = 1
+    for _ in range(5):
+        limiter.record(started=0, latency=0.1, overloaded=True)
+    assert limiter.limit == 10
+
+    limiter.record(started=1, latency=0.1, overloaded=True)
+    assert limiter.limit == 5
+
+
+def test_limiter_judges_latency_against_baseline(clock):
+    """Test steadily slow responses keep the limit and a slowdown halves it."""
+    limiter = AdaptiveLimiter(
+        min_limit=1, max_limit=8, queue_size=1, latency_target=1.0, clock=clock
+    )
+
+    for _ in range(20):
+        limiter.record(started=clock(), latency=3.0, overloaded=False)
+    assert limiter.limit == 8
+
+    for _ in range(10):
+        clock.now += 1
+        limiter.record(started=clock(), latency=10.0, overloaded=False)
+    assert limiter.limit < 8
+
+
+@pytest.mark.asyncio
+async def test_limiter_queues_then_rejects():
+    """Test requests over the limit wait in order and overflow is rejected."""
+    limiter = AdaptiveLimiter(min_limit=1, max_limit=1, queue_size=2, latency_target=1)
+    order = []
+
+    async def request(name: str) -> None:
+        await limiter.acquire()
+        order.append(name)
+
+    await limiter.acquire()
+    waiting = [asyncio.create_task(request(name)) for name in "ab"]
+    await asyncio.sleep(0)
+
+    with pytest.raises(QueueFullError):
+        await limiter.acquire()
+
+    limiter.release()
+    await asyncio.sleep(0)
+    assert order == ["a"]
+    limiter.release()
+    await asyncio.gather(*waiting)
+    assert order == ["a", "b"]
+    assert limiter.in_flight == 1
+
+
+@pytest.mark.asyncio
+async def test_limiter_cancelled_waiter_leaves_queue():
+    """Test a cancelled waiter frees its queue position."""
+    limiter = AdaptiveLimiter(min_limit=1, max_limit=1, queue_size=1, latency_target=1)
+    await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    limiter.release()
+    await limiter.acquire()
+    assert limiter.in_flight == 1
+
+
+@pytest.mark.asyncio
+async def test_transport_holds_slot_until_body_closed():
+    """Test the concurrency slot is released only when the body is closed."""
+    limiter = AdaptiveLimiter(min_limit=1, max_limit=1, queue_size=1, latency_target=1)
+    inner = httpx.MockTransport(
+        lambda request: httpx.Response(200, stream=Body([b"[", b"]"]))
+    )
+    async with httpx.AsyncClient(
+        transport=ThrottledTransport(inner, limiter)
+    ) as client:
+        async with client.stream("GET", "http://pursuit/search") as response:
+            assert limiter.in_flight == 1
+            await response.aread()
+        assert limiter.in_flight == 0
+        await client.get("http://pursuit/search")
+        assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_transport_backs_off_on_429(clock):
+    """Test a 429 halves the limit and pauses the bucket for Retry-After."""
+    limiter = AdaptiveLimiter(min_limit=1, max_limit=8, queue_size=1, latency_target=1)
+    bucket = TokenBucket(rate=100, burst=100, clock=clock)
+    inner = httpx.MockTransport(
+        lambda request: httpx.Response(429, headers={"Retry-After": "7"})
+    )
+    async with httpx.AsyncClient(
+        transport=ThrottledTransport(inner, limiter, bucket)
+    ) as client:
+        response = await client.get("http://pursuit/search")
+
+    assert response.status_code == 429
+    assert limiter.limit == 4
+    assert bucket.delay() == pytest.approx(7)
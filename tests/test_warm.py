@@ -0,0 +1,88 @@
+"""Tests for warm module."""
+
+import asyncio
+
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock
+
+from pursuit_mcp.cache import TTLCache
+from pursuit_mcp.warm import AccessLog, read_queries, warm
+
+page = [
+    {
+        "info": {"type": "package", "deprecated": False},
+        "markup": "",
+        "package": "purescript-prelude",
+        "text": "",
+        "url": "https://pursuit.purescript.org/packages/purescript-prelude",
+        "version": "6.0.2",
+    }
+]
+
+
+def test_access_log_top_queries(tmp_path):
+    """Test the most frequent normalized queries come first."""
+    log = AccessLog(tmp_path / "access.log")
+    for query in ["map", "  map ", "Maybe", "map", "Maybe", "traverse"]:
+        log.record(query)
+
+    assert log.top(2) == ["map", "Maybe"]
+    log.close()
+
+
+def test_access_log_trims_old_entries(tmp_path):
+    """Test reading the log keeps only its newest `max_lines` entries."""
+    path = tmp_path / "access.log"
+    log = AccessLog(path, max_lines=3)
+    for query in ["old", "old", "new", "new", "newest"]:
+        log.record(query)
+
+    assert log.top(10) == ["new", "newest"]
+    assert path.read_text().splitlines() == ["new", "new", "newest"]
+    log.close()
+
+
+def test_read_queries(tmp_path):
+    """Test blank lines and comments are skipped."""
+    path = tmp_path / "queries.txt"
+    path.write_text("# popular\nmap\n\na -> b\n")
+
+    assert read_queries(path) == ["map", "a -> b"]
+
+
+@pytest.mark.asyncio
+async def test_warm_fills_cache_and_skips_failures(httpx_mock: HTTPXMock):
+    """Test successful queries are cached once and failures are skipped."""
+    httpx_mock.add_response(
+        url=httpx.URL("https://pursuit.purescript.org/search", params={"q": "map"}),
+        json=page,
+    )
+    httpx_mock.add_response(
+        url=httpx.URL("https://pursuit.purescript.org/search", params={"q": "bad"}),
+        status_code=500,
+    )
+    cache = TTLCache(ttl=60, max_entries=10, max_bytes=1_000_000)
+
+    async with httpx.AsyncClient() as client:
+        warmed = await warm(
+            ["map", " map", "bad"], concurrency=2, budget=5, client=client, cache=cache
+        )
+
+    assert warmed == 1
+    assert cache.get("map") == page
+    assert len(httpx_mock.get_requests()) == 2
+
+
+@pytest.mark.asyncio
+async def test_warm_stops_at_budget():
+    """Test searches still running when the budget elapses are cancelled."""
+
+    async def hang(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(10)
+        return httpx.Response(200, json=page)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(hang)) as client:
+        warmed = await warm(["map"], concurrency=1, budget=0.01, client=client)
+
+    assert warmed == 0